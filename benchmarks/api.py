@@ -0,0 +1,540 @@
+"""
+Measures the target API on growing tables: the throughput and the latency percentiles of list, detail, create,
+update and delete, through the Django test client and through real WSGI and ASGI servers running in this process,
+plus CustomTargetManager.create_target and TargetSerializer on their own.
+
+Everything runs on a test database created for the run and destroyed at the end, on the database of the settings:
+PostgreSQL as configured by the DB_* variables, or SQLite with benchmarks/sqlite_settings.py:
+
+    python benchmarks/api.py --sizes 10000 100000 1000000 --output results.json
+    DJANGO_SETTINGS_MODULE=benchmarks.sqlite_settings python benchmarks/api.py --sizes 10000 100000
+
+The ASGI server needs uvicorn. The results are saved as JSON with the commit they were measured on, and --compare
+prints how they changed from the results of another run, e.g. of the previous commit.
+"""
+import argparse
+import datetime
+import http.client
+import io
+import json
+import os
+import platform
+import random
+import socket
+import socketserver
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_join_test.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.handlers.wsgi import WSGIHandler  # noqa: E402
+from django.db import connection, connections  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from benchmarks.async_views import percentile  # noqa: E402
+from core.models import Target  # noqa: E402
+from core.utils import uuid7  # noqa: E402
+from targets.serializers import TargetSerializer  # noqa: E402
+
+TARGETS_URL = "/api/target/"
+TRANSPORTS = ("client", "wsgi", "asgi")
+# The viewport listed by the list benchmark, about 1/3600 of the area where the targets are seeded.
+LIST_BBOX = "-47,-24,-43.4,-20.4"
+SEED_BATCH_SIZE = 10_000
+# How many ids of each seeded batch are kept to pick the targets read, updated and deleted.
+SAMPLE_IDS_PER_BATCH = 1000
+
+
+def seed_targets(count: int, generator: random.Random):
+    """
+    The seed_targets function inserts random targets as fast as the database allows: with COPY on PostgreSQL and
+    with bulk_create elsewhere, skipping the validation and the change log of the manager.
+
+    :param count: int: How many targets are inserted
+    :param generator: random.Random: The source of the random names and coordinates
+    :return: A sample of the ids of the inserted targets
+    :doc-author: Trelent
+    """
+    expiration_date = datetime.date.today() + datetime.timedelta(days=30)
+    updated_at = timezone.now()
+    sample_ids = []
+    for start in range(0, count, SEED_BATCH_SIZE):
+        rows = [
+            (
+                uuid7(),
+                f"Benchmark {index}",
+                f"{generator.uniform(-60, 70):.6f}",
+                f"{generator.uniform(-180, 180):.6f}",
+            )
+            for index in range(start, min(start + SEED_BATCH_SIZE, count))
+        ]
+        if connection.vendor == "postgresql":
+            copy_targets(rows, expiration_date, updated_at)
+        else:
+            Target.objects.bulk_create(
+                Target(
+                    id=target_id,
+                    name=name,
+                    latitude=latitude,
+                    longitude=longitude,
+                    lat=float(latitude),
+                    lng=float(longitude),
+                    expiration_date=expiration_date,
+                )
+                for target_id, name, latitude, longitude in rows
+            )
+        sample_ids.extend(row[0] for row in rows[:SAMPLE_IDS_PER_BATCH])
+    return sample_ids
+
+
+def copy_targets(rows, expiration_date: datetime.date, updated_at: datetime.datetime):
+    """
+    The copy_targets function inserts a batch of targets with a single COPY.
+
+    :param rows: A list of (id, name, latitude, longitude) tuples
+    :param expiration_date: datetime.date: The expiration date of the targets
+    :param updated_at: datetime.datetime: The update time of the targets
+    :return: None
+    :doc-author: Trelent
+    """
+    buffer = io.StringIO()
+    for target_id, name, latitude, longitude in rows:
+        buffer.write(
+            f"{target_id}\t{name}\t{latitude}\t{longitude}\t{latitude}\t{longitude}\t"
+            f"{expiration_date.isoformat()}\t{updated_at.isoformat()}\n"
+        )
+    buffer.seek(0)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {Target._meta.db_table} "
+            "(id, name, latitude, longitude, lat, lng, expiration_date, updated_at) FROM STDIN",
+            buffer,
+        )
+
+
+def build_requests(operation: str, count: int, ids, generator: random.Random):
+    """
+    The build_requests function prepares the requests of an operation, before any of them is timed.
+    The deleted targets are taken out of the ids, so the next operations only pick existing targets.
+
+    :param operation: str: list, page, detail, create, update or delete
+    :param count: int: How many requests are prepared
+    :param ids: The list of ids of existing targets
+    :param generator: random.Random: The source of the random choices
+    :return: A list of (method, path, body) tuples
+    :doc-author: Trelent
+    """
+    if operation == "list":
+        return [("GET", f"{TARGETS_URL}?bbox={LIST_BBOX}", None)] * count
+    if operation == "page":
+        return [("GET", f"{TARGETS_URL}?page_size=100", None)] * count
+    if operation == "detail":
+        return [
+            ("GET", f"{TARGETS_URL}{generator.choice(ids)}/", None)
+            for _ in range(count)
+        ]
+    if operation == "create":
+        return [
+            (
+                "POST",
+                TARGETS_URL,
+                {
+                    "name": f"Created {index}",
+                    "latitude": f"{generator.uniform(-60, 70):.6f}",
+                    "longitude": f"{generator.uniform(-180, 180):.6f}",
+                },
+            )
+            for index in range(count)
+        ]
+    if operation == "update":
+        return [
+            (
+                "PATCH",
+                f"{TARGETS_URL}{generator.choice(ids)}/",
+                {"name": f"Updated {index}"},
+            )
+            for index in range(count)
+        ]
+    deleted = [
+        ids.pop(generator.randrange(len(ids))) for _ in range(min(count, len(ids) - 1))
+    ]
+    return [("DELETE", f"{TARGETS_URL}{target_id}/", None) for target_id in deleted]
+
+
+class ClientTransport:
+    """
+    Sends the requests through the Django test client, without any server or socket.
+    """
+
+    name = "client"
+
+    def __enter__(self):
+        self.client = Client()
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def send(self, method: str, path: str, body):
+        if body is None:
+            return self.client.generic(method, path).status_code
+        return self.client.generic(
+            method, path, json.dumps(body), content_type="application/json"
+        ).status_code
+
+
+class HTTPTransport:
+    """
+    Sends the requests over HTTP to a server started in a thread of this process, by start_server.
+    """
+
+    def __enter__(self):
+        self.port = find_free_port()
+        self.start_server()
+        self.connection = http.client.HTTPConnection("127.0.0.1", self.port)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.connection.close()
+        self.stop_server()
+
+    def send(self, method: str, path: str, body):
+        headers = {}
+        if body is not None:
+            body = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        try:
+            self.connection.request(method, path, body, headers)
+            response = self.connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            self.connection = http.client.HTTPConnection("127.0.0.1", self.port)
+            return None
+        if response.will_close:
+            self.connection.close()
+        return response.status
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class ThreadingWSGIServer(socketserver.ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class WSGITransport(HTTPTransport):
+    """
+    The WSGI application of the project, served by wsgiref with a thread per connection.
+    """
+
+    name = "wsgi"
+
+    def start_server(self):
+        self.server = make_server(
+            "127.0.0.1",
+            self.port,
+            WSGIHandler(),
+            server_class=ThreadingWSGIServer,
+            handler_class=QuietRequestHandler,
+        )
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop_server(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+
+class ASGITransport(HTTPTransport):
+    """
+    The ASGI application of the project, served by uvicorn on an event loop of its own thread.
+    """
+
+    name = "asgi"
+
+    def start_server(self):
+        import uvicorn
+
+        from django_join_test.asgi import application
+
+        config = uvicorn.Config(
+            application,
+            host="127.0.0.1",
+            port=self.port,
+            log_level="warning",
+            lifespan="off",
+        )
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+
+    def stop_server(self):
+        self.server.should_exit = True
+        self.thread.join()
+
+
+def find_free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def summarize(latencies, errors: int, elapsed: float):
+    """
+    The summarize function turns the latencies of a run into its throughput and percentiles.
+
+    :param latencies: The latency of each successful call, in seconds
+    :param errors: int: How many calls failed
+    :param elapsed: float: How long the whole run took, in seconds
+    :return: A dictionary with the results
+    :doc-author: Trelent
+    """
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p90_ms": percentile(latencies, 0.90) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def run_requests(transport, requests):
+    """
+    The run_requests function sends prepared requests one after the other, timing each one.
+
+    :param transport: The transport the requests are sent through
+    :param requests: A list of (method, path, body) tuples
+    :return: A dictionary with the results
+    :doc-author: Trelent
+    """
+    latencies = []
+    errors = 0
+    started_at = time.perf_counter()
+    for method, path, body in requests:
+        request_started_at = time.perf_counter()
+        status = transport.send(method, path, body)
+        if status is None or status >= 400:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - request_started_at)
+    return summarize(latencies, errors, time.perf_counter() - started_at)
+
+
+def run_calls(function, count: int):
+    """
+    The run_calls function calls a function count times, timing each call.
+
+    :param function: The function being measured, called with the index of the call
+    :param count: int: How many times it is called
+    :return: A dictionary with the results
+    :doc-author: Trelent
+    """
+    latencies = []
+    started_at = time.perf_counter()
+    for index in range(count):
+        call_started_at = time.perf_counter()
+        function(index)
+        latencies.append(time.perf_counter() - call_started_at)
+    return summarize(latencies, 0, time.perf_counter() - started_at)
+
+
+def run_isolated(count: int, generator: random.Random):
+    """
+    The run_isolated function measures create_target, and TargetSerializer serializing and validating, without
+    any request around them.
+
+    :param count: int: How many calls are measured
+    :param generator: random.Random: The source of the random coordinates
+    :return: A dictionary with the results of each measured function
+    :doc-author: Trelent
+    """
+    payloads = [
+        {
+            "name": f"Isolated {index}",
+            "latitude": f"{generator.uniform(-60, 70):.6f}",
+            "longitude": f"{generator.uniform(-180, 180):.6f}",
+        }
+        for index in range(count)
+    ]
+    targets = list(Target.objects.all()[:100])
+
+    return {
+        "create_target": run_calls(
+            lambda index: Target.objects.create_target(**payloads[index]), count
+        ),
+        "serialize_100": run_calls(
+            lambda index: TargetSerializer(targets, many=True).data, count
+        ),
+        "validate": run_calls(
+            lambda index: TargetSerializer(data=payloads[index]).is_valid(
+                raise_exception=True
+            ),
+            count,
+        ),
+    }
+
+
+def get_metadata(options):
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit or None,
+        "date": timezone.now().isoformat(),
+        "database": connection.vendor,
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "options": vars(options),
+    }
+
+
+def print_result(result, previous=None):
+    """
+    The print_result function prints a line of results, with the change of throughput and p99 latency from the
+    previous results when given.
+
+    :param result: The result being printed
+    :param previous: The result of the same size, transport and operation in the compared run, if any
+    :return: None
+    :doc-author: Trelent
+    """
+    line = (
+        f"{result['size']:>9} {result['transport']:<8}{result['operation']:<15}"
+        f"{result['rps']:>10.0f}{result['p50_ms']:>9.2f}{result['p90_ms']:>9.2f}"
+        f"{result['p99_ms']:>9.2f}{result['errors']:>7}"
+    )
+    if previous and previous["rps"] and previous["p99_ms"]:
+        line += (
+            f"{result['rps'] / previous['rps'] - 1:>+9.0%}"
+            f"{result['p99_ms'] / previous['p99_ms'] - 1:>+9.0%}"
+        )
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument(
+        "--requests", type=int, default=500, help="Requests per operation."
+    )
+    parser.add_argument(
+        "--transports", nargs="+", choices=TRANSPORTS, default=list(TRANSPORTS)
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="JSON file the results are saved to.")
+    parser.add_argument(
+        "--compare", help="JSON file of a previous run to compare with."
+    )
+    options = parser.parse_args()
+
+    previous = {}
+    if options.compare:
+        with open(options.compare, encoding="utf-8") as file:
+            for result in json.load(file)["results"]:
+                previous[
+                    result["size"], result["transport"], result["operation"]
+                ] = result
+
+    transports = {
+        "client": ClientTransport,
+        "wsgi": WSGITransport,
+        "asgi": ASGITransport,
+    }
+    if "asgi" in options.transports:
+        try:
+            import uvicorn  # noqa: F401
+        except ImportError:
+            print("uvicorn is not installed, skipping the ASGI server.")
+            options.transports.remove("asgi")
+
+    # The response cache would answer the repeated reads without touching the database, and the throttles would
+    # turn the single client of the benchmark away.
+    override_settings(
+        ALLOWED_HOSTS=["*"], DEBUG=False, TARGETS_CACHE_TIMEOUT=0, THROTTLE_RATES={}
+    ).enable()
+    generator = random.Random(options.seed)
+    # Each server thread has a connection of its own, which must be closed before the test database is destroyed.
+    connection.settings_dict["CONN_MAX_AGE"] = 0
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    results = []
+    print(
+        f"{'targets':>9} {'via':<8}{'operation':<15}{'req/s':>10}{'p50 ms':>9}{'p90 ms':>9}"
+        f"{'p99 ms':>9}{'errors':>7}" + (f"{'req/s':>9}{'p99':>9}" if previous else "")
+    )
+    try:
+        ids = []
+        for size in sorted(options.sizes):
+            ids.extend(seed_targets(size - Target.objects.count(), generator))
+
+            for transport_name in options.transports:
+                with transports[transport_name]() as transport:
+                    for operation in (
+                        "list",
+                        "page",
+                        "detail",
+                        "create",
+                        "update",
+                        "delete",
+                    ):
+                        requests = build_requests(
+                            operation, options.requests, ids, generator
+                        )
+                        result = {
+                            "size": size,
+                            "transport": transport_name,
+                            "operation": operation,
+                            **run_requests(transport, requests),
+                        }
+                        results.append(result)
+                        print_result(
+                            result, previous.get((size, transport_name, operation))
+                        )
+                connections.close_all()
+
+            for operation, result in run_isolated(options.requests, generator).items():
+                result = {
+                    "size": size,
+                    "transport": "direct",
+                    "operation": operation,
+                    **result,
+                }
+                results.append(result)
+                print_result(result, previous.get((size, "direct", operation)))
+    finally:
+        connections.close_all()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as file:
+            json.dump(
+                {"metadata": get_metadata(options), "results": results}, file, indent=2
+            )
+
+
+if __name__ == "__main__":
+    main()
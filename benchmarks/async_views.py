@@ -0,0 +1,145 @@
+"""
+Compares the sync TargetViewSet with the async target views under high concurrency.
+
+Both variants must be served by the same ASGI server, with a single worker, so the only difference between them is
+whether the database calls hold a thread or wait on the event loop. The response cache of the sync list is turned
+off, since the async views do not have one. So is the admission control: every client comes from the same address,
+so the read throttle and the concurrency limit would turn most requests away, and the results would measure the
+rejections instead of the views:
+
+    TARGETS_CACHE_TIMEOUT=0 THROTTLE_READ_RATE=1000000 THROTTLE_READ_BURST=1000000 ADMISSION_MAX_CONCURRENCY=0 \
+        uvicorn django_join_test.asgi:application --workers 1
+    python benchmarks/async_views.py --base-url http://localhost:8000 --concurrency 256 --requests 20000
+
+Each endpoint is warmed up, then hit by --concurrency clients at the same time, each one with a keep-alive connection.
+The requests per second and the p50/p99 latencies of each endpoint are printed at the end.
+"""
+import argparse
+import http.client
+import statistics
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+ENDPOINTS = {
+    "sync": "/api/target/",
+    "async": "/api/target/async/",
+}
+
+
+def percentile(latencies, fraction: float):
+    """
+    The percentile function returns the latency below which the given fraction of the requests finished.
+
+    :param latencies: The sorted list of latencies
+    :param fraction: float: The fraction of the requests, like 0.99
+    :return: The latency in seconds
+    :doc-author: Trelent
+    """
+    if not latencies:
+        return 0.0
+    index = min(len(latencies) - 1, int(round(fraction * (len(latencies) - 1))))
+    return latencies[index]
+
+
+def run_client(base_url, path: str, requests: int):
+    """
+    The run_client function sends requests one after the other over a single keep-alive connection.
+
+    :param base_url: The parsed base URL of the server
+    :param path: str: The path, with the query string, that is requested
+    :param requests: int: How many requests are sent
+    :return: A tuple with the list of latencies of the successful requests and the number of failed requests
+    :doc-author: Trelent
+    """
+    connection = http.client.HTTPConnection(base_url.hostname, base_url.port or 80)
+    latencies = []
+    errors = 0
+    for _ in range(requests):
+        started_at = time.perf_counter()
+        try:
+            connection.request("GET", path)
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            connection.close()
+            connection = http.client.HTTPConnection(
+                base_url.hostname, base_url.port or 80
+            )
+            continue
+        # The rejected requests are answered much faster, so they would skew the throughput and the latencies.
+        if response.status != 200:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - started_at)
+    connection.close()
+    return latencies, errors
+
+
+def run_endpoint(base_url, path: str, concurrency: int, requests: int):
+    """
+    The run_endpoint function hits an endpoint with concurrent clients, all of them starting at the same time.
+
+    :param base_url: The parsed base URL of the server
+    :param path: str: The path, with the query string, that is requested
+    :param concurrency: int: How many clients send requests at the same time
+    :param requests: int: How many requests are sent in total
+    :return: A dictionary with the requests per second, the latencies and the number of errors
+    :doc-author: Trelent
+    """
+    per_client = max(1, requests // concurrency)
+    barrier = threading.Barrier(concurrency)
+
+    def client():
+        barrier.wait()
+        return run_client(base_url, path, per_client)
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda _: client(), range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+
+    latencies = sorted(latency for result in results for latency in result[0])
+    return {
+        "requests": len(latencies),
+        "errors": sum(result[1] for result in results),
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 0.50),
+        "p99": percentile(latencies, 0.99),
+        "mean": statistics.fmean(latencies) if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=256)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument(
+        "--bbox",
+        default="-47,-24,-46,-23",
+        help="Viewport requested by every client, as minLng,minLat,maxLng,maxLat.",
+    )
+    options = parser.parse_args()
+
+    base_url = urllib.parse.urlsplit(options.base_url)
+    query = urllib.parse.urlencode({"bbox": options.bbox})
+
+    print(
+        f"{'endpoint':<10}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}"
+    )
+    for name, path in ENDPOINTS.items():
+        path = f"{path}?{query}"
+        run_client(base_url, path, options.warmup)
+        result = run_endpoint(base_url, path, options.concurrency, options.requests)
+        print(
+            f"{name:<10}{result['requests']:>10}{result['errors']:>8}{result['rps']:>10.0f}"
+            f"{result['p50'] * 1000:>10.1f}{result['p99'] * 1000:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
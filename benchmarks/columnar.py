@@ -0,0 +1,129 @@
+"""
+Compares the JSON list of targets with the columnar format used by the map, for growing viewports:
+
+    * json: TargetValuesSerializer and FastJSONRenderer, the default list response.
+    * columnar64/columnar32: targets.columnar with float64 or float32 coordinates.
+
+For each format it prints the payload size, the server encoding rate and the decoding rate. Decoding is done in
+Python, as a proxy of the browser: json.loads plus a float() per coordinate, like the parseFloat() calls of the map,
+against reading the coordinates as whole arrays and slicing the ids and names, like the typed arrays of the map.
+No database is needed:
+
+    python benchmarks/columnar.py --sizes 10000 100000 1000000
+"""
+import argparse
+import array
+import datetime
+import json
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_join_test.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from targets.columnar import (  # noqa: E402
+    COORDINATE_TYPECODES,
+    HEADER,
+    encode_target_columns,
+)
+from targets.renderers import FastJSONRenderer  # noqa: E402
+from targets.serializers import TargetValuesSerializer  # noqa: E402
+
+
+def generate_rows(size: int):
+    """
+    The generate_rows function generates the rows read by both formats for the given number of targets.
+
+    :param size: int: How many rows are generated
+    :return: A tuple with the rows of the JSON list and the rows of the columnar format
+    :doc-author: Trelent
+    """
+    expiration_date = datetime.date.today() + datetime.timedelta(days=30)
+    json_rows = []
+    columnar_rows = []
+    for index in range(size):
+        target_id = uuid.uuid4()
+        name = f"Target {index}"
+        lat = -23.5 + index % 1000 / 1000
+        lng = -46.6 + index % 997 / 1000
+        json_rows.append((target_id, name, f"{lat:.7f}", f"{lng:.7f}", expiration_date))
+        columnar_rows.append((target_id, name, lat, lng))
+    return json_rows, columnar_rows
+
+
+def encode_json(rows):
+    return FastJSONRenderer().render(TargetValuesSerializer().to_representation(rows))
+
+
+def decode_json(payload: bytes):
+    return [
+        (target["id"], float(target["latitude"]), float(target["longitude"]))
+        for target in json.loads(payload)
+    ]
+
+
+def decode_columnar(payload: bytes):
+    _, count, coordinate_size, _ = HEADER.unpack_from(payload)
+    view = memoryview(payload)
+    position = HEADER.size
+    columns = []
+    for _ in range(2):
+        column = array.array(COORDINATE_TYPECODES[coordinate_size * 8])
+        end = position + count * coordinate_size
+        column.frombytes(view[position:end])
+        columns.append(column)
+        position = end
+    end = position + count * 16
+    ids_hex = view[position:end].hex()
+    ids = [
+        ids_hex[start:stop]
+        for start, stop in zip(range(0, count * 32, 32), range(32, count * 32 + 1, 32))
+    ]
+    return ids, columns[0], columns[1]
+
+
+def measure(function, argument):
+    started_at = time.perf_counter()
+    result = function(argument)
+    return result, time.perf_counter() - started_at
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    options = parser.parse_args()
+
+    formats = {
+        "json": (encode_json, decode_json),
+        "columnar64": (encode_target_columns, decode_columnar),
+        "columnar32": (
+            lambda rows: encode_target_columns(rows, precision=32),
+            decode_columnar,
+        ),
+    }
+
+    print(
+        f"{'rows':>10} {'format':<12}{'bytes':>14}{'encode rows/s':>16}{'decode rows/s':>16}"
+    )
+    for size in options.sizes:
+        json_rows, columnar_rows = generate_rows(size)
+        for name, (encode, decode) in formats.items():
+            rows = json_rows if name == "json" else columnar_rows
+            payload, encode_time = measure(encode, rows)
+            _, decode_time = measure(decode, payload)
+            print(
+                f"{size:>10} {name:<12}{len(payload):>14}"
+                f"{size / encode_time:>16.0f}{size / decode_time:>16.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
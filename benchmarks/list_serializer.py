@@ -0,0 +1,109 @@
+"""
+Compares the rows/second of the two ways the target list is serialized and rendered:
+
+    * model: models built from the rows, TargetSerializer(many=True) and JSONRenderer, as done before.
+    * values: values_list() rows, TargetValuesSerializer and FastJSONRenderer, as done by TargetViewSet.list.
+
+Only the CPU spent after the query is measured, on rows generated in memory, so no database is needed:
+
+    python benchmarks/list_serializer.py --sizes 10000 100000 1000000
+
+Both variants are checked to produce the same bytes before being timed.
+"""
+import argparse
+import datetime
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_join_test.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import DEFAULT_DB_ALIAS  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from core.models import Target  # noqa: E402
+from targets.renderers import FastJSONRenderer, orjson  # noqa: E402
+from targets.serializers import TargetSerializer, TargetValuesSerializer  # noqa: E402
+
+FIELDS = TargetSerializer.Meta.fields
+
+
+def generate_rows(size: int):
+    """
+    The generate_rows function generates the rows the list query would return for the given number of targets.
+
+    :param size: int: How many rows are generated
+    :return: A list of tuples with the values of the serialized fields
+    :doc-author: Trelent
+    """
+    expiration_date = datetime.date.today() + datetime.timedelta(days=30)
+    return [
+        (
+            uuid.uuid4(),
+            f"Target {index}",
+            f"{-23.5 + index % 1000 / 1000:.7f}",
+            f"{-46.6 + index % 997 / 1000:.7f}",
+            expiration_date,
+        )
+        for index in range(size)
+    ]
+
+
+def render_models(rows):
+    targets = [Target.from_db(DEFAULT_DB_ALIAS, FIELDS, row) for row in rows]
+    return JSONRenderer().render(TargetSerializer(targets, many=True).data)
+
+
+def render_values(rows):
+    return FastJSONRenderer().render(TargetValuesSerializer().to_representation(rows))
+
+
+def measure(function, rows, repeat: int):
+    """
+    The measure function returns the best time out of a few runs of a function.
+
+    :param function: The function being measured
+    :param rows: The rows passed to the function
+    :param repeat: int: How many times the function is run
+    :return: The best time in seconds
+    :doc-author: Trelent
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        function(rows)
+        best = min(best, time.perf_counter() - started_at)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args()
+
+    print(f"orjson: {'installed' if orjson else 'not installed'}")
+    print(f"{'rows':>10}{'model rows/s':>16}{'values rows/s':>16}{'speedup':>10}")
+    for size in options.sizes:
+        rows = generate_rows(size)
+        if render_models(rows[:1000]) != render_values(rows[:1000]):
+            raise SystemExit("The serializers do not produce the same bytes.")
+
+        model_time = measure(render_models, rows, options.repeat)
+        values_time = measure(render_values, rows, options.repeat)
+        print(
+            f"{size:>10}{size / model_time:>16.0f}{size / values_time:>16.0f}"
+            f"{model_time / values_time:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
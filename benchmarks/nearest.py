@@ -0,0 +1,110 @@
+"""
+Compares the nearest targets query with a brute-force baseline that reads every live target and sorts them by
+distance, for growing tables.
+
+The targets are seeded into the configured database inside a transaction that is rolled back at the end, so run it
+against a development database, e.g. inside the app container:
+
+    python benchmarks/nearest.py --sizes 10000 100000 1000000 --queries 50
+
+Both methods are checked to return the same targets before their timings are printed.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_join_test.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import transaction  # noqa: E402
+
+from core.models import Target  # noqa: E402
+from core.utils import haversine_km  # noqa: E402
+
+
+class Rollback(Exception):
+    pass
+
+
+def seed_targets(size: int, generator: random.Random):
+    """
+    The seed_targets function creates random targets over the populated latitudes, in batches.
+
+    :param size: int: How many targets are created
+    :param generator: random.Random: The source of the random coordinates
+    :return: None
+    :doc-author: Trelent
+    """
+    items = (
+        {
+            "name": f"Benchmark {index}",
+            "latitude": f"{generator.uniform(-60, 70):.6f}",
+            "longitude": f"{generator.uniform(-180, 180):.6f}",
+        }
+        for index in range(size)
+    )
+    Target.objects.bulk_create_targets(items)
+
+
+def brute_force(lat: float, lng: float, k: int):
+    rows = Target.objects.live().values_list("id", "lat", "lng")
+    distances = sorted(
+        (haversine_km(lat, lng, target_lat, target_lng), target_id)
+        for target_id, target_lat, target_lng in rows
+    )
+    return [target_id for _, target_id in distances[:k]]
+
+
+def nearest(lat: float, lng: float, k: int):
+    return [target.id for target in Target.objects.live().nearest(lat, lng, k)]
+
+
+def measure(function, points, k: int):
+    started_at = time.perf_counter()
+    results = [function(lat, lng, k) for lat, lng in points]
+    return results, (time.perf_counter() - started_at) / len(points)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    options = parser.parse_args()
+
+    generator = random.Random(options.seed)
+    print(f"{'targets':>10}{'brute force ms':>16}{'nearest ms':>12}{'speedup':>10}")
+    try:
+        with transaction.atomic():
+            seeded = 0
+            for size in sorted(options.sizes):
+                seed_targets(size - seeded, generator)
+                seeded = size
+                points = [
+                    (generator.uniform(-60, 70), generator.uniform(-180, 180))
+                    for _ in range(options.queries)
+                ]
+
+                expected, brute_force_time = measure(brute_force, points, options.k)
+                found, nearest_time = measure(nearest, points, options.k)
+                if found != expected:
+                    raise SystemExit("The nearest targets differ from the baseline.")
+
+                print(
+                    f"{size:>10}{brute_force_time * 1000:>16.1f}{nearest_time * 1000:>12.2f}"
+                    f"{brute_force_time / nearest_time:>9.0f}x"
+                )
+            raise Rollback()
+    except Rollback:
+        pass
+
+
+if __name__ == "__main__":
+    main()
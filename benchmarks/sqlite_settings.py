@@ -0,0 +1,15 @@
+"""
+Settings to run the benchmarks on SQLite instead of PostgreSQL:
+
+    DJANGO_SETTINGS_MODULE=benchmarks.sqlite_settings python benchmarks/api.py
+"""
+from django_join_test.settings import *  # noqa: F401,F403
+from django_join_test.settings import BASE_DIR
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "benchmark.sqlite3",
+    }
+}
+DATABASE_REPLICAS = []
@@ -0,0 +1,113 @@
+"""
+Compares the insert throughput of random uuid4 primary keys with time-ordered UUIDv7 keys, as the target table grows.
+
+For each key strategy, the targets table of a throwaway test database is filled up to --size rows in batches, and
+the insert rate of each tenth of the table is printed, along with the size of the primary key index on PostgreSQL.
+Random keys slow down once the index no longer fits in memory, so use a size larger than shared_buffers:
+
+    python benchmarks/uuid_keys.py --size 5000000
+    DJANGO_SETTINGS_MODULE=benchmarks.sqlite_settings python benchmarks/uuid_keys.py --size 1000000
+"""
+import argparse
+import datetime
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_join_test.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+
+from core.models import Target  # noqa: E402
+from core.utils import uuid7  # noqa: E402
+
+STRATEGIES = {"uuid4": uuid.uuid4, "uuid7": uuid7}
+
+
+def get_index_size():
+    """
+    The get_index_size function returns the size of the primary key index of the targets table.
+
+    :return: The size in bytes, or None when the database does not report it
+    :doc-author: Trelent
+    """
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_relation_size(%s)", [f"{Target._meta.db_table}_pkey"])
+        return cursor.fetchone()[0]
+
+
+def fill_table(generate_key, size: int, batch_size: int):
+    """
+    The fill_table function inserts targets with the given key generator until the table has size rows, one
+    INSERT per batch, and measures the insert rate of each tenth of the table.
+
+    :param generate_key: The function generating the primary keys
+    :param size: int: How many targets are inserted
+    :param batch_size: int: How many targets each INSERT writes
+    :return: A list with the rows per second of each tenth
+    :doc-author: Trelent
+    """
+    expiration_date = datetime.date.today() + datetime.timedelta(days=30)
+    tenth = max(batch_size, size // 10)
+    rates = []
+    inserted = 0
+    while inserted < size:
+        started_at = time.perf_counter()
+        goal = min(size, inserted + tenth)
+        while inserted < goal:
+            count = min(batch_size, goal - inserted)
+            Target.objects.bulk_create(
+                Target(
+                    id=generate_key(),
+                    name=f"Benchmark {inserted + index}",
+                    latitude="-23.5",
+                    longitude="-46.6",
+                    lat=-23.5,
+                    lng=-46.6,
+                    expiration_date=expiration_date,
+                )
+                for index in range(count)
+            )
+            inserted += count
+        rates.append((goal - len(rates) * tenth) / (time.perf_counter() - started_at))
+    return rates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    options = parser.parse_args()
+
+    connection.settings_dict["CONN_MAX_AGE"] = 0
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        print(f"{'keys':<8}{'rows/s by tenth of the table':<70}{'index MB':>10}")
+        for name, generate_key in STRATEGIES.items():
+            Target.objects.all()._raw_delete(Target.objects.db)
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute(f"VACUUM FULL {Target._meta.db_table}")
+
+            rates = fill_table(generate_key, options.size, options.batch_size)
+            index_size = get_index_size()
+            print(
+                f"{name:<8}{' '.join(f'{rate:>6.0f}' for rate in rates):<70}"
+                f"{index_size / 2**20 if index_size is not None else float('nan'):>10.1f}"
+            )
+    finally:
+        connection.close()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+# The most buckets LocalBucketStore keeps before dropping the full ones, which are the same as no bucket.
+MAX_LOCAL_BUCKETS = 10000
+# The concurrency limiter of this process and how many requests it throttled, read by the metrics.
+admission_state = {"limiter": None, "throttled": 0}
+admission_lock = threading.Lock()
+
+
+def refill(tokens: float, updated_at: float, rate: float, burst: int, now: float):
+    """
+    The refill function adds to a token bucket the tokens earned since it was last updated, up to its burst.
+
+    :param tokens: float: The tokens left in the bucket
+    :param updated_at: float: When the bucket was last updated
+    :param rate: float: How many tokens the bucket earns per second
+    :param burst: int: How many tokens the bucket holds at most
+    :param now: float: The current time
+    :return: The tokens in the bucket now
+    :doc-author: Trelent
+    """
+    return min(burst, tokens + (now - updated_at) * rate)
+
+
+class LocalBucketStore:
+    """
+    Token buckets kept in the memory of this process, so each worker throttles the clients on its own: with N
+    workers behind a load balancer, a client gets up to N times its rate.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets = {}
+
+    def take(self, key: str, rate: float, burst: int):
+        """
+        The take function takes a token from the bucket of a key, which starts full.
+
+        :param self: Represent the instance of the class
+        :param key: str: The client and the scope of the bucket
+        :param rate: float: How many tokens the bucket earns per second
+        :param burst: int: How many tokens the bucket holds at most
+        :return: 0 when a token was taken, or the seconds until the next one otherwise
+        :doc-author: Trelent
+        """
+        now = time.monotonic()
+        with self.lock:
+            tokens, updated_at, _ = self.buckets.get(key, (burst, now, now))
+            tokens = refill(tokens, updated_at, rate, burst, now)
+            wait = 0 if tokens >= 1 else (1 - tokens) / rate
+            if not wait:
+                tokens -= 1
+            # Also keeps when the bucket is full again, to know which buckets can be dropped.
+            self.buckets[key] = (tokens, now, now + (burst - tokens) / rate)
+            if len(self.buckets) > MAX_LOCAL_BUCKETS:
+                self.buckets = {
+                    key: bucket
+                    for key, bucket in self.buckets.items()
+                    if bucket[2] > now
+                }
+            return wait
+
+
+class CacheBucketStore:
+    """
+    Token buckets kept in the THROTTLE_CACHE_ALIAS cache, e.g. Redis or Memcached, so every worker throttles the
+    clients together. A bucket is read and written back without a lock, so concurrent requests of the same client
+    on different workers may both take its last token.
+    """
+
+    def __init__(self):
+        self.cache = caches[settings.THROTTLE_CACHE_ALIAS]
+
+    def take(self, key: str, rate: float, burst: int):
+        now = time.time()
+        cache_key = f"throttle:{key}"
+        tokens, updated_at = self.cache.get(cache_key, (burst, now))
+        tokens = refill(tokens, updated_at, rate, burst, now)
+        if tokens >= 1:
+            tokens -= 1
+            wait = 0
+        else:
+            wait = (1 - tokens) / rate
+        # The bucket is full again by the time it expires, which is the same as no bucket.
+        self.cache.set(cache_key, (tokens, now), math.ceil(burst / rate))
+        return wait
+
+
+def get_bucket_store():
+    """
+    The get_bucket_store function returns a token bucket store of the class set by the THROTTLE_STORE setting.
+
+    :return: The store
+    :doc-author: Trelent
+    """
+    return import_string(settings.THROTTLE_STORE)()
+
+
+def get_client_ident(request):
+    """
+    The get_client_ident function identifies the client of a request by its address. Behind THROTTLE_NUM_PROXIES
+    proxies, it is the address the farthest trusted proxy saw in X-Forwarded-For, since the client can set the
+    ones before it.
+
+    :param request: The request being answered
+    :return: The address of the client
+    :doc-author: Trelent
+    """
+    forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
+    num_proxies = settings.THROTTLE_NUM_PROXIES
+    if forwarded_for and num_proxies:
+        addresses = [address.strip() for address in forwarded_for.split(",")]
+        return addresses[-min(num_proxies, len(addresses))]
+    return request.META.get("REMOTE_ADDR", "")
+
+
+class ConcurrencyLimiter:
+    """
+    Admits at most max_concurrency requests at once, and makes the others wait in a queue of at most max_queue
+    requests. The requests that cannot wait are rejected right away, so the admitted ones keep their latency
+    instead of all of them slowing down together.
+
+    How long a request may wait follows Controlled Delay: queue_timeout while the queue empties regularly, which
+    absorbs bursts, but only queue_target once it has not been empty for queue_timeout, since the server is then
+    overloaded and a long wait only adds to the latency of the requests that end up admitted.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int,
+        queue_timeout: float,
+        queue_target: float,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.queue_target = queue_target
+        # Reentrant, so acquire can start with try_acquire.
+        self.condition = threading.Condition(threading.RLock())
+        self.in_flight = 0
+        self.queued = 0
+        self.last_empty_at = time.monotonic()
+        self.admitted = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.rejected = 0
+
+    def try_acquire(self):
+        """
+        The try_acquire function admits the request if it does not have to wait.
+
+        :param self: Represent the instance of the class
+        :return: True if the request was admitted
+        :doc-author: Trelent
+        """
+        with self.condition:
+            if self.in_flight < self.max_concurrency and not self.queued:
+                self.in_flight += 1
+                self.admitted += 1
+                return True
+            return False
+
+    def acquire(self):
+        """
+        The acquire function admits the request, waiting in the queue for a request to finish if needed.
+
+        :param self: Represent the instance of the class
+        :return: True if the request was admitted, False if it must be rejected
+        :doc-author: Trelent
+        """
+        with self.condition:
+            if self.try_acquire():
+                return True
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                return False
+
+            started_at = time.monotonic()
+            if not self.queued:
+                self.last_empty_at = started_at
+            overloaded = started_at - self.last_empty_at > self.queue_timeout
+            deadline = started_at + (
+                self.queue_target if overloaded else self.queue_timeout
+            )
+            self.queued += 1
+            self.waits += 1
+            try:
+                while self.in_flight >= self.max_concurrency:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.rejected += 1
+                        return False
+                    self.condition.wait(remaining)
+                self.in_flight += 1
+                self.admitted += 1
+                return True
+            finally:
+                self.queued -= 1
+                now = time.monotonic()
+                self.wait_seconds += now - started_at
+                if not self.queued:
+                    self.last_empty_at = now
+
+    def release(self):
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify()
+
+    def stats(self):
+        """
+        The stats function returns how busy the limiter is, and how many requests it admitted and rejected.
+
+        :param self: Represent the instance of the class
+        :return: A dictionary with the stats
+        :doc-author: Trelent
+        """
+        with self.condition:
+            return {
+                "in_flight": self.in_flight,
+                "queued": self.queued,
+                "admitted": self.admitted,
+                "waits": self.waits,
+                "wait_seconds": self.wait_seconds,
+                "rejected": self.rejected,
+            }
+
+
+def get_throttle_wait(store, request):
+    """
+    The get_throttle_wait function takes a token from the bucket of the client of a request for its scope: "read"
+    for the GET, HEAD and OPTIONS requests, "write" for the other ones, limited by the THROTTLE_RATES setting.
+
+    :param store: The token bucket store
+    :param request: The request being answered
+    :return: 0 when the request is admitted, or the seconds until the client may retry otherwise
+    :doc-author: Trelent
+    """
+    scope = "read" if request.method in ("GET", "HEAD", "OPTIONS") else "write"
+    limits = settings.THROTTLE_RATES.get(scope)
+    if not limits:
+        return 0
+    key = f"{scope}:{get_client_ident(request)}"
+    return store.take(key, limits["rate"], limits["burst"])
+
+
+def count_throttled():
+    with admission_lock:
+        admission_state["throttled"] += 1
+
+
+def format_retry_after(seconds: float):
+    return str(max(1, math.ceil(seconds)))
@@ -0,0 +1,114 @@
+import collections
+import functools
+import logging
+
+from django.conf import settings
+
+from core.metrics import push_query_counter, query_counters
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryBudget:
+    """
+    Counts the SQL queries run inside a block, and the time they took, and complains when they go over a budget:
+    it raises QueryBudgetExceeded with action="raise", as in the tests, or logs a warning with action="log".
+    It is used as a context manager or as a decorator:
+
+        with QueryBudget(max_queries=1):
+            client.get("/api/target/")
+
+    The queries run in the threads of sync_to_async are counted too, since the counters follow the context.
+    """
+
+    def __init__(
+        self,
+        max_queries: int = None,
+        max_seconds: float = None,
+        action: str = "raise",
+        name: str = "Block",
+    ):
+        self.max_queries = max_queries
+        self.max_seconds = max_seconds
+        self.action = action
+        self.name = name
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.statements = collections.Counter()
+
+    def add_query(self, sql: str, seconds: float):
+        self.queries += 1
+        self.sql_seconds += seconds
+        self.statements[sql] += 1
+
+    def __enter__(self):
+        self.token = push_query_counter(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        query_counters.reset(self.token)
+        if exc_type is None:
+            self.check()
+
+    def __call__(self, function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            # A new budget per call, so concurrent and nested calls do not share their counts.
+            budget = QueryBudget(
+                self.max_queries, self.max_seconds, self.action, function.__qualname__
+            )
+            with budget:
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    def check(self):
+        """
+        The check function raises or logs, depending on the action, when the queries went over the budget.
+        The message includes the most repeated query, which is usually the one run once per row by an N+1.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        over_queries = self.max_queries is not None and self.queries > self.max_queries
+        over_seconds = (
+            self.max_seconds is not None and self.sql_seconds > self.max_seconds
+        )
+        if not over_queries and not over_seconds:
+            return
+
+        message = (
+            f"{self.name} ran {self.queries} SQL queries in {self.sql_seconds * 1000:.1f} ms, "
+            f"over its budget of {self.max_queries} queries and {self.max_seconds} seconds."
+        )
+        if self.statements:
+            sql, count = self.statements.most_common(1)[0]
+            message += f" Most repeated query ({count}x): {sql}"
+
+        if self.action == "raise":
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+def get_query_budget(method: str, view: str):
+    """
+    The get_query_budget function returns the limits of a request in the QUERY_BUDGETS setting: the default ones,
+    overridden by the ones of its view, overridden by the ones of its method on that view, like
+    "GET target:target-list".
+
+    :param method: str: The HTTP method of the request
+    :param view: str: The name of the view
+    :return: A dictionary with the optional queries and seconds limits
+    :doc-author: Trelent
+    """
+    budgets = settings.QUERY_BUDGETS
+    return {
+        **budgets.get("default", {}),
+        **budgets.get(view, {}),
+        **budgets.get(f"{method} {view}", {}),
+    }
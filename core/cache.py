@@ -0,0 +1,91 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+GENERATION_KEY = "targets:generation"
+
+
+class ResponseCacheStats:
+    """
+    Process-local hit and miss counters of the response cache.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit: bool):
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def as_dict(self):
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+response_cache_stats = ResponseCacheStats()
+
+
+def get_targets_cache():
+    """
+    The get_targets_cache function returns the cache backend configured by the TARGETS_CACHE_ALIAS setting.
+    Local memory is enough for a single process, but multiple workers must share a cache (e.g. Redis), otherwise
+    a write handled by one worker does not invalidate the responses cached by the others.
+
+    :return: The cache backend used for the targets
+    :doc-author: Trelent
+    """
+    return caches[settings.TARGETS_CACHE_ALIAS]
+
+
+def get_generation():
+    """
+    The get_generation function returns the current generation of the targets table, a number that changes
+    every time a target is written.
+    Generations are nanosecond timestamps, so a generation lost by the cache is never reused by a new one.
+
+    :return: The current generation as an int
+    :doc-author: Trelent
+    """
+    cache = get_targets_cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(GENERATION_KEY, time.time_ns())
+    return generation
+
+
+def bump_generation():
+    """
+    The bump_generation function moves the targets table to a new generation, which invalidates everything
+    cached for the previous one.
+
+    :return: The new generation as an int
+    :doc-author: Trelent
+    """
+    cache = get_targets_cache()
+    generation = max(time.time_ns(), cache.get(GENERATION_KEY, 0) + 1)
+    cache.set(GENERATION_KEY, generation, timeout=None)
+    return generation
+
+
+def invalidate_targets(using: str = DEFAULT_DB_ALIAS):
+    """
+    The invalidate_targets function must be called by every path that writes targets.
+    The generation is bumped right away and, when inside a transaction, once again after the commit, so a read
+    done between the write and the commit can not leave stale data cached for the new generation.
+
+    :param using: str: The alias of the database where the targets were written
+    :return: None
+    :doc-author: Trelent
+    """
+    bump_generation()
+    if connections[using].in_atomic_block:
+        transaction.on_commit(bump_generation, using=using)
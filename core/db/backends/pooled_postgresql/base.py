@@ -0,0 +1,125 @@
+import functools
+
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from core.db.pool import ConnectionPool, PoolTimeout, get_pool
+
+# Transaction states of a released connection (psycopg2.extensions.TRANSACTION_STATUS_*).
+TRANSACTION_IDLE = 0
+TRANSACTION_UNKNOWN = 4
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    PostgreSQL backend that borrows its connections from a process-wide pool instead of opening one per request.
+    Closing the connection, which Django does at the end of each request when CONN_MAX_AGE is 0, gives it back.
+
+    The pool is configured by the POOL key of the database settings: MAX_SIZE, the most connections opened at once,
+    TIMEOUT, how many seconds a request waits for one when all of them are in use, and CHECK_IDLE_SECONDS, how long
+    a connection must have been idle to be checked before it is handed out again, when CONN_HEALTH_CHECKS is set.
+    """
+
+    # Whether a server-side cursor declared WITH HOLD may still be open on the connection.
+    holds_cursors = False
+
+    def create_pool(self):
+        options = self.settings_dict.get("POOL", {})
+        check = is_healthy if self.settings_dict["CONN_HEALTH_CHECKS"] else None
+        return ConnectionPool(
+            max_size=options.get("MAX_SIZE", 20),
+            timeout=options.get("TIMEOUT", 10),
+            check=check,
+            check_idle_seconds=options.get("CHECK_IDLE_SECONDS", 30),
+        )
+
+    def create_cursor(self, name=None):
+        """
+        The create_cursor function remembers when a server-side cursor is declared WITH HOLD, which Django does
+        outside of transactions. Those cursors outlive the transaction, so when the iteration is not consumed to
+        the end they would stay open on the connection after it is given back to the pool.
+
+        :param self: Represent the instance of the class
+        :param name: The name of the server-side cursor, or None for a client-side cursor
+        :return: A psycopg2 cursor
+        :doc-author: Trelent
+        """
+        if name and self.connection.autocommit:
+            self.holds_cursors = True
+        return super().create_cursor(name)
+
+    def get_new_connection(self, conn_params):
+        """
+        The get_new_connection function takes a connection from the pool of the database, opening a new one only
+        when no idle connection is left.
+
+        :param self: Represent the instance of the class
+        :param conn_params: The parameters of psycopg2.connect
+        :return: A psycopg2 connection
+        :doc-author: Trelent
+        """
+        pool = get_pool(self.alias, self.create_pool)
+        try:
+            connection = pool.acquire(
+                functools.partial(super().get_new_connection, conn_params)
+            )
+        except PoolTimeout as error:
+            raise self.Database.OperationalError(str(error)) from error
+        self.isolation_level = IsolationLevel(
+            self.settings_dict["OPTIONS"].get(
+                "isolation_level", IsolationLevel.READ_COMMITTED
+            )
+        )
+        return connection
+
+    def _close(self):
+        """
+        The _close function gives the connection back to the pool, rolled back to a clean state and without the
+        cursors left open WITH HOLD, or closes it when it is broken.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        if self.connection is None:
+            return
+        pool = get_pool(self.alias, self.create_pool)
+        connection = self.connection
+        with self.wrap_database_errors:
+            status = None if connection.closed else connection.info.transaction_status
+            if status is None or status == TRANSACTION_UNKNOWN:
+                pool.discard(connection)
+                return
+            try:
+                if status != TRANSACTION_IDLE:
+                    connection.rollback()
+                if self.holds_cursors:
+                    with connection.cursor() as cursor:
+                        cursor.execute("CLOSE ALL")
+            except self.Database.Error:
+                pool.discard(connection)
+                raise
+            finally:
+                self.holds_cursors = False
+            pool.release(connection)
+
+
+def is_healthy(connection):
+    """
+    The is_healthy function checks that an idle connection still works before it is handed out again, since the
+    server or a proxy may have closed it in the meantime.
+
+    :param connection: The idle psycopg2 connection
+    :return: True if the connection can be reused
+    :doc-author: Trelent
+    """
+    if connection.closed:
+        return False
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        if connection.info.transaction_status != TRANSACTION_IDLE:
+            connection.rollback()
+    except Exception:
+        return False
+    return True
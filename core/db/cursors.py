@@ -0,0 +1,21 @@
+from django.db import connections, transaction
+
+
+def iterate_queryset(queryset, chunk_size: int):
+    """
+    The iterate_queryset function iterates over a queryset with a server-side cursor, chunk_size rows at a time.
+    Outside of a transaction, Django declares the cursor WITH HOLD, so it outlives the implicit transaction of the
+    query. Behind a pooler in transaction mode (PgBouncer), the next transaction may run on another server
+    connection, where the cursor does not exist, so for the databases with TRANSACTION_POOLING the iteration is
+    wrapped in a transaction, which keeps the server connection until the cursor is closed.
+
+    :param queryset: The queryset being iterated
+    :param chunk_size: int: How many rows are fetched from the database at a time
+    :return: A generator of the results of the queryset
+    :doc-author: Trelent
+    """
+    if not connections[queryset.db].settings_dict.get("TRANSACTION_POOLING"):
+        yield from queryset.iterator(chunk_size=chunk_size)
+        return
+    with transaction.atomic(using=queryset.db):
+        yield from queryset.iterator(chunk_size=chunk_size)
@@ -0,0 +1,17 @@
+from django.db import models
+
+
+class CurrentTransactionId(models.Func):
+    """
+    The id of the transaction writing the row. PostgreSQL assigns them as the transactions start, so a row with a
+    lower id than another one may commit after it. SQLite runs one writing transaction at a time, where the ids of
+    the rows already follow the commits, so it is always 0 there.
+    """
+
+    output_field = models.BigIntegerField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        return "0", []
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return "(pg_current_xact_id()::text::bigint)", []
@@ -0,0 +1,205 @@
+import collections
+import threading
+import time
+
+# One pool per database alias, created by the pooled backend the first time the alias connects.
+pools = {}
+pools_lock = threading.Lock()
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """
+    A thread-safe pool of DB-API connections, opened on demand up to max_size and handed out in LIFO order, so the
+    connections that keep being used stay warm and the others can be closed by the server when idle.
+
+    The check, when given, is only run on the connections that were idle for more than check_idle_seconds, since
+    those are the ones the server or a proxy may have closed, so a busy pool does not pay a round trip per acquire.
+    """
+
+    def __init__(
+        self, max_size: int, timeout: float, check=None, check_idle_seconds=0.0
+    ):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check = check
+        self.check_idle_seconds = check_idle_seconds
+        self.idle = collections.deque()
+        self.condition = threading.Condition()
+        self.size = 0
+        self.waiting = 0
+        self.acquired = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.timeouts = 0
+        self.discarded = 0
+
+    def acquire(self, connect):
+        """
+        The acquire function takes an idle connection from the pool, opens a new one if the pool is not full, or
+        waits up to timeout seconds for another thread to release one.
+
+        :param self: Represent the instance of the class
+        :param connect: A callable opening a new connection
+        :return: A DB-API connection
+        :doc-author: Trelent
+        """
+        while True:
+            connection, idle_seconds = self.take()
+            if connection is None:
+                try:
+                    return connect()
+                except Exception:
+                    self.forget()
+                    raise
+            if (
+                self.check is None
+                or idle_seconds < self.check_idle_seconds
+                or self.check(connection)
+            ):
+                return connection
+            self.discard(connection)
+
+    def take(self):
+        """
+        The take function reserves a slot of the pool, waiting for one if needed.
+
+        :param self: Represent the instance of the class
+        :return: An idle connection and for how many seconds it was idle, or None when a new connection must be
+            opened for the reserved slot
+        :doc-author: Trelent
+        """
+        started_at = None
+        with self.condition:
+            while not self.idle and self.size >= self.max_size:
+                if started_at is None:
+                    started_at = time.monotonic()
+                    self.waits += 1
+                remaining = self.timeout - (time.monotonic() - started_at)
+                if remaining <= 0:
+                    self.timeouts += 1
+                    self.wait_seconds += time.monotonic() - started_at
+                    raise PoolTimeout(
+                        f"No database connection was released within {self.timeout} seconds "
+                        f"({self.max_size} connections in use)."
+                    )
+                self.waiting += 1
+                try:
+                    self.condition.wait(remaining)
+                finally:
+                    self.waiting -= 1
+
+            if started_at is not None:
+                self.wait_seconds += time.monotonic() - started_at
+            self.acquired += 1
+            if self.idle:
+                connection, released_at = self.idle.pop()
+                return connection, time.monotonic() - released_at
+            self.size += 1
+            return None, 0.0
+
+    def release(self, connection):
+        """
+        The release function gives a connection back to the pool, waking up a thread waiting for one.
+
+        :param self: Represent the instance of the class
+        :param connection: The connection returned by acquire
+        :return: None
+        :doc-author: Trelent
+        """
+        with self.condition:
+            self.idle.append((connection, time.monotonic()))
+            self.condition.notify()
+
+    def discard(self, connection):
+        """
+        The discard function closes a broken connection and frees its slot, so a new connection can be opened.
+
+        :param self: Represent the instance of the class
+        :param connection: The connection returned by acquire
+        :return: None
+        :doc-author: Trelent
+        """
+        self.forget()
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def forget(self):
+        with self.condition:
+            self.size -= 1
+            self.discarded += 1
+            self.condition.notify()
+
+    def close(self):
+        """
+        The close function closes the idle connections. The connections in use are closed when released.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        with self.condition:
+            connections, self.idle = list(self.idle), collections.deque()
+            self.size -= len(connections)
+            self.condition.notify_all()
+        for connection, _ in connections:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def stats(self):
+        """
+        The stats function returns the saturation and wait time metrics of the pool.
+
+        :param self: Represent the instance of the class
+        :return: A dictionary of gauges (size, idle, in_use, waiting) and counters since the pool was created
+        :doc-author: Trelent
+        """
+        with self.condition:
+            return {
+                "max_size": self.max_size,
+                "size": self.size,
+                "idle": len(self.idle),
+                "in_use": self.size - len(self.idle),
+                "waiting": self.waiting,
+                "saturation": (self.size - len(self.idle)) / self.max_size,
+                "acquired": self.acquired,
+                "waits": self.waits,
+                "wait_seconds": self.wait_seconds,
+                "timeouts": self.timeouts,
+                "discarded": self.discarded,
+            }
+
+
+def get_pool(alias: str, create):
+    """
+    The get_pool function returns the pool of a database alias, creating it on first use.
+
+    :param alias: str: The database alias
+    :param create: A callable returning a new ConnectionPool
+    :return: The ConnectionPool of the alias
+    :doc-author: Trelent
+    """
+    pool = pools.get(alias)
+    if pool is None:
+        with pools_lock:
+            pool = pools.get(alias)
+            if pool is None:
+                pool = pools[alias] = create()
+    return pool
+
+
+def get_pool_stats():
+    """
+    The get_pool_stats function returns the metrics of every pool opened by this process.
+
+    :return: A dictionary mapping each database alias to the stats of its pool
+    :doc-author: Trelent
+    """
+    return {alias: pool.stats() for alias, pool in list(pools.items())}
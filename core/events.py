@@ -0,0 +1,513 @@
+import asyncio
+import datetime
+import functools
+import json
+import logging
+import threading
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    DatabaseError,
+    close_old_connections,
+    transaction,
+)
+from django.utils.module_loading import import_string
+
+from core.exporters import EXPORT_FIELDS, iter_target_rows
+from core.utils import bbox_contains, seconds_until_midnight
+
+logger = logging.getLogger(__name__)
+
+EXPIRED = "expired"
+# Sent to the subscribers whose viewport an updated target left.
+REMOVED = "removed"
+# Sent to every subscriber when more changes were missed than are worth replaying.
+RESET = "reset"
+
+# How long browsers wait before reconnecting a dropped event stream.
+RECONNECT_DELAY_MS = 3000
+# The longest wait before reading from the database again after it failed.
+MAX_RETRY_DELAY = 30
+
+
+def render_event(action: str, target_id: str, target: dict = None):
+    data = json.dumps({"id": target_id, "action": action, "target": target})
+    return f"event: {action}\ndata: {data}\n\n"
+
+
+class TargetEvent:
+    """
+    A change of a target, rendered as a Server-Sent Event once, whatever the number of subscribers it is sent to.
+    The position is unknown for deleted targets, so their events are sent to every subscriber. An updated target
+    also has the position it had before, so the subscribers whose viewport it left get a removed event instead.
+    """
+
+    __slots__ = (
+        "action",
+        "target_id",
+        "lat",
+        "lng",
+        "previous_lat",
+        "previous_lng",
+        "message",
+        "removed_message",
+    )
+
+    def __init__(self, action: str, target_id, row: dict = None, previous=None):
+        self.action = action
+        self.target_id = str(target_id)
+        self.lat = row["lat"] if row else None
+        self.lng = row["lng"] if row else None
+        self.previous_lat, self.previous_lng = previous or (None, None)
+        target = {field: row[field] for field in EXPORT_FIELDS} if row else None
+        self.message = render_event(action, self.target_id, target)
+        self.removed_message = (
+            render_event(REMOVED, self.target_id) if previous else None
+        )
+
+
+class ResetEvent(TargetEvent):
+    """
+    Tells every subscriber to reload the targets through the list or the change feed, instead of receiving the
+    changes one by one.
+    """
+
+    def __init__(self):
+        self.action = RESET
+        self.target_id = None
+        self.lat = self.lng = self.previous_lat = self.previous_lng = None
+        self.message = render_event(RESET, None)
+        self.removed_message = None
+
+
+def load_target_events(
+    action: str, target_ids, using: str = DEFAULT_DB_ALIAS, previous_positions=None
+):
+    """
+    The load_target_events function builds the events of targets that were written, with their current data read
+    by a single query. The targets that do not exist anymore are reported as deleted.
+
+    :param action: str: created, updated or deleted
+    :param target_ids: The ids of the targets that were written
+    :param using: str: The alias of the database where the targets were written
+    :param previous_positions: A dictionary with the lat and lng of the updated targets before the write, by id
+    :return: A list of events
+    :doc-author: Trelent
+    """
+    # Imported here since the models publish their changes through this module.
+    from core.models import Target, TargetChange
+
+    rows = {}
+    if action != TargetChange.DELETED:
+        queryset = Target.objects.using(using).filter(id__in=target_ids)
+        for row in iter_target_rows(queryset, settings.TARGETS_EXPORT_CHUNK_SIZE):
+            rows[row["id"]] = row
+
+    previous_positions = previous_positions or {}
+    events = []
+    for target_id in target_ids:
+        row = rows.get(str(target_id))
+        events.append(
+            TargetEvent(
+                action if row else TargetChange.DELETED,
+                target_id,
+                row,
+                previous_positions.get(target_id),
+            )
+        )
+    return events
+
+
+def load_expired_events(date: datetime.date):
+    """
+    The load_expired_events function builds the events of the targets that stop being live on the given date.
+
+    :param date: datetime.date: The date that just started
+    :return: A list of events
+    :doc-author: Trelent
+    """
+    from core.models import Target
+
+    queryset = Target.objects.filter(expiration_date=date)
+    return [
+        TargetEvent(EXPIRED, row["id"], row)
+        for row in iter_target_rows(queryset, settings.TARGETS_EXPORT_CHUNK_SIZE)
+    ]
+
+
+def load_logged_events(since):
+    """
+    The load_logged_events function builds the events of the changes committed to the change log after the given
+    position, by any process. Only the last change of each target is kept, with the position it had before the
+    first one.
+    At most TARGETS_CHANGES_PAGE_SIZE entries are replayed, e.g. after the database was unreachable for a while.
+    Past that, the log is skipped to its end and a single reset event makes the subscribers reload the targets, so
+    a long backlog is never held in memory.
+
+    :param since: A tuple with the transaction id and the id of the last change log entry already published
+    :return: A tuple with the position of the last change log entry read and the list of events
+    :doc-author: Trelent
+    """
+    from core.models import TargetChange
+
+    limit = settings.TARGETS_CHANGES_PAGE_SIZE
+    entries = list(
+        TargetChange.objects.after(since).values_list(
+            "transaction_id",
+            "id",
+            "target_id",
+            "action",
+            "previous_lat",
+            "previous_lng",
+        )[: limit + 1]
+    )
+    if len(entries) > limit:
+        return TargetChange.objects.get_last_position(), [ResetEvent()]
+
+    last_actions = {}
+    previous_positions = {}
+    for _, _, target_id, action, previous_lat, previous_lng in entries:
+        last_actions.pop(target_id, None)
+        last_actions[target_id] = action
+        previous_positions.setdefault(target_id, (previous_lat, previous_lng))
+    if entries:
+        since = entries[-1][:2]
+
+    events = []
+    for action, _ in TargetChange.ACTION_CHOICES:
+        target_ids = [
+            target_id
+            for target_id, last_action in last_actions.items()
+            if last_action == action
+        ]
+        if target_ids:
+            events.extend(
+                load_target_events(
+                    action, target_ids, previous_positions=previous_positions
+                )
+            )
+    return since, events
+
+
+def get_last_logged_change():
+    """
+    The get_last_logged_change function returns the position of the last committed entry of the change log.
+
+    :return: A tuple with its transaction id and id, or (0, 0) when the log is empty
+    :doc-author: Trelent
+    """
+    from core.models import TargetChange
+
+    return TargetChange.objects.get_last_position()
+
+
+class Subscription:
+    """
+    A client listening to the events of the targets inside a bounding box, or of every target when there is no box.
+    The events are queued on the event loop of the client. A client that does not keep up is dropped instead of
+    buffering without limit, and catches up through the change feed once it reconnects.
+    """
+
+    def __init__(self, bbox=None):
+        self.bbox = bbox
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(settings.TARGETS_EVENTS_QUEUE_SIZE)
+        self.closed = False
+
+    def render(self, event: TargetEvent):
+        """
+        The render function returns what the subscriber is sent for an event: the event itself when the target is
+        inside the bounding box, a removed event when it was inside before the change but is not anymore, and
+        nothing otherwise.
+
+        :param self: Refer to the subscription itself
+        :param event: TargetEvent: The event
+        :return: The message, or None
+        :doc-author: Trelent
+        """
+        if self.bbox is None or event.lat is None or event.lng is None:
+            return event.message
+        if bbox_contains(self.bbox, event.lat, event.lng):
+            return event.message
+        if (
+            event.removed_message is not None
+            and event.previous_lat is not None
+            and event.previous_lng is not None
+            and bbox_contains(self.bbox, event.previous_lat, event.previous_lng)
+        ):
+            return event.removed_message
+        return None
+
+    def deliver(self, message: str):
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.close()
+
+    def close(self):
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    async def get(self):
+        return await self.queue.get()
+
+
+def deliver_all(deliveries):
+    for subscription, message in deliveries:
+        subscription.deliver(message)
+
+
+async def recover_from_database_error(failures: int):
+    """
+    The recover_from_database_error function is called by the background work of the brokers when a read from the
+    database failed. It logs the error, closes the connection it broke, so the next read opens a new one, and waits
+    longer after each consecutive failure before the work goes on.
+
+    :param failures: int: How many reads failed in a row
+    :return: None
+    :doc-author: Trelent
+    """
+    logger.exception("Could not read the target events from the database.")
+    await sync_to_async(close_old_connections)()
+    await asyncio.sleep(
+        min(settings.TARGETS_EVENTS_POLL_INTERVAL * 2**failures, MAX_RETRY_DELAY)
+    )
+
+
+class LocalBroker:
+    """
+    In-process fan-out of the target events to the subscribers of this process.
+    It only sees the writes made by this same process, so deployments with multiple workers should use the
+    ChangeLogBroker instead.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions = {}
+        self.tasks = {}
+
+    def subscribe(self, bbox=None):
+        """
+        The subscribe function registers a new subscriber, and starts the background work of the broker on the
+        event loop of the subscriber if it is the first one there, or if it stopped.
+
+        :param self: Refer to the broker itself
+        :param bbox: A tuple with min_lng, min_lat, max_lng and max_lat, or None to receive every event
+        :return: The subscription
+        :doc-author: Trelent
+        """
+        subscription = Subscription(bbox)
+        loop = subscription.loop
+        with self.lock:
+            self.subscriptions.setdefault(loop, set()).add(subscription)
+            task = self.tasks.get(loop)
+            if task is None or task.done():
+                self.tasks[loop] = loop.create_task(self.run())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """
+        The unsubscribe function removes a subscriber, and stops the background work of the broker on its event loop
+        if it was the last one there.
+
+        :param self: Refer to the broker itself
+        :param subscription: Subscription: The subscription returned by subscribe
+        :return: None
+        :doc-author: Trelent
+        """
+        loop = subscription.loop
+        task = None
+        with self.lock:
+            subscriptions = self.subscriptions.get(loop, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self.subscriptions.pop(loop, None)
+                task = self.tasks.pop(loop, None)
+        if task is not None:
+            task.cancel()
+
+    def has_subscribers(self):
+        return bool(self.subscriptions)
+
+    def notify(
+        self,
+        action: str,
+        target_ids,
+        using: str = DEFAULT_DB_ALIAS,
+        previous_positions=None,
+    ):
+        """
+        The notify function is called by every path that writes targets. The events are published once the
+        transaction is committed, and only if someone is listening.
+
+        :param self: Refer to the broker itself
+        :param action: str: created, updated or deleted
+        :param target_ids: The list of ids of the targets that were written
+        :param using: str: The alias of the database where the targets were written
+        :param previous_positions: A dictionary with the lat and lng of the updated targets before the write, by id
+        :return: None
+        :doc-author: Trelent
+        """
+        if self.has_subscribers():
+            transaction.on_commit(
+                functools.partial(
+                    self.publish_changes, action, target_ids, using, previous_positions
+                ),
+                using=using,
+            )
+
+    def publish_changes(
+        self, action: str, target_ids, using: str, previous_positions=None
+    ):
+        if self.has_subscribers():
+            self.publish(
+                load_target_events(action, target_ids, using, previous_positions)
+            )
+
+    def publish(self, events):
+        """
+        The publish function sends the events to the subscribers whose bounding box contains them. It can be called
+        from any thread: the events are handed to each event loop with a single thread-safe callback.
+
+        :param self: Refer to the broker itself
+        :param events: The list of events
+        :return: None
+        :doc-author: Trelent
+        """
+        with self.lock:
+            groups = [
+                (loop, list(subscriptions))
+                for loop, subscriptions in self.subscriptions.items()
+            ]
+
+        for loop, subscriptions in groups:
+            deliveries = []
+            for subscription in subscriptions:
+                message = "".join(
+                    filter(None, (subscription.render(event) for event in events))
+                )
+                if message:
+                    deliveries.append((subscription, message))
+            if deliveries and not loop.is_closed():
+                loop.call_soon_threadsafe(deliver_all, deliveries)
+
+    async def run(self):
+        await self.watch_expirations()
+
+    async def watch_expirations(self):
+        """
+        The watch_expirations function publishes, every midnight, the targets that stopped being live. When the
+        database fails, they are read again after a while.
+
+        :param self: Refer to the broker itself
+        :return: None
+        :doc-author: Trelent
+        """
+        date = datetime.date.today()
+        failures = 0
+        while True:
+            today = datetime.date.today()
+            if today == date:
+                await asyncio.sleep(seconds_until_midnight())
+                continue
+            try:
+                events = await sync_to_async(load_expired_events)(today)
+            except DatabaseError:
+                failures += 1
+                await recover_from_database_error(failures)
+                continue
+            failures = 0
+            date = today
+            self.publish(events)
+
+
+class ChangeLogBroker(LocalBroker):
+    """
+    Fan-out of the target events that reads the writes of every process from the change log, so it works across
+    workers and hosts without any other service. Each process polls the log once per TARGETS_EVENTS_POLL_INTERVAL,
+    whatever the number of its subscribers.
+    """
+
+    def notify(
+        self,
+        action: str,
+        target_ids,
+        using: str = DEFAULT_DB_ALIAS,
+        previous_positions=None,
+    ):
+        # The writes are picked up from the change log by poll_changes.
+        pass
+
+    async def run(self):
+        await asyncio.gather(self.watch_expirations(), self.poll_changes())
+
+    async def poll_changes(self):
+        """
+        The poll_changes function publishes the entries written to the change log since the previous poll. A poll
+        that fails is retried from the same entry, so no change is missed.
+
+        :param self: Refer to the broker itself
+        :return: None
+        :doc-author: Trelent
+        """
+        since = None
+        failures = 0
+        while True:
+            try:
+                if since is None:
+                    since = await sync_to_async(get_last_logged_change)()
+                await asyncio.sleep(settings.TARGETS_EVENTS_POLL_INTERVAL)
+                since, events = await sync_to_async(load_logged_events)(since)
+            except DatabaseError:
+                failures += 1
+                await recover_from_database_error(failures)
+                continue
+            failures = 0
+            self.publish(events)
+
+
+@functools.cache
+def get_broker():
+    """
+    The get_broker function returns the broker of this process, of the class set by the TARGETS_EVENTS_BROKER
+    setting.
+
+    :return: The broker
+    :doc-author: Trelent
+    """
+    return import_string(settings.TARGETS_EVENTS_BROKER)()
+
+
+async def stream_events(broker, bbox=None):
+    """
+    The stream_events function is an asynchronous generator with the Server-Sent Events stream of one client.
+    The client is only subscribed once the stream starts, and unsubscribed as soon as it disconnects. A comment is
+    sent every TARGETS_EVENTS_KEEPALIVE seconds, so idle connections are not closed by proxies.
+
+    :param broker: The broker the client subscribes to
+    :param bbox: A tuple with min_lng, min_lat, max_lng and max_lat, or None to receive every event
+    :return: An asynchronous generator of strings
+    :doc-author: Trelent
+    """
+    subscription = broker.subscribe(bbox)
+    try:
+        yield f"retry: {RECONNECT_DELAY_MS}\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(
+                    subscription.get(), settings.TARGETS_EVENTS_KEEPALIVE
+                )
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if message is None:
+                return
+            yield message
+    finally:
+        broker.unsubscribe(subscription)
@@ -0,0 +1,155 @@
+import csv
+import io
+import json
+
+from asgiref.sync import sync_to_async
+
+from core.db.cursors import iterate_queryset
+
+EXPORT_FIELDS = ("id", "name", "latitude", "longitude", "expiration_date")
+
+# Rows are grouped in chunks of about this many characters before being written, to avoid a write per row.
+EXPORT_BUFFER_SIZE = 64 * 1024
+
+
+def iter_target_rows(queryset, chunk_size: int):
+    """
+    The iter_target_rows function iterates over the targets of a queryset as dictionaries, using a server-side
+    cursor where the database supports it, so only chunk_size rows are held in memory at a time.
+
+    :param queryset: The queryset of targets to be exported
+    :param chunk_size: int: How many rows are fetched from the database at a time
+    :return: A generator of dictionaries with the exported fields, plus the numeric lat/lng
+    :doc-author: Trelent
+    """
+    rows = queryset.order_by().values_list(*EXPORT_FIELDS, "lat", "lng")
+    for row in iterate_queryset(rows, chunk_size):
+        target_id, name, latitude, longitude, expiration_date, lat, lng = row
+        yield {
+            "id": str(target_id),
+            "name": name,
+            "latitude": latitude,
+            "longitude": longitude,
+            "expiration_date": expiration_date.isoformat(),
+            "lat": lat,
+            "lng": lng,
+        }
+
+
+def export_ndjson(rows):
+    """
+    The export_ndjson function renders the targets as newline delimited JSON, one object per line.
+
+    :param rows: A generator of target dictionaries
+    :return: A generator of strings
+    :doc-author: Trelent
+    """
+    for row in rows:
+        yield json.dumps({field: row[field] for field in EXPORT_FIELDS}) + "\n"
+
+
+def export_csv(rows):
+    """
+    The export_csv function renders the targets as CSV, with a header line.
+
+    :param rows: A generator of target dictionaries
+    :return: A generator of strings
+    :doc-author: Trelent
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def export_geojson(rows):
+    """
+    The export_geojson function renders the targets as a GeoJSON FeatureCollection, one Point feature per target.
+
+    :param rows: A generator of target dictionaries
+    :return: A generator of strings
+    :doc-author: Trelent
+    """
+    yield '{"type": "FeatureCollection", "features": ['
+    separator = ""
+    for row in rows:
+        geometry = None
+        if row["lat"] is not None and row["lng"] is not None:
+            geometry = {"type": "Point", "coordinates": [row["lng"], row["lat"]]}
+        feature = {
+            "type": "Feature",
+            "id": row["id"],
+            "geometry": geometry,
+            "properties": {field: row[field] for field in EXPORT_FIELDS},
+        }
+        yield separator + json.dumps(feature)
+        separator = ", "
+    yield "]}\n"
+
+
+EXPORTERS = {
+    "ndjson": ("application/x-ndjson", "ndjson", export_ndjson),
+    "csv": ("text/csv", "csv", export_csv),
+    "geojson": ("application/geo+json", "geojson", export_geojson),
+}
+
+
+def buffered(chunks, size: int = EXPORT_BUFFER_SIZE):
+    """
+    The buffered function joins small chunks of text into chunks of about the given size.
+
+    :param chunks: A generator of strings
+    :param size: int: The minimum size of each joined chunk, except for the last one
+    :return: A generator of strings
+    :doc-author: Trelent
+    """
+    pending = []
+    pending_size = 0
+    for chunk in chunks:
+        pending.append(chunk)
+        pending_size += len(chunk)
+        if pending_size >= size:
+            yield "".join(pending)
+            pending = []
+            pending_size = 0
+    if pending:
+        yield "".join(pending)
+
+
+def export_targets(queryset, export_format: str, chunk_size: int):
+    """
+    The export_targets function streams the targets of a queryset in the given format.
+    Both the rows read from the database and the text produced are consumed incrementally, so the memory used
+    does not depend on how many targets are exported.
+
+    :param queryset: The queryset of targets to be exported
+    :param export_format: str: ndjson, csv or geojson
+    :param chunk_size: int: How many rows are fetched from the database at a time
+    :return: A generator of strings
+    :doc-author: Trelent
+    """
+    _, _, exporter = EXPORTERS[export_format]
+    return buffered(exporter(iter_target_rows(queryset, chunk_size)))
+
+
+async def iterate_in_thread(chunks):
+    """
+    The iterate_in_thread function turns the generator of an export into an asynchronous one, for the ASGI
+    application, which would otherwise read a synchronous generator to the end before sending anything. Each chunk
+    is produced in the thread of the synchronous code, where the database connection of the request lives.
+
+    :param chunks: A generator of strings
+    :return: An asynchronous generator of the same strings
+    :doc-author: Trelent
+    """
+    end = object()
+    try:
+        while (chunk := await sync_to_async(next)(chunks, end)) is not end:
+            yield chunk
+    finally:
+        await sync_to_async(chunks.close)()
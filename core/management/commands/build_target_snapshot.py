@@ -0,0 +1,62 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.cache import get_generation
+from core.snapshot import build_snapshot
+
+
+class Command(BaseCommand):
+    """
+    Django command to write the live targets to the snapshot mapped by the workers.
+    """
+
+    help = (
+        "Writes the live targets to the snapshot file the workers answer the target list and detail from, once "
+        "or, with --interval, again whenever a target is written."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            default=settings.TARGETS_SNAPSHOT_PATH,
+            help="Where the snapshot is stored, TARGETS_SNAPSHOT_PATH by default.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Seconds between the checks for written targets, or 0 to build the snapshot once.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.TARGETS_EXPORT_CHUNK_SIZE,
+            help="How many targets are fetched from the database at a time.",
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        if not options["path"]:
+            raise CommandError("Set --path or the TARGETS_SNAPSHOT_PATH setting.")
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be a positive integer.")
+
+        generation = self.build(options["path"], options["chunk_size"])
+        while options["interval"] > 0:
+            time.sleep(options["interval"])
+            # The snapshot is only rebuilt when a target was written since, which bumps the generation.
+            if get_generation() != generation:
+                generation = self.build(options["path"], options["chunk_size"])
+
+    def build(self, path: str, chunk_size: int):
+        started_at = time.monotonic()
+        count, generation = build_snapshot(path, chunk_size)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {count} targets to {path} (generation {generation}) "
+                f"in {time.monotonic() - started_at:.2f} seconds."
+            )
+        )
+        return generation
@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from core.exporters import EXPORTERS, export_targets
+from core.models import Target
+from core.routers import get_replica
+
+
+class Command(BaseCommand):
+    """
+    Django command to export the targets to a NDJSON, CSV or GeoJSON file.
+    """
+
+    help = (
+        "Streams the live targets into a NDJSON, CSV or GeoJSON file, "
+        "reading them from the database in chunks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format",
+            choices=sorted(EXPORTERS),
+            default="ndjson",
+            help="Format of the exported file.",
+        )
+        parser.add_argument(
+            "--output",
+            default="-",
+            help="File the targets are written to, or - to write stdout.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.TARGETS_EXPORT_CHUNK_SIZE,
+            help="How many targets are fetched from the database at a time.",
+        )
+        parser.add_argument(
+            "--include-expired",
+            action="store_true",
+            help="Export the expired targets as well.",
+        )
+        parser.add_argument(
+            "--database",
+            help="Database alias the targets are read from, by default one of the replicas, or the primary.",
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be a positive integer.")
+
+        database = options["database"] or get_replica() or DEFAULT_DB_ALIAS
+        queryset = Target.objects.using(database)
+        if not options["include_expired"]:
+            queryset = queryset.live()
+
+        chunks = export_targets(queryset, options["format"], options["chunk_size"])
+
+        if options["output"] == "-":
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+
+        try:
+            with open(options["output"], "w", encoding="utf-8", newline="") as file:
+                for chunk in chunks:
+                    file.write(chunk)
+        except OSError as exception:
+            raise CommandError(f"Could not write {options['output']}: {exception}")
@@ -0,0 +1,266 @@
+import csv
+import datetime
+import io
+import itertools
+import json
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.utils import timezone
+
+from core.models import Target, TargetChange, validate_target_fields
+from core.utils import get_expiration_date_default, parse_coordinate
+
+COPY_COLUMNS = (
+    "id",
+    "name",
+    "latitude",
+    "longitude",
+    "lat",
+    "lng",
+    "expiration_date",
+    "updated_at",
+)
+
+
+class Command(BaseCommand):
+    """
+    Django command to import targets from a NDJSON or CSV file.
+    """
+
+    help = (
+        "Streams targets from a NDJSON or CSV file into the database, in fixed-size batches. "
+        "Uses COPY FROM STDIN on PostgreSQL and bulk_create on other databases."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to be imported, or - to read stdin.")
+        parser.add_argument(
+            "--format",
+            choices=["ndjson", "csv"],
+            help="Format of the file. Guessed from the extension when omitted.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.TARGETS_BULK_BATCH_SIZE,
+            help="How many targets are written at once.",
+        )
+        parser.add_argument(
+            "--database",
+            default="default",
+            help="Database alias the targets are written to.",
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        path = options["path"]
+        file_format = options["format"] or self.guess_format(path)
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+
+        connection = connections[options["database"]]
+        write_batch = (
+            self.copy_batch
+            if connection.vendor == "postgresql"
+            else self.bulk_create_batch
+        )
+
+        self.rejected = 0
+        imported = 0
+        started_at = time.perf_counter()
+
+        with self.open_file(path) as file:
+            targets = self.clean_rows(self.read_rows(file, file_format))
+            while batch := list(itertools.islice(targets, batch_size)):
+                # A batch is committed with its change log entries, or not at all.
+                with transaction.atomic(using=connection.alias):
+                    write_batch(connection, batch)
+                    TargetChange.objects.record(
+                        TargetChange.CREATED,
+                        [target.pk for target in batch],
+                        using=connection.alias,
+                    )
+                imported += len(batch)
+
+        elapsed = time.perf_counter() - started_at
+        rate = imported / elapsed if elapsed else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {imported} targets in {elapsed:.2f}s ({rate:.0f} rows/s), "
+                f"rejected {self.rejected} rows."
+            )
+        )
+
+    @staticmethod
+    def guess_format(path: str):
+        """
+        The guess_format function guesses the format of the file from its extension.
+
+        :param path: str: Path of the file to be imported
+        :return: The format of the file, ndjson or csv
+        :doc-author: Trelent
+        """
+        if path.endswith(".csv"):
+            return "csv"
+        if path.endswith((".ndjson", ".jsonl")):
+            return "ndjson"
+        raise CommandError("Could not guess the format of the file, use --format.")
+
+    @staticmethod
+    def open_file(path: str):
+        """
+        The open_file function opens the file to be imported, or wraps stdin when the path is -.
+
+        :param path: str: Path of the file to be imported
+        :return: A file object
+        :doc-author: Trelent
+        """
+        if path == "-":
+            return io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline="")
+        try:
+            return open(path, encoding="utf-8", newline="")
+        except OSError as exception:
+            raise CommandError(f"Could not open {path}: {exception}")
+
+    def read_rows(self, file, file_format: str):
+        """
+        The read_rows function is a generator that yields the rows of the file one by one, with their line number,
+        so the file is never fully loaded in memory.
+
+        :param self: Refer to the command itself
+        :param file: The file object being imported
+        :param file_format: str: The format of the file, ndjson or csv
+        :return: A generator of (line number, row) tuples
+        :doc-author: Trelent
+        """
+        if file_format == "csv":
+            reader = csv.DictReader(file)
+            for row in reader:
+                yield reader.line_num, row
+            return
+
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError:
+                self.reject(line_number, "Invalid JSON.")
+
+    def clean_rows(self, rows):
+        """
+        The clean_rows function is a generator that validates the rows with the same rules as create_target and
+        yields a Target for each valid row. The invalid rows are reported and skipped.
+
+        :param self: Refer to the command itself
+        :param rows: A generator of (line number, row) tuples
+        :return: A generator of targets ready to be written
+        :doc-author: Trelent
+        """
+        min_expiration_date = get_expiration_date_default()
+
+        for line_number, row in rows:
+            if not isinstance(row, dict):
+                self.reject(line_number, "Expected an object.")
+                continue
+
+            fields = {
+                key: row.get(key)
+                for key in ("name", "latitude", "longitude")
+                if row.get(key) is not None
+            }
+            try:
+                fields["expiration_date"] = (
+                    datetime.date.fromisoformat(row["expiration_date"])
+                    if row.get("expiration_date")
+                    else min_expiration_date
+                )
+            except (TypeError, ValueError):
+                self.reject(
+                    line_number, "Expiration Date must be written as YYYY-MM-DD."
+                )
+                continue
+
+            try:
+                validate_target_fields(fields, min_expiration_date)
+            except ValueError as exception:
+                self.reject(line_number, str(exception))
+                continue
+
+            yield Target(
+                name=str(fields["name"]),
+                latitude=str(fields["latitude"]),
+                longitude=str(fields["longitude"]),
+                lat=parse_coordinate(fields["latitude"], 90),
+                lng=parse_coordinate(fields["longitude"], 180),
+                expiration_date=fields["expiration_date"],
+            )
+
+    def reject(self, line_number: int, message: str):
+        """
+        The reject function reports a row that could not be imported.
+
+        :param self: Refer to the command itself
+        :param line_number: int: The line of the file where the row is
+        :param message: str: Why the row was rejected
+        :return: None
+        :doc-author: Trelent
+        """
+        self.rejected += 1
+        self.stderr.write(f"Line {line_number}: {message}")
+
+    @staticmethod
+    def bulk_create_batch(connection, batch):
+        """
+        The bulk_create_batch function writes a batch of targets with a single bulk_create.
+
+        :param connection: The connection of the database the targets are written to
+        :param batch: The list of targets
+        :return: None
+        :doc-author: Trelent
+        """
+        Target.objects.using(connection.alias).bulk_create(batch)
+
+    @staticmethod
+    def copy_batch(connection, batch):
+        """
+        The copy_batch function writes a batch of targets with a single COPY FROM STDIN, the fastest way to load
+        rows into PostgreSQL.
+
+        :param connection: The connection of the database the targets are written to
+        :param batch: The list of targets
+        :return: None
+        :doc-author: Trelent
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        updated_at = timezone.now().isoformat()
+        for target in batch:
+            writer.writerow(
+                [
+                    target.id,
+                    target.name,
+                    target.latitude,
+                    target.longitude,
+                    target.lat,
+                    target.lng,
+                    target.expiration_date.isoformat(),
+                    updated_at,
+                ]
+            )
+        buffer.seek(0)
+
+        table = connection.ops.quote_name(Target._meta.db_table)
+        columns = ", ".join(
+            connection.ops.quote_name(Target._meta.get_field(name).column)
+            for name in COPY_COLUMNS
+        )
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer
+            )
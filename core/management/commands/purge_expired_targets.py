@@ -0,0 +1,58 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Target, TargetChange
+
+
+class Command(BaseCommand):
+    """
+    Django command to delete the expired targets.
+    """
+
+    help = (
+        "Deletes the expired targets, and the change log entries older than the retention, in bounded batches. "
+        "Meant to be scheduled, e.g. daily from cron, right after midnight."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.TARGETS_BULK_BATCH_SIZE,
+            help="How many targets are deleted at a time.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0,
+            help="Seconds to wait between batches, to spread the load on the database.",
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+
+        deleted = 0
+        started_at = time.perf_counter()
+
+        for count in Target.objects.purge_expired_targets(options["batch_size"]):
+            deleted += count
+            if options["pause"]:
+                time.sleep(options["pause"])
+
+        changes = 0
+        for count in TargetChange.objects.purge_old_changes(options["batch_size"]):
+            changes += count
+            if options["pause"]:
+                time.sleep(options["pause"])
+
+        elapsed = time.perf_counter() - started_at
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Deleted {deleted} expired targets and {changes} old change log "
+                f"entries in {elapsed:.2f}s."
+            )
+        )
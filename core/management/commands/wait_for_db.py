@@ -1,9 +1,8 @@
 import time
 
-from psycopg2 import OperationalError as Psycopg2OpError
+from django.core.management.base import BaseCommand, CommandError
 
-from django.core.management.base import BaseCommand
-from django.db.utils import OperationalError
+from core.readiness import DatabaseUnavailable, wait_for_database
 
 
 class Command(BaseCommand):
@@ -11,16 +10,30 @@ class Command(BaseCommand):
     Django command to wait for database.
     """
 
+    help = "Waits until the database accepts connections, or fails after --timeout seconds."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+        parser.add_argument("--timeout", type=float, default=60)
+
     def handle(self, *args, **options):
         """Entrypoint for command."""
         self.stdout.write("\nWaiting for database...")
-        db_up = False
-        while db_up is False:
-            try:
-                self.check(databases=["default"])
-                db_up = True
-            except (Psycopg2OpError, OperationalError):
-                self.stdout.write("Database unavailable, waiting 1 second...")
-                time.sleep(1)
-
-        self.stdout.write(self.style.SUCCESS("Database available!"))
+        started_at = time.monotonic()
+        try:
+            attempts = wait_for_database(
+                options["database"], options["timeout"], on_retry=self.on_retry
+            )
+        except DatabaseUnavailable as error:
+            raise CommandError(str(error)) from error
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Database available! ({attempts} attempts, {time.monotonic() - started_at:.2f} seconds)"
+            )
+        )
+
+    def on_retry(self, attempt: int, delay: float):
+        self.stdout.write(
+            f"Database unavailable, waiting {delay:.2f} seconds (attempt {attempt})..."
+        )
@@ -0,0 +1,355 @@
+import bisect
+import contextlib
+import contextvars
+import threading
+import time
+
+from core.admission import admission_state
+from core.cache import response_cache_stats
+from core.db.pool import get_pool_stats
+from core.readiness import readiness_state
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = tuple(256 * 4**power for power in range(9))
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class RequestMetrics:
+    """
+    What a sampled request spent, filled in by the SQL execute wrapper and the serializers while it runs.
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.serialize_seconds = 0.0
+
+    def add_query(self, sql: str, seconds: float):
+        self.queries += 1
+        self.sql_seconds += seconds
+
+
+# The metrics of the request being handled, or None when it was not sampled.
+request_metrics = contextvars.ContextVar("request_metrics", default=None)
+# The objects told about each SQL query run in the current context, through their add_query method.
+query_counters = contextvars.ContextVar("query_counters", default=())
+
+
+def push_query_counter(counter):
+    """
+    The push_query_counter function tells a counter about the SQL queries run in the current context from now on,
+    on top of the counters already there.
+
+    :param counter: An object with an add_query(sql, seconds) method
+    :return: The token to reset query_counters with, once the counter is done
+    :doc-author: Trelent
+    """
+    return query_counters.set((*query_counters.get(), counter))
+
+
+class Histogram:
+    """
+    A Prometheus histogram, with one series per combination of label values.
+    Only the count of each bucket is kept, the cumulative counts are computed when the metrics are rendered.
+    """
+
+    def __init__(self, name: str, documentation: str, buckets, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.labels = tuple(labels)
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        """
+        The observe function adds a value to the histogram.
+
+        :param self: Represent the instance of the class
+        :param value: float: The observed value
+        :param *label_values: The values of the labels, in order
+        :return: None
+        :doc-author: Trelent
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(label_values)
+            if series is None:
+                series = self.series[label_values] = [
+                    [0] * (len(self.buckets) + 1),
+                    0.0,
+                ]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self):
+        """
+        The render function renders the histogram in the Prometheus text format.
+
+        :param self: Represent the instance of the class
+        :return: A generator of lines
+        :doc-author: Trelent
+        """
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self.lock:
+            series = [
+                (labels, list(counts), total)
+                for labels, (counts, total) in self.series.items()
+            ]
+        for label_values, counts, total in sorted(series):
+            labels = format_labels(zip(self.labels, label_values))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                bucket_labels = format_labels(
+                    zip((*self.labels, "le"), (*label_values, bound))
+                )
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            yield f"{self.name}_sum{labels} {total}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+def format_labels(labels):
+    """
+    The format_labels function renders label names and values as a Prometheus label set, escaping the values.
+
+    :param labels: An iterable of (name, value) pairs
+    :return: The label set, or an empty string when there are no labels
+    :doc-author: Trelent
+    """
+    pairs = []
+    for name, value in labels:
+        value = (
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        )
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time spent answering the requests.",
+    LATENCY_BUCKETS,
+    ("view", "method", "status"),
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "Size of the response bodies, streaming responses excluded.",
+    SIZE_BUCKETS,
+    ("view",),
+)
+REQUEST_QUERIES = Histogram(
+    "db_queries_per_request",
+    "SQL queries run by each request.",
+    QUERY_BUCKETS,
+    ("view",),
+)
+REQUEST_SQL_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Time each request spent running SQL queries.",
+    LATENCY_BUCKETS,
+    ("view",),
+)
+REQUEST_SERIALIZE_DURATION = Histogram(
+    "serializer_duration_seconds",
+    "Time each request spent serializing targets, SQL queries excluded.",
+    LATENCY_BUCKETS,
+    ("view",),
+)
+HISTOGRAMS = (
+    REQUEST_DURATION,
+    RESPONSE_SIZE,
+    REQUEST_QUERIES,
+    REQUEST_SQL_DURATION,
+    REQUEST_SERIALIZE_DURATION,
+)
+
+# Gauges and counters of the connection pools, read from core.db.pool when the metrics are rendered.
+POOL_METRICS = {
+    "size": ("gauge", "Connections opened by the pool."),
+    "in_use": ("gauge", "Connections of the pool in use."),
+    "waiting": ("gauge", "Threads waiting for a connection of the pool."),
+    "saturation": ("gauge", "Fraction of the connections of the pool in use."),
+    "waits": ("counter", "Connections that were waited for."),
+    "wait_seconds": ("counter", "Time spent waiting for a connection."),
+    "timeouts": ("counter", "Waits for a connection that timed out."),
+}
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    The record_query function is installed as an execute wrapper on every database connection, and tells the
+    counters of the current context about each query and the time it took.
+
+    :param execute: The next wrapper, or the execution of the query
+    :param sql: The SQL of the query
+    :param params: The parameters of the query
+    :param many: Whether the query is run by executemany
+    :param context: The connection and the cursor of the query
+    :return: The result of execute
+    :doc-author: Trelent
+    """
+    counters = query_counters.get()
+    if not counters:
+        return execute(sql, params, many, context)
+    started_at = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        seconds = time.perf_counter() - started_at
+        for counter in counters:
+            counter.add_query(sql, seconds)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """
+    The install_query_recorder function adds record_query to the execute wrappers of a connection when it opens.
+    The wrappers of a connection are kept when it is reopened, so it is only added once.
+
+    :param sender: The class of the database wrapper
+    :param connection: The database wrapper
+    :param **kwargs: The remaining arguments of the signal
+    :return: None
+    :doc-author: Trelent
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextlib.contextmanager
+def measure_serialization():
+    """
+    The measure_serialization function adds the time spent inside the block to the serialization time of the
+    sampled request, minus the SQL run meanwhile by lazy querysets.
+
+    :return: A context manager
+    :doc-author: Trelent
+    """
+    metrics = request_metrics.get()
+    if metrics is None:
+        yield
+        return
+    started_at = time.perf_counter()
+    sql_seconds = metrics.sql_seconds
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started_at
+        metrics.serialize_seconds += elapsed - (metrics.sql_seconds - sql_seconds)
+
+
+def observe_request(metrics, view: str, method: str, response):
+    """
+    The observe_request function adds what a sampled request spent to the histograms.
+
+    :param metrics: RequestMetrics: The metrics of the request
+    :param view: str: The name of the view that answered it
+    :param method: str: The HTTP method of the request
+    :param response: The response
+    :return: The duration of the request in seconds
+    :doc-author: Trelent
+    """
+    duration = time.perf_counter() - metrics.started_at
+    REQUEST_DURATION.observe(duration, view, method, response.status_code)
+    REQUEST_QUERIES.observe(metrics.queries, view)
+    REQUEST_SQL_DURATION.observe(metrics.sql_seconds, view)
+    if metrics.serialize_seconds:
+        REQUEST_SERIALIZE_DURATION.observe(metrics.serialize_seconds, view)
+    if not response.streaming:
+        RESPONSE_SIZE.observe(len(response.content), view)
+    return duration
+
+
+def format_server_timing(metrics, duration: float):
+    """
+    The format_server_timing function builds the Server-Timing header of a sampled request, so the browser
+    developer tools show where its time went.
+
+    :param metrics: RequestMetrics: The metrics of the request
+    :param duration: float: The duration of the request in seconds
+    :return: The value of the header
+    :doc-author: Trelent
+    """
+    timings = [
+        f'db;desc="queries: {metrics.queries}";dur={metrics.sql_seconds * 1000:.1f}'
+    ]
+    if metrics.serialize_seconds:
+        timings.append(f"serialize;dur={metrics.serialize_seconds * 1000:.1f}")
+    timings.append(f"total;dur={duration * 1000:.1f}")
+    return ", ".join(timings)
+
+
+def render_metrics():
+    """
+    The render_metrics function renders every metric of this process in the Prometheus text format.
+
+    :return: The metrics as a string
+    :doc-author: Trelent
+    """
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+
+    pools = get_pool_stats()
+    for stat, (metric_type, documentation) in POOL_METRICS.items():
+        name = f"db_pool_{stat}"
+        if metric_type == "counter":
+            name = f"{name}_total"
+        lines.append(f"# HELP {name} {documentation}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for alias, stats in sorted(pools.items()):
+            lines.append(f"{name}{format_labels([('database', alias)])} {stats[stat]}")
+
+    limiter = admission_state["limiter"]
+    admission = limiter.stats() if limiter is not None else {}
+    for name, metric_type, documentation, value in (
+        (
+            "admission_in_flight",
+            "gauge",
+            "Requests of the target API running.",
+            admission.get("in_flight", 0),
+        ),
+        (
+            "admission_queued",
+            "gauge",
+            "Requests of the target API waiting to run.",
+            admission.get("queued", 0),
+        ),
+        (
+            "admission_wait_seconds_total",
+            "counter",
+            "Time spent by the requests of the target API waiting to run.",
+            admission.get("wait_seconds", 0.0),
+        ),
+    ):
+        lines.append(f"# HELP {name} {documentation}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        lines.append(f"{name} {value}")
+    lines.append("# HELP admission_rejected_total Requests of the target API rejected.")
+    lines.append("# TYPE admission_rejected_total counter")
+    lines.append(
+        f'admission_rejected_total{{reason="throttled"}} {admission_state["throttled"]}'
+    )
+    lines.append(
+        f'admission_rejected_total{{reason="overloaded"}} {admission.get("rejected", 0)}'
+    )
+
+    cache_stats = response_cache_stats.as_dict()
+    for outcome, documentation in (
+        ("hits", "Responses of the target API served from the response cache."),
+        ("misses", "Responses of the target API not found in the response cache."),
+    ):
+        name = f"targets_response_cache_{outcome}_total"
+        lines.append(f"# HELP {name} {documentation}")
+        lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name} {cache_stats[outcome]}")
+
+    if readiness_state["ready"]:
+        lines.append(
+            "# HELP process_boot_seconds Time the process took from boot to ready."
+        )
+        lines.append("# TYPE process_boot_seconds gauge")
+        lines.append(f"process_boot_seconds {readiness_state['boot_seconds']}")
+    return "\n".join(lines) + "\n"
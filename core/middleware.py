@@ -0,0 +1,371 @@
+import random
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils.decorators import sync_and_async_middleware
+
+from core.admission import (
+    ConcurrencyLimiter,
+    admission_state,
+    count_throttled,
+    format_retry_after,
+    get_bucket_store,
+    get_throttle_wait,
+)
+from core.budget import QueryBudget, get_query_budget
+from core.metrics import (
+    RequestMetrics,
+    format_server_timing,
+    observe_request,
+    push_query_counter,
+    query_counters,
+    request_metrics,
+)
+from core.routers import primary_pinned, written_databases
+
+# Signed cookie holding when the client last wrote, so its reads go to the primary until the replicas catch up.
+PRIMARY_COOKIE = "read_primary"
+
+
+def start_tracking(request):
+    """
+    The start_tracking function pins the reads of the request to the primary when the client wrote less than
+    DATABASE_REPLICA_STICKY_SECONDS ago, and starts tracking the writes of the request.
+
+    :param request: The request being answered
+    :return: The tokens to reset the context variables with
+    :doc-author: Trelent
+    """
+    wrote_recently = (
+        request.get_signed_cookie(
+            PRIMARY_COOKIE,
+            default=None,
+            salt=PRIMARY_COOKIE,
+            max_age=settings.DATABASE_REPLICA_STICKY_SECONDS,
+        )
+        is not None
+    )
+    return primary_pinned.set(wrote_recently), written_databases.set(set())
+
+
+def stop_tracking(response, tokens):
+    """
+    The stop_tracking function sets the cookie that pins the next reads of the client to the primary when the
+    request wrote to the database.
+
+    :param response: The response of the request, or None when it raised an exception
+    :param tokens: The tokens returned by start_tracking
+    :return: The response
+    :doc-author: Trelent
+    """
+    pinned_token, written_token = tokens
+    written = written_databases.get()
+    primary_pinned.reset(pinned_token)
+    written_databases.reset(written_token)
+    if response is not None and written and settings.DATABASE_REPLICAS:
+        response.set_signed_cookie(
+            PRIMARY_COOKIE,
+            "1",
+            salt=PRIMARY_COOKIE,
+            max_age=settings.DATABASE_REPLICA_STICKY_SECONDS,
+            httponly=True,
+            samesite="Lax",
+        )
+    return response
+
+
+@sync_and_async_middleware
+def read_your_writes_middleware(get_response):
+    """
+    The read_your_writes_middleware function makes the clients read their own writes: for a short while after a
+    request that wrote to the database, the reads of the same client go to the primary instead of a replica that
+    may not have replicated the write yet.
+
+    :param get_response: The next middleware or view
+    :return: The middleware
+    :doc-author: Trelent
+    """
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            tokens = start_tracking(request)
+            response = None
+            try:
+                response = await get_response(request)
+            finally:
+                stop_tracking(response, tokens)
+            return response
+
+    else:
+
+        def middleware(request):
+            tokens = start_tracking(request)
+            response = None
+            try:
+                response = get_response(request)
+            finally:
+                stop_tracking(response, tokens)
+            return response
+
+    return middleware
+
+
+def start_metrics():
+    """
+    The start_metrics function samples METRICS_SAMPLE_RATE of the requests, and starts measuring them.
+
+    :return: The metrics of the request and the tokens to reset the context variables with, or None
+    :doc-author: Trelent
+    """
+    if random.random() >= settings.METRICS_SAMPLE_RATE:
+        return None
+    metrics = RequestMetrics()
+    return metrics, request_metrics.set(metrics), push_query_counter(metrics)
+
+
+def stop_metrics(request, response, started):
+    """
+    The stop_metrics function adds what a sampled request spent to the metrics, and to its Server-Timing header.
+
+    :param request: The request being answered
+    :param response: The response of the request, or None when it raised an exception
+    :param started: The value returned by start_metrics
+    :return: None
+    :doc-author: Trelent
+    """
+    if started is None:
+        return
+    metrics, metrics_token, counters_token = started
+    request_metrics.reset(metrics_token)
+    query_counters.reset(counters_token)
+    if response is None:
+        return
+    match = request.resolver_match
+    view = match.view_name if match else "unmatched"
+    duration = observe_request(metrics, view, request.method, response)
+    if settings.METRICS_SERVER_TIMING:
+        response["Server-Timing"] = format_server_timing(metrics, duration)
+
+
+@sync_and_async_middleware
+def metrics_middleware(get_response):
+    """
+    The metrics_middleware function measures the latency, the SQL queries, the serialization time and the response
+    size of the sampled requests, served at /metrics, and reports them in the Server-Timing header.
+    It must be the first middleware, so the time spent by the others is measured too.
+
+    :param get_response: The next middleware or view
+    :return: The middleware
+    :doc-author: Trelent
+    """
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            started = start_metrics()
+            response = None
+            try:
+                response = await get_response(request)
+            finally:
+                stop_metrics(request, response, started)
+            return response
+
+    else:
+
+        def middleware(request):
+            started = start_metrics()
+            response = None
+            try:
+                response = get_response(request)
+            finally:
+                stop_metrics(request, response, started)
+            return response
+
+    return middleware
+
+
+def start_budget():
+    """
+    The start_budget function starts counting the SQL queries of the request, unless QUERY_BUDGET_ACTION is off.
+
+    :return: The budget of the request, or None
+    :doc-author: Trelent
+    """
+    if settings.QUERY_BUDGET_ACTION == "off":
+        return None
+    return QueryBudget(action=settings.QUERY_BUDGET_ACTION).__enter__()
+
+
+def stop_budget(request, response, budget):
+    """
+    The stop_budget function checks the SQL queries of the request against the budget of the view that answered
+    it, in the QUERY_BUDGETS setting.
+
+    :param request: The request being answered
+    :param response: The response of the request, or None when it raised an exception
+    :param budget: The value returned by start_budget
+    :return: None
+    :doc-author: Trelent
+    """
+    if budget is None:
+        return
+    match = request.resolver_match
+    if response is None or match is None:
+        query_counters.reset(budget.token)
+        return
+    limits = get_query_budget(request.method, match.view_name)
+    budget.name = f"{request.method} {match.view_name}"
+    budget.max_queries = limits.get("queries")
+    budget.max_seconds = limits.get("seconds")
+    budget.__exit__(None, None, None)
+
+
+@sync_and_async_middleware
+def query_budget_middleware(get_response):
+    """
+    The query_budget_middleware function logs, or raises when QUERY_BUDGET_ACTION is raise, the requests that ran
+    more SQL queries, or spent more time on them, than the budget of their view.
+
+    :param get_response: The next middleware or view
+    :return: The middleware
+    :doc-author: Trelent
+    """
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            budget = start_budget()
+            response = None
+            try:
+                response = await get_response(request)
+            finally:
+                stop_budget(request, response, budget)
+            return response
+
+    else:
+
+        def middleware(request):
+            budget = start_budget()
+            response = None
+            try:
+                response = get_response(request)
+            finally:
+                stop_budget(request, response, budget)
+            return response
+
+    return middleware
+
+
+def reject_request(status: int, detail: str, retry_after: float):
+    """
+    The reject_request function answers a request turned away by the admission control, telling the client when
+    to retry.
+
+    :param status: int: 429 when the client is throttled, 503 when the server is overloaded
+    :param detail: str: The error message
+    :param retry_after: float: The seconds after which the client may retry
+    :return: The response
+    :doc-author: Trelent
+    """
+    response = JsonResponse({"detail": detail}, status=status)
+    response["Retry-After"] = format_retry_after(retry_after)
+    return response
+
+
+def release_when_done(response, release):
+    """
+    The release_when_done function frees the slot of an admitted request once its response is done. A streaming
+    response (exports, imports, events) keeps working after the view returned, so its slot is only freed when the
+    server closes it.
+
+    :param response: The response of the admitted request
+    :param release: Frees the slot of the request
+    :return: The response
+    :doc-author: Trelent
+    """
+    if response.streaming:
+        response._resource_closers.append(release)
+    else:
+        release()
+    return response
+
+
+@sync_and_async_middleware
+def admission_middleware(get_response):
+    """
+    The admission_middleware function guards the views under ADMISSION_PATHS against overload. A client making
+    more requests than its THROTTLE_RATES allow gets a 429, and a request that finds ADMISSION_MAX_CONCURRENCY
+    requests running and cannot wait for one of them to finish (see core.admission.ConcurrencyLimiter) gets a 503,
+    both with a Retry-After header. The rejected requests cost no database work, so the admitted ones keep their
+    latency during traffic spikes. The views under ADMISSION_EXEMPT_PATHS, which hold their response open without
+    using the database (the event stream), are throttled but not counted against the concurrency limit.
+
+    :param get_response: The next middleware or view
+    :return: The middleware
+    :doc-author: Trelent
+    """
+    paths = tuple(settings.ADMISSION_PATHS)
+    exempt_paths = tuple(settings.ADMISSION_EXEMPT_PATHS)
+    store = get_bucket_store()
+    limiter = None
+    if settings.ADMISSION_MAX_CONCURRENCY:
+        limiter = ConcurrencyLimiter(
+            settings.ADMISSION_MAX_CONCURRENCY,
+            settings.ADMISSION_MAX_QUEUE,
+            settings.ADMISSION_QUEUE_TIMEOUT,
+            settings.ADMISSION_QUEUE_TARGET,
+        )
+    admission_state["limiter"] = limiter
+
+    def throttle(request):
+        wait = get_throttle_wait(store, request)
+        if not wait:
+            return None
+        count_throttled()
+        return reject_request(429, "Request was throttled.", wait)
+
+    def shed():
+        return reject_request(
+            503, "Server overloaded, retry later.", settings.ADMISSION_RETRY_AFTER
+        )
+
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            if not request.path.startswith(paths):
+                return await get_response(request)
+            response = throttle(request)
+            if response is not None:
+                return response
+            if limiter is None or request.path.startswith(exempt_paths):
+                return await get_response(request)
+            if not limiter.try_acquire():
+                # Waits in a thread of its own, so the event loop keeps serving the admitted requests.
+                if not await sync_to_async(limiter.acquire, thread_sensitive=False)():
+                    return shed()
+            try:
+                response = await get_response(request)
+            except BaseException:
+                limiter.release()
+                raise
+            return release_when_done(response, limiter.release)
+
+    else:
+
+        def middleware(request):
+            if not request.path.startswith(paths):
+                return get_response(request)
+            response = throttle(request)
+            if response is not None:
+                return response
+            if limiter is None or request.path.startswith(exempt_paths):
+                return get_response(request)
+            if not limiter.acquire():
+                return shed()
+            try:
+                response = get_response(request)
+            except BaseException:
+                limiter.release()
+                raise
+            return release_when_done(response, limiter.release)
+
+    return middleware
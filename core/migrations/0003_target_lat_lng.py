@@ -0,0 +1,51 @@
+# Generated by Django 5.0.14 on 2026-10-18 11:24
+
+from django.db import migrations, models
+
+
+def populate_coordinates(apps, schema_editor):
+    Target = apps.get_model("core", "Target")
+    targets = []
+    for target in Target.objects.only("latitude", "longitude").iterator(
+        chunk_size=2000
+    ):
+        for attr, source, limit in (
+            ("lat", target.latitude, 90),
+            ("lng", target.longitude, 180),
+        ):
+            try:
+                value = float(source)
+            except (TypeError, ValueError):
+                value = None
+            if value is not None and not -limit <= value <= limit:
+                value = None
+            setattr(target, attr, value)
+        targets.append(target)
+        if len(targets) == 2000:
+            Target.objects.bulk_update(targets, ["lat", "lng"])
+            targets = []
+    Target.objects.bulk_update(targets, ["lat", "lng"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0002_alter_target_expiration_date"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="target",
+            name="lat",
+            field=models.FloatField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="target",
+            name="lng",
+            field=models.FloatField(editable=False, null=True),
+        ),
+        migrations.RunPython(populate_coordinates, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="target",
+            index=models.Index(fields=["lat", "lng"], name="core_target_lat_lng_idx"),
+        ),
+    ]
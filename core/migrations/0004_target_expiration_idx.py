@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0003_target_lat_lng"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="target",
+            index=models.Index(
+                fields=["expiration_date"], name="core_target_expiration_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0004_target_expiration_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="target",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,28 @@
+import core.utils
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    New targets get time-ordered UUIDv7 keys. The column keeps its uuid type and the existing targets keep their
+    uuid4 keys, since clients and the change log refer to them. Every new key starts with the current time, so the
+    inserts now go to a single, moving spot of the primary key index instead of random pages. Rebuilding the index
+    once (REINDEX INDEX CONCURRENTLY core_target_pkey) frees the space left by the page splits of the uuid4 inserts.
+    """
+
+    dependencies = [
+        ("core", "0006_targetchange"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="target",
+            name="id",
+            field=models.UUIDField(
+                default=core.utils.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:24
+
+import core.db.functions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0007_target_id_uuid7"),
+    ]
+
+    operations = [
+        # The entries already in the log are committed, so they all come first.
+        migrations.AddField(
+            model_name="targetchange",
+            name="transaction_id",
+            field=models.BigIntegerField(db_default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name="targetchange",
+            name="transaction_id",
+            field=models.BigIntegerField(
+                db_default=core.db.functions.CurrentTransactionId(), editable=False
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="targetchange",
+            index=models.Index(
+                fields=["transaction_id", "id"], name="core_change_position_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0008_targetchange_transaction_id"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="targetchange",
+            name="previous_lat",
+            field=models.FloatField(null=True),
+        ),
+        migrations.AddField(
+            model_name="targetchange",
+            name="previous_lng",
+            field=models.FloatField(null=True),
+        ),
+    ]
@@ -1,18 +1,299 @@
+import datetime
+import itertools
 import uuid
 
-from django.db import models
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+from django.utils import timezone
 
-from core.utils import get_expiration_date_default
+from core.cache import invalidate_targets
+from core.db.functions import CurrentTransactionId
+from core.events import get_broker
+from core.utils import (
+    bbox_around,
+    get_expiration_date_default,
+    haversine_km,
+    parse_coordinate,
+    uuid7,
+)
+
+
+TARGET_WRITABLE_FIELDS = ("name", "latitude", "longitude", "expiration_date")
+
+# Half of the circumference of the Earth, the farthest two points can be.
+MAX_DISTANCE_KM = 20015.1
+# Radius of the first ring searched by the nearest targets query.
+NEAREST_FIRST_RADIUS_KM = 1.0
+
+
+def validate_target_fields(
+    fields: dict, min_expiration_date, partial: bool = False, strict: bool = False
+):
+    """
+    The validate_target_fields function checks the fields of a target with the rules shared by every write path.
+        The minimum expiration date is received instead of computed, so a whole batch is validated against the
+        same date. With partial, only the fields that are present are checked.
+
+    :param fields: dict: The fields of the target
+    :param min_expiration_date: The earliest expiration date accepted
+    :param partial: bool: Whether missing fields should be ignored instead of rejected
+    :param strict: bool: Whether fields that can not be written by clients should be rejected
+    :return: None
+    :doc-author: Trelent
+    """
+    if strict:
+        unknown_fields = set(fields) - set(TARGET_WRITABLE_FIELDS)
+        if unknown_fields:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown_fields))}.")
+
+    if not partial or "name" in fields:
+        if not fields.get("name"):
+            raise ValueError("Name must be provided.")
+    if not partial or "latitude" in fields:
+        if not fields.get("latitude"):
+            raise ValueError("Latitude must be provided.")
+    if not partial or "longitude" in fields:
+        if not fields.get("longitude"):
+            raise ValueError("Longitude must be provided.")
+
+    for field, label in (
+        ("name", "Name"),
+        ("latitude", "Latitude"),
+        ("longitude", "Longitude"),
+    ):
+        max_length = Target._meta.get_field(field).max_length
+        if fields.get(field) is not None and len(str(fields[field])) > max_length:
+            raise ValueError(f"{label} must be at most {max_length} characters.")
+
+    if "latitude" in fields:
+        try:
+            parse_coordinate(fields["latitude"], 90)
+        except (TypeError, ValueError):
+            raise ValueError("Latitude must be a number between -90 and 90.") from None
+    if "longitude" in fields:
+        try:
+            parse_coordinate(fields["longitude"], 180)
+        except (TypeError, ValueError):
+            raise ValueError(
+                "Longitude must be a number between -180 and 180."
+            ) from None
+
+    expiration_date = fields.get("expiration_date", None)
+
+    if expiration_date is not None:
+        # Python callers may pass the date as written on the API, which the DateField accepts as well.
+        if isinstance(expiration_date, str):
+            try:
+                expiration_date = datetime.date.fromisoformat(expiration_date)
+            except ValueError:
+                raise ValueError(
+                    "Expiration Date must be written as YYYY-MM-DD."
+                ) from None
+        elif isinstance(expiration_date, datetime.datetime) or not isinstance(
+            expiration_date, datetime.date
+        ):
+            raise ValueError("Expiration Date must be a date.")
+        if expiration_date < min_expiration_date:
+            raise ValueError("Expiration Date must be at least one day ahead.")
+
+
+def _to_uuid(value):
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
 
 
 class CustomBaseModel(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         abstract = True
 
 
-class CustomTargetManager(models.Manager):
+class TargetQuerySet(models.QuerySet):
+    def live(self):
+        """
+        The live function filters the queryset down to the targets that are not expired yet.
+
+        :param self: Refer to the queryset itself
+        :return: A queryset with only the targets whose expiration date is after today
+        :doc-author: Trelent
+        """
+        return self.filter(expiration_date__gt=datetime.date.today())
+
+    def in_bbox(self, min_lng: float, min_lat: float, max_lng: float, max_lat: float):
+        """
+        The in_bbox function filters the queryset down to the targets inside a bounding box.
+        The filter runs over the numeric lat/lng columns, so it is served by the composite coordinates index.
+        When min_lng is greater than max_lng the box is considered to cross the antimeridian.
+
+        :param self: Refer to the queryset itself
+        :param min_lng: float: West edge of the box
+        :param min_lat: float: South edge of the box
+        :param max_lng: float: East edge of the box
+        :param max_lat: float: North edge of the box
+        :return: A queryset with only the targets inside the box
+        :doc-author: Trelent
+        """
+        queryset = self.filter(lat__gte=min_lat, lat__lte=max_lat)
+        if min_lng <= max_lng:
+            return queryset.filter(lng__gte=min_lng, lng__lte=max_lng)
+        return queryset.filter(models.Q(lng__gte=min_lng) | models.Q(lng__lte=max_lng))
+
+    def nearest(self, lat: float, lng: float, k: int, radius_km: float = None):
+        """
+        The nearest function finds the k targets of the queryset closest to a point, by great-circle distance.
+            It searches growing rings around the point, each one with a bounding box query served by the coordinates
+            index, so only the targets around the point are read instead of the whole table. Every target within the
+            radius of a ring is inside its box, so once k of them are found they are the k nearest. The next radius
+            is estimated from how many targets the previous ring had.
+
+        :param self: Refer to the queryset itself
+        :param lat: float: Latitude of the point
+        :param lng: float: Longitude of the point
+        :param k: int: How many targets are returned at most
+        :param radius_km: float: The maximum distance of the targets, or None to search the whole Earth
+        :return: A list of targets, closest first, each one with its distance_km
+        :doc-author: Trelent
+        """
+        limit_km = min(radius_km or MAX_DISTANCE_KM, MAX_DISTANCE_KM)
+        ring_km = min(NEAREST_FIRST_RADIUS_KM, limit_km)
+
+        while True:
+            candidates = self.in_bbox(*bbox_around(lat, lng, ring_km)).values_list(
+                "id", "lat", "lng"
+            )
+            found = [
+                (distance, target_id)
+                for target_id, target_lat, target_lng in candidates
+                if (distance := haversine_km(lat, lng, target_lat, target_lng))
+                <= ring_km
+            ]
+            if len(found) >= k or ring_km >= limit_km:
+                break
+            growth = (k / len(found)) ** 0.5 * 1.5 if found else 4
+            ring_km = min(ring_km * max(growth, 1.5), limit_km)
+
+        found = sorted(found)[:k]
+        targets = self.in_bulk([target_id for _, target_id in found])
+        nearest = []
+        for distance, target_id in found:
+            # A target deleted between both queries is left out.
+            if target := targets.get(target_id):
+                target.distance_km = distance
+                nearest.append(target)
+        return nearest
+
+    def bulk_update_targets(self, items, batch_size: int = None):
+        """
+        The bulk_update_targets function updates many targets of the queryset with a single SELECT and a few
+        UPDATEs, instead of a SELECT and an UPDATE per target.
+            Every item must have the id of the target and the fields to be changed. The items whose target is not in
+            the queryset, or that fail the create_target rules, are reported back instead of aborting the whole batch.
+
+        :param self: Refer to the queryset itself
+        :param items: An iterable of dictionaries with the id and the fields to be changed of each target
+        :param batch_size: int: How many rows are sent on each UPDATE, defaults to TARGETS_BULK_BATCH_SIZE
+        :return: A tuple with the list of updated targets and a dictionary of error messages by item index
+        :doc-author: Trelent
+        """
+        items = list(items)
+        min_expiration_date = get_expiration_date_default()
+        now = timezone.now()
+        ids = [_to_uuid(item.get("id")) for item in items]
+        existing = self.in_bulk([target_id for target_id in ids if target_id])
+        targets = {}
+        changed_fields = set()
+        errors = {}
+
+        for index, (item, target_id) in enumerate(zip(items, ids)):
+            changes = {key: value for key, value in item.items() if key != "id"}
+            target = existing.get(target_id)
+            try:
+                if target is None:
+                    raise ValueError("Target not found.")
+                validate_target_fields(
+                    changes, min_expiration_date, partial=True, strict=True
+                )
+            except ValueError as exception:
+                errors[index] = str(exception)
+                continue
+
+            for key, value in changes.items():
+                setattr(target, key, value)
+            target.sync_coordinates()
+            target.updated_at = now
+            targets[target.pk] = target
+            changed_fields.update(changes)
+
+        if {"latitude", "longitude"} & changed_fields:
+            changed_fields.update({"lat", "lng"})
+        if changed_fields:
+            changed_fields.add("updated_at")
+            with transaction.atomic(using=self.db, savepoint=False):
+                self.bulk_update(
+                    targets.values(),
+                    sorted(changed_fields),
+                    batch_size=batch_size or settings.TARGETS_BULK_BATCH_SIZE,
+                )
+                TargetChange.objects.record(
+                    TargetChange.UPDATED,
+                    targets.keys(),
+                    using=self.db,
+                    previous_positions={
+                        pk: target.loaded_position for pk, target in targets.items()
+                    },
+                )
+            for target in targets.values():
+                target.loaded_position = (target.lat, target.lng)
+        return list(targets.values()), errors
+
+    def bulk_delete_targets(self, ids, batch_size: int = None):
+        """
+        The bulk_delete_targets function deletes the targets of the queryset with the given ids, with one
+        DELETE ... WHERE id IN (...) per batch instead of one DELETE per target.
+
+        :param self: Refer to the queryset itself
+        :param ids: An iterable with the ids of the targets to be deleted
+        :param batch_size: int: How many ids are sent on each DELETE, defaults to TARGETS_BULK_BATCH_SIZE
+        :return: The number of deleted targets
+        :doc-author: Trelent
+        """
+        ids = iter(ids)
+        batch_size = batch_size or settings.TARGETS_BULK_BATCH_SIZE
+        deleted = 0
+        while batch := list(itertools.islice(ids, batch_size)):
+            batch = list(self.filter(id__in=batch).values_list("id", flat=True))
+            if not batch:
+                continue
+            with transaction.atomic(using=self.db, savepoint=False):
+                # _raw_delete skips the collector, which would fetch every row again to send its post_delete signal.
+                deleted += self.filter(id__in=batch)._raw_delete(self.db)
+                TargetChange.objects.record(TargetChange.DELETED, batch, using=self.db)
+        return deleted
+
+
+class CustomTargetManager(models.Manager.from_queryset(TargetQuerySet)):
+    def purge_expired_targets(self, batch_size: int = None):
+        """
+        The purge_expired_targets function deletes the expired targets in batches, so each DELETE only locks a
+        bounded number of rows and no single transaction grows with the amount of expired targets.
+
+        :param self: Refer to the object itself
+        :param batch_size: int: How many targets are deleted at a time, defaults to TARGETS_BULK_BATCH_SIZE
+        :return: A generator with the amount of targets deleted by each batch
+        :doc-author: Trelent
+        """
+        batch_size = batch_size or settings.TARGETS_BULK_BATCH_SIZE
+        today = datetime.date.today()
+
+        expired = self.filter(expiration_date__lte=today)
+
+        while ids := list(expired.values_list("id", flat=True)[:batch_size]):
+            yield expired.bulk_delete_targets(ids, batch_size=batch_size)
+
     def create_target(self, name: str, latitude: str, longitude: str, **extra_fields):
         """
         The create_target function creates a new target with the given name, latitude, and longitude.
@@ -27,28 +308,293 @@ class CustomTargetManager(models.Manager):
         :return: A target object
         :doc-author: Trelent
         """
-        if not name:
-            raise ValueError("Name must be provided.")
-        if not latitude:
-            raise ValueError("Latitude must be provided.")
-        if not longitude:
-            raise ValueError("Longitude must be provided.")
+        validate_target_fields(
+            {
+                "name": name,
+                "latitude": latitude,
+                "longitude": longitude,
+                **extra_fields,
+            },
+            get_expiration_date_default(),
+        )
 
-        expiration_date = extra_fields.get("expiration_date", None)
+        return self.create(
+            name=name, latitude=latitude, longitude=longitude, **extra_fields
+        )
 
-        if expiration_date is not None:
-            if expiration_date < get_expiration_date_default():
-                raise ValueError("Expiration Date must be at least one day ahead.")
+    async def acreate_target(
+        self, name: str, latitude: str, longitude: str, **extra_fields
+    ):
+        """
+        The acreate_target function is the asynchronous version of create_target, with the same validation, for
+        the views served on the event loop.
 
-        return self.create(
+        :param self: Refer to the object itself
+        :param name: str: Ensure that the name of the target is provided
+        :param latitude: str: Ensure that the latitude is a string
+        :param longitude: str: Specify the longitude of a target
+        :param **extra_fields: Pass in the expiration_date field
+        :return: A target object
+        :doc-author: Trelent
+        """
+        validate_target_fields(
+            {
+                "name": name,
+                "latitude": latitude,
+                "longitude": longitude,
+                **extra_fields,
+            },
+            get_expiration_date_default(),
+        )
+
+        return await self.acreate(
             name=name, latitude=latitude, longitude=longitude, **extra_fields
         )
 
+    def bulk_create_targets(self, items, batch_size: int = None):
+        """
+        The bulk_create_targets function creates many targets with a few INSERTs instead of one per target.
+            Every item is validated with the same rules as create_target, and the items that fail the validation are
+            reported back instead of aborting the whole batch.
+
+        :param self: Refer to the object itself
+        :param items: An iterable of dictionaries with the fields of each target
+        :param batch_size: int: How many rows are sent on each INSERT, defaults to TARGETS_BULK_BATCH_SIZE
+        :return: A tuple with the list of created targets and a dictionary of error messages by item index
+        :doc-author: Trelent
+        """
+        min_expiration_date = get_expiration_date_default()
+        targets = []
+        errors = {}
+
+        for index, item in enumerate(items):
+            try:
+                validate_target_fields(item, min_expiration_date, strict=True)
+            except ValueError as exception:
+                errors[index] = str(exception)
+                continue
+
+            target = self.model(**item)
+            target.sync_coordinates()
+            targets.append(target)
+
+        with transaction.atomic(using=self.db, savepoint=False):
+            created = self.bulk_create(
+                targets, batch_size=batch_size or settings.TARGETS_BULK_BATCH_SIZE
+            )
+            if created:
+                TargetChange.objects.record(
+                    TargetChange.CREATED,
+                    [target.pk for target in created],
+                    using=self.db,
+                )
+        return created, errors
+
 
 class Target(CustomBaseModel):
     name = models.CharField(max_length=256)
     latitude = models.CharField(max_length=256)
     longitude = models.CharField(max_length=256)
+    lat = models.FloatField(null=True, editable=False)
+    lng = models.FloatField(null=True, editable=False)
     expiration_date = models.DateField(default=get_expiration_date_default())
 
     objects = CustomTargetManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["lat", "lng"], name="core_target_lat_lng_idx"),
+            models.Index(fields=["expiration_date"], name="core_target_expiration_idx"),
+        ]
+
+    def sync_coordinates(self):
+        """
+        The sync_coordinates function copies the latitude and longitude strings into the numeric lat/lng columns
+        used by the spatial queries. Values that can not be parsed are stored as null, which keeps them out of
+        every bounding box.
+
+        :param self: Refer to the target itself
+        :return: None
+        :doc-author: Trelent
+        """
+        try:
+            self.lat = parse_coordinate(self.latitude, 90)
+        except (TypeError, ValueError):
+            self.lat = None
+        try:
+            self.lng = parse_coordinate(self.longitude, 180)
+        except (TypeError, ValueError):
+            self.lng = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        The from_db function keeps the position a target was read with, which its changes record so the
+        subscribers of the events whose viewport it leaves are told.
+
+        :param cls: The Target model
+        :param db: The alias of the database the target was read from
+        :param field_names: The names of the fields read
+        :param values: The values read
+        :return: The target
+        :doc-author: Trelent
+        """
+        instance = super().from_db(db, field_names, values)
+        instance.loaded_position = (
+            instance.__dict__.get("lat"),
+            instance.__dict__.get("lng"),
+        )
+        return instance
+
+    def save(self, *args, **kwargs):
+        self.sync_coordinates()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "lat", "lng"}
+        super().save(*args, **kwargs)
+        self.loaded_position = (self.lat, self.lng)
+
+
+class TargetChangeManager(models.Manager):
+    def record(
+        self,
+        action: str,
+        target_ids,
+        using: str = DEFAULT_DB_ALIAS,
+        previous_positions=None,
+    ):
+        """
+        The record function must be called by every path that writes targets.
+            It appends the changes to the change log read by the change feed, with a single INSERT, and invalidates
+            the cached target responses. Once committed, the changes are also pushed to the subscribers of the
+            target events.
+
+        :param self: Refer to the object itself
+        :param action: str: created, updated or deleted
+        :param target_ids: The ids of the targets that were written
+        :param using: str: The alias of the database where the targets were written
+        :param previous_positions: A dictionary with the lat and lng of the updated targets before the write, by id
+        :return: The list of recorded changes
+        :doc-author: Trelent
+        """
+        target_ids = list(target_ids)
+        previous_positions = previous_positions or {}
+        changes = self.using(using).bulk_create(
+            self.model(
+                target_id=target_id,
+                action=action,
+                previous_lat=previous_positions.get(target_id, (None, None))[0],
+                previous_lng=previous_positions.get(target_id, (None, None))[1],
+            )
+            for target_id in target_ids
+        )
+        invalidate_targets(using)
+        get_broker().notify(action, target_ids, using, previous_positions)
+        return changes
+
+    def committed(self):
+        """
+        The committed function returns the change log entries whose position is final: on PostgreSQL, the entries
+        of the transactions older than the oldest one still running. A running transaction may have taken lower
+        ids than entries already committed, but its transaction id is higher than those of the entries returned,
+        so it is read after them once it commits.
+
+        :param self: Refer to the object itself
+        :return: A queryset with the entries
+        :doc-author: Trelent
+        """
+        queryset = self.get_queryset()
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return queryset
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint"
+            )
+            (watermark,) = cursor.fetchone()
+        return queryset.filter(transaction_id__lt=watermark)
+
+    def after(self, position):
+        """
+        The after function returns the committed change log entries after a position, in the order of their
+        positions, which is the order they become final in.
+
+        :param self: Refer to the object itself
+        :param position: A tuple with the transaction id and the id of the last entry already read
+        :return: A queryset with the entries
+        :doc-author: Trelent
+        """
+        transaction_id, change_id = position
+        return (
+            self.committed()
+            .filter(
+                models.Q(transaction_id__gt=transaction_id)
+                | models.Q(transaction_id=transaction_id, id__gt=change_id)
+            )
+            .order_by("transaction_id", "id")
+        )
+
+    def get_last_position(self):
+        """
+        The get_last_position function returns the position of the last committed change log entry.
+
+        :param self: Refer to the object itself
+        :return: A tuple with its transaction id and id, or (0, 0) when the log is empty
+        :doc-author: Trelent
+        """
+        last = (
+            self.committed()
+            .order_by("-transaction_id", "-id")
+            .values_list("transaction_id", "id")
+            .first()
+        )
+        return last or (0, 0)
+
+    def purge_old_changes(self, batch_size: int = None):
+        """
+        The purge_old_changes function deletes, in batches, the change log entries older than the
+        TARGETS_CHANGES_RETENTION_DAYS setting. Change tokens older than that are refused by the change feed.
+
+        :param self: Refer to the object itself
+        :param batch_size: int: How many entries are deleted at a time, defaults to TARGETS_BULK_BATCH_SIZE
+        :return: A generator with the amount of entries deleted by each batch
+        :doc-author: Trelent
+        """
+        batch_size = batch_size or settings.TARGETS_BULK_BATCH_SIZE
+        retention = datetime.timedelta(days=settings.TARGETS_CHANGES_RETENTION_DAYS)
+        old_changes = self.filter(created_at__lt=timezone.now() - retention)
+
+        while ids := list(old_changes.values_list("id", flat=True)[:batch_size]):
+            yield self.filter(id__in=ids)._raw_delete(self.db)
+
+
+class TargetChange(models.Model):
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    ACTION_CHOICES = [
+        (CREATED, "Created"),
+        (UPDATED, "Updated"),
+        (DELETED, "Deleted"),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    target_id = models.UUIDField()
+    action = models.CharField(max_length=16, choices=ACTION_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Where an updated target was before the change, so the subscribers whose viewport it left are told.
+    previous_lat = models.FloatField(null=True)
+    previous_lng = models.FloatField(null=True)
+    # With the id, the position of the entry in the change log, which readers go through in commit order.
+    transaction_id = models.BigIntegerField(
+        db_default=CurrentTransactionId(), editable=False
+    )
+
+    objects = TargetChangeManager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["transaction_id", "id"], name="core_change_position_idx"
+            )
+        ]
@@ -0,0 +1,151 @@
+import logging
+import random
+import threading
+import time
+
+from psycopg2 import OperationalError as Psycopg2OpError
+
+from django.db import connections
+from django.db.utils import OperationalError
+
+logger = logging.getLogger(__name__)
+
+# When this module was imported, which the WSGI and ASGI modules do first, so the boot time covers Django's setup.
+boot_started_at = time.monotonic()
+# Whether the process finished warming up, how long it took since boot, and how long each warm-up step took.
+readiness_state = {"ready": False, "boot_seconds": None, "steps": {}}
+warm_up_lock = threading.Lock()
+
+
+class DatabaseUnavailable(Exception):
+    pass
+
+
+def probe_database(alias: str = "default"):
+    """
+    The probe_database function checks that the database answers, opening the connection of the current thread
+    if needed, without running the system checks. A broken connection is closed, so the next probe reconnects.
+
+    :param alias: str: The alias of the database
+    :return: True if the database answered
+    :doc-author: Trelent
+    """
+    connection = connections[alias]
+    try:
+        connection.ensure_connection()
+        if connection.is_usable():
+            return True
+    except (Psycopg2OpError, OperationalError):
+        pass
+    connection.close()
+    return False
+
+
+def wait_for_database(
+    alias: str = "default",
+    timeout: float = 60,
+    base_delay: float = 0.05,
+    max_delay: float = 2,
+    on_retry=None,
+):
+    """
+    The wait_for_database function probes the database until it answers, sleeping between the attempts for a random
+    time up to an exponentially growing delay (full jitter), so a database that is almost up is noticed quickly and
+    many containers booting at once do not probe it in lockstep.
+
+    :param alias: str: The alias of the database
+    :param timeout: float: How many seconds to wait for at most
+    :param base_delay: float: The longest sleep after the first failed attempt, doubled after each one
+    :param max_delay: float: The longest sleep between two attempts
+    :param on_retry: Called with the number of the failed attempt and the upcoming sleep
+    :return: The number of attempts
+    :doc-author: Trelent
+    """
+    deadline = time.monotonic() + timeout
+    attempt = 0
+    while True:
+        attempt += 1
+        if probe_database(alias):
+            return attempt
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise DatabaseUnavailable(
+                f"Database {alias!r} still unavailable after {attempt} attempts in {timeout} seconds."
+            )
+        delay = min(
+            remaining,
+            random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1))),
+        )
+        if on_retry is not None:
+            on_retry(attempt, delay)
+        time.sleep(delay)
+
+
+def warm_up_urls():
+    from django.urls import get_resolver
+
+    # Building the reverse lookup populates the resolver, importing every view along the way.
+    get_resolver().reverse_dict
+
+
+def warm_up_serializers():
+    from drf_spectacular.generators import SchemaGenerator
+
+    # Generating the schema instantiates the serializer of every view and builds its fields.
+    SchemaGenerator().get_schema(request=None, public=True)
+
+
+def warm_up_database():
+    if not probe_database():
+        raise DatabaseUnavailable("Database unavailable while warming up.")
+    connection = connections["default"]
+    if connection.settings_dict["ENGINE"].startswith("core.db.backends.pooled"):
+        # Gives the connection back to the pool, where the first request finds it open.
+        connection.close()
+
+
+WARM_UP_STEPS = {
+    "urls": warm_up_urls,
+    "serializers": warm_up_serializers,
+    "database": warm_up_database,
+}
+
+
+def warm_up():
+    """
+    The warm_up function does the work the first request of a process would otherwise pay for: populating the URL
+    resolver, building the serializers and the schema, and opening a database connection. It then marks the
+    process as ready and logs how long it took since boot.
+        When the database does not answer, the process is left not ready, and the next call only runs the steps
+        that did not finish yet. Concurrent calls do not wait for the one already running.
+
+    :return: The seconds since boot, or None when the process is not ready yet
+    :doc-author: Trelent
+    """
+    if not warm_up_lock.acquire(blocking=False):
+        return None
+    try:
+        for name, step in WARM_UP_STEPS.items():
+            if name in readiness_state["steps"]:
+                continue
+            started_at = time.monotonic()
+            try:
+                step()
+            except DatabaseUnavailable as error:
+                logger.warning("%s Not ready yet.", error)
+                return None
+            readiness_state["steps"][name] = time.monotonic() - started_at
+    finally:
+        warm_up_lock.release()
+
+    boot_seconds = time.monotonic() - boot_started_at
+    readiness_state.update(ready=True, boot_seconds=boot_seconds)
+    logger.info(
+        "Ready %.3f seconds after boot (%s).",
+        boot_seconds,
+        ", ".join(
+            f"{name}: {seconds:.3f}"
+            for name, seconds in readiness_state["steps"].items()
+        ),
+    )
+    return boot_seconds
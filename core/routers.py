@@ -0,0 +1,84 @@
+import contextlib
+import contextvars
+import random
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Replica chosen for the reads of the current request, or None when they go to the primary.
+read_database = contextvars.ContextVar("read_database", default=None)
+# Set by core.middleware for the clients that wrote recently, so they read their own writes from the primary.
+primary_pinned = contextvars.ContextVar("primary_pinned", default=False)
+# The aliases written by the current request, when core.middleware tracks them.
+written_databases = contextvars.ContextVar("written_databases", default=None)
+
+
+def get_replica():
+    """
+    The get_replica function picks one of the DATABASE_REPLICAS to read from.
+
+    :return: The alias of the replica, or None when there are no replicas or the client must read from the primary
+    :doc-author: Trelent
+    """
+    replicas = settings.DATABASE_REPLICAS
+    if not replicas or primary_pinned.get():
+        return None
+    return random.choice(replicas)
+
+
+@contextlib.contextmanager
+def read_from_replica():
+    """
+    The read_from_replica function sends the reads done inside the block to one of the DATABASE_REPLICAS, the same
+    one for the whole block, so a request does not see different replication lags from one query to the next.
+    Without replicas, or for a client that wrote recently, the reads keep going to the primary.
+
+    :return: A context manager
+    :doc-author: Trelent
+    """
+    token = read_database.set(get_replica())
+    try:
+        yield
+    finally:
+        read_database.reset(token)
+
+
+def reads_may_be_stale(generation: int):
+    """
+    The reads_may_be_stale function tells whether the reads of the current request go to a replica that may not
+    have replicated the last write yet: generations are the nanosecond timestamps of the writes, so it is the case
+    for less than DATABASE_REPLICA_STICKY_SECONDS after the generation. What is built from those reads may hold the
+    rows of the previous generation, so it must not be cached nor validated under this one.
+
+    :param generation: int: The generation of the table being read
+    :return: True if the reads may miss the writes of the generation
+    :doc-author: Trelent
+    """
+    if read_database.get() is None:
+        return False
+    return time.time_ns() - generation < settings.DATABASE_REPLICA_STICKY_SECONDS * 1e9
+
+
+class ReplicaRouter:
+    """
+    Sends the writes to the primary (the default database) and the reads done inside read_from_replica to a replica.
+    Replicas are copies of the primary kept by the database server, so they are never migrated.
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_database.get()
+
+    def db_for_write(self, model, **hints):
+        written = written_databases.get()
+        if written is not None:
+            written.add(DEFAULT_DB_ALIAS)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,49 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.models import Target, TargetChange
+
+
+@receiver(post_save, sender=Target)
+def record_target_save(sender, instance, created, using, **kwargs):
+    """
+    The record_target_save function records in the change log every target that is saved one by one, which also
+    invalidates the cached target responses. The bulk paths of the manager bypass this signal and record their
+    changes once per call instead.
+
+    :param sender: The Target model
+    :param instance: The saved target
+    :param created: Whether the target was just created
+    :param using: The alias of the database where the target was written
+    :param **kwargs: The remaining arguments of the signal
+    :return: None
+    :doc-author: Trelent
+    """
+    if created:
+        TargetChange.objects.record(TargetChange.CREATED, [instance.pk], using=using)
+        return
+    previous_positions = {}
+    if hasattr(instance, "loaded_position"):
+        previous_positions[instance.pk] = instance.loaded_position
+    TargetChange.objects.record(
+        TargetChange.UPDATED,
+        [instance.pk],
+        using=using,
+        previous_positions=previous_positions,
+    )
+
+
+@receiver(post_delete, sender=Target)
+def record_target_delete(sender, instance, using, **kwargs):
+    """
+    The record_target_delete function records in the change log every target that is deleted one by one, which
+    also invalidates the cached target responses.
+
+    :param sender: The Target model
+    :param instance: The deleted target
+    :param using: The alias of the database where the target was deleted
+    :param **kwargs: The remaining arguments of the signal
+    :return: None
+    :doc-author: Trelent
+    """
+    TargetChange.objects.record(TargetChange.DELETED, [instance.pk], using=using)
@@ -0,0 +1,346 @@
+import array
+import bisect
+import datetime
+import functools
+import itertools
+import logging
+import math
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import uuid
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from core.cache import get_generation
+from core.db.cursors import iterate_queryset
+from core.models import Target
+
+logger = logging.getLogger(__name__)
+
+# Layout of a snapshot file, every number being little-endian:
+#   header: the magic, the number of targets, the generation of the targets table it was built from, when it was
+#       built, the bytes of the texts and the number of targets with a latitude
+#   ids: the 16 bytes of the UUID of each target, in ascending order, so a target is found by binary search
+#   lats, lngs: one float64 per target, NaN when the coordinate is not known
+#   updated_at: one int64 per target, the microseconds since the epoch
+#   expiration_date: one int32 per target, the proleptic Gregorian ordinal of the date
+#   lat order: one uint32 per target with a latitude, the indexes of the targets in ascending order of latitude, so
+#       the targets of a bbox are found by binary search like with the coordinates index of the database
+#   text offsets: one uint32 per text plus one, where each text starts and ends in the texts block
+#   texts: the UTF-8 encoded name, latitude and longitude of each target, one after the other
+# Every column starts aligned to the size of its items, so it is read in place through a memoryview of the mapping.
+MAGIC = b"TGS2"
+HEADER = struct.Struct("<4sIqdII")
+TEXTS = ("name", "latitude", "longitude")
+COLUMNS = ("id", *TEXTS, "lat", "lng", "expiration_date", "updated_at")
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def to_little_endian(values: array.array):
+    if sys.byteorder == "big":
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def write_snapshot(path: str, rows, generation: int):
+    """
+    The write_snapshot function writes targets to a snapshot file. The file is written next to the path, then
+    renamed over it, so the workers never map a file that is being written.
+
+    :param path: str: Where the snapshot is stored
+    :param rows: An iterable of tuples with the COLUMNS of each target, in ascending order of id
+    :param generation: int: The generation of the targets table the rows were read at
+    :return: The number of targets written
+    :doc-author: Trelent
+    """
+    ids = bytearray()
+    lats, lngs = array.array("d"), array.array("d")
+    updated_at = array.array("q")
+    expiration_dates = array.array("i")
+    offsets = array.array("I", [0])
+    texts = bytearray()
+    for target_id, name, latitude, longitude, lat, lng, expiration, updated in rows:
+        ids += target_id.bytes
+        lats.append(math.nan if lat is None else lat)
+        lngs.append(math.nan if lng is None else lng)
+        updated_at.append((updated - EPOCH) // MICROSECOND)
+        expiration_dates.append(expiration.toordinal())
+        for text in (name, latitude, longitude):
+            texts += text.encode()
+            offsets.append(len(texts))
+
+    count = len(expiration_dates)
+    lat_order = array.array(
+        "I",
+        sorted(
+            (index for index in range(count) if not math.isnan(lats[index])),
+            key=lats.__getitem__,
+        ),
+    )
+    header = HEADER.pack(
+        MAGIC,
+        count,
+        generation,
+        datetime.datetime.now().timestamp(),
+        len(texts),
+        len(lat_order),
+    )
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile(
+        dir=directory, prefix=".targets-snapshot-", delete=False
+    ) as file:
+        try:
+            for block in (
+                header,
+                ids,
+                *map(
+                    to_little_endian,
+                    (lats, lngs, updated_at, expiration_dates, lat_order, offsets),
+                ),
+                texts,
+            ):
+                file.write(block)
+            file.flush()
+            os.fsync(file.fileno())
+        except BaseException:
+            os.unlink(file.name)
+            raise
+    # The workers may run as another user than the builder.
+    os.chmod(file.name, 0o644)
+    os.replace(file.name, path)
+    return count
+
+
+def build_snapshot(path: str, chunk_size: int = None):
+    """
+    The build_snapshot function writes the live targets to a snapshot file. The generation of the targets table is
+    read before the targets, so a target written meanwhile makes the snapshot outdated instead of being missed, and
+    they are read from the primary, which replicas may lag behind.
+
+    :param path: str: Where the snapshot is stored
+    :param chunk_size: int: How many targets are fetched from the database at a time
+    :return: The number of targets written and the generation of the snapshot
+    :doc-author: Trelent
+    """
+    generation = get_generation()
+    queryset = (
+        Target.objects.using(DEFAULT_DB_ALIAS)
+        .live()
+        .order_by("id")
+        .values_list(*COLUMNS)
+    )
+    rows = iterate_queryset(queryset, chunk_size or settings.TARGETS_EXPORT_CHUNK_SIZE)
+    return write_snapshot(path, rows, generation), generation
+
+
+class TargetSnapshot:
+    """
+    A snapshot file mapped read-only in memory. The columns are read in place, so every worker process mapping the
+    same file shares its pages with the others, through the page cache, instead of holding a copy of the targets.
+    """
+
+    def __init__(self, path: str):
+        if sys.byteorder != "little":
+            raise SnapshotError("Snapshots are only mapped on little-endian machines.")
+        self.path = path
+        with open(path, "rb") as file:
+            stat = os.fstat(file.fileno())
+            self.file_id = (stat.st_ino, stat.st_mtime_ns)
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self.buffer) < HEADER.size:
+            raise SnapshotError(f"{path} is not a target snapshot.")
+        magic, count, generation, built_at, texts_size, located = HEADER.unpack_from(
+            self.buffer
+        )
+        sizes = (16 * count, 8 * count, 8 * count, 8 * count, 4 * count, 4 * located)
+        bounds = list(
+            itertools.accumulate((HEADER.size, *sizes, 4 * (3 * count + 1), texts_size))
+        )
+        if magic != MAGIC or bounds[-1] != len(self.buffer):
+            raise SnapshotError(f"{path} is not a target snapshot.")
+
+        self.count = count
+        self.generation = generation
+        self.built_at = built_at
+        view = memoryview(self.buffer)
+        ids, lats, lngs, updated_at, expiration_dates, lat_order, offsets, texts = (
+            view[start:end] for start, end in itertools.pairwise(bounds)
+        )
+        self.ids = ids
+        self.lats = lats.cast("d")
+        self.lngs = lngs.cast("d")
+        self.updated_at = updated_at.cast("q")
+        self.expiration_dates = expiration_dates.cast("i")
+        self.lat_order = lat_order.cast("I")
+        self.offsets = offsets.cast("I")
+        self.texts = texts
+        self.getters = {
+            "id": self.get_id,
+            "name": functools.partial(self.get_text, 0),
+            "latitude": functools.partial(self.get_text, 1),
+            "longitude": functools.partial(self.get_text, 2),
+            "lat": functools.partial(self.get_coordinate, self.lats),
+            "lng": functools.partial(self.get_coordinate, self.lngs),
+            "expiration_date": self.get_expiration_date,
+            "updated_at": self.get_updated_at,
+        }
+
+    def get_id_bytes(self, index: int):
+        start = 16 * index
+        end = start + 16
+        return self.ids[start:end].tobytes()
+
+    def get_id(self, index: int):
+        return uuid.UUID(bytes=self.get_id_bytes(index))
+
+    def get_text(self, column: int, index: int):
+        position = 3 * index + column
+        start, end = self.offsets[position], self.offsets[position + 1]
+        return str(self.texts[start:end], "utf-8")
+
+    def get_coordinate(self, column, index: int):
+        value = column[index]
+        return None if math.isnan(value) else value
+
+    def get_expiration_date(self, index: int):
+        return datetime.date.fromordinal(self.expiration_dates[index])
+
+    def get_updated_at(self, index: int):
+        return EPOCH + self.updated_at[index] * MICROSECOND
+
+    def find(self, target_id):
+        """
+        The find function looks a target up by id, with a binary search over the sorted ids.
+
+        :param self: Represent the instance of the class
+        :param target_id: The UUID of the target
+        :return: The index of the target, or None when it is not in the snapshot
+        :doc-author: Trelent
+        """
+        key = target_id.bytes
+        index = bisect.bisect_left(range(self.count), key, key=self.get_id_bytes)
+        if index < self.count and self.get_id_bytes(index) == key:
+            return index
+        return None
+
+    def is_live(self, index: int, today: int = None):
+        today = today if today is not None else datetime.date.today().toordinal()
+        return self.expiration_dates[index] > today
+
+    def rows(self, fields, bbox=None, located: bool = False):
+        """
+        The rows function reads the live targets, like Target.objects.live().in_bbox(*bbox).values_list(*fields).
+        With a bbox, only the targets in its range of latitudes are read, found by binary search over the lat order,
+        and they come in ascending order of latitude.
+
+        :param self: Represent the instance of the class
+        :param fields: The names of the fields of each row, in order
+        :param bbox: A tuple with min_lng, min_lat, max_lng and max_lat, or None to read every target
+        :param located: bool: Whether to skip the targets without coordinates
+        :return: A generator of tuples
+        :doc-author: Trelent
+        """
+        today = datetime.date.today().toordinal()
+        getters = [self.getters[field] for field in fields]
+        lats, lngs, expiration_dates = self.lats, self.lngs, self.expiration_dates
+        if bbox is None:
+            indexes = range(self.count)
+        else:
+            min_lng, min_lat, max_lng, max_lat = bbox
+            crosses_antimeridian = min_lng > max_lng
+            start = bisect.bisect_left(self.lat_order, min_lat, key=lats.__getitem__)
+            end = bisect.bisect_right(self.lat_order, max_lat, key=lats.__getitem__)
+            indexes = self.lat_order[start:end]
+        for index in indexes:
+            if expiration_dates[index] <= today:
+                continue
+            lng = lngs[index]
+            if bbox is not None:
+                # NaN compares false, so the targets without a longitude are never inside a box.
+                if crosses_antimeridian:
+                    if not (lng >= min_lng or lng <= max_lng):
+                        continue
+                elif not min_lng <= lng <= max_lng:
+                    continue
+            elif located and (math.isnan(lats[index]) or math.isnan(lng)):
+                continue
+            yield tuple(getter(index) for getter in getters)
+
+    def get_target(self, index: int):
+        """
+        The get_target function builds the Target of an index, without touching the database.
+
+        :param self: Represent the instance of the class
+        :param index: int: The index of the target
+        :return: An unsaved Target with every field of the target
+        :doc-author: Trelent
+        """
+        return Target(**{field: self.getters[field](index) for field in COLUMNS})
+
+
+# The snapshot mapped by this process, replaced when the file is rebuilt.
+snapshot_state = {"snapshot": None}
+snapshot_lock = threading.Lock()
+
+
+def load_snapshot(path: str):
+    """
+    The load_snapshot function maps the snapshot file, unless the snapshot already mapped is the same file. The
+    previous mapping stays valid for the requests still reading it, and is unmapped once they are done.
+
+    :param path: str: Where the snapshot is stored
+    :return: The snapshot, or None when there is no valid snapshot there
+    :doc-author: Trelent
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    with snapshot_lock:
+        snapshot = snapshot_state["snapshot"]
+        if (
+            snapshot is not None
+            and snapshot.path == path
+            and snapshot.file_id == (stat.st_ino, stat.st_mtime_ns)
+        ):
+            return snapshot
+        try:
+            snapshot = TargetSnapshot(path)
+        except (OSError, ValueError, SnapshotError) as error:
+            logger.warning("Could not map the target snapshot: %s", error)
+            return None
+        snapshot_state["snapshot"] = snapshot
+        return snapshot
+
+
+def get_current_snapshot():
+    """
+    The get_current_snapshot function returns the snapshot of the TARGETS_SNAPSHOT_PATH setting when it was built
+    at the current generation of the targets table, so it has exactly the targets the database has. After a write,
+    the requests go to the database until the snapshot is rebuilt.
+
+    :return: The snapshot, or None when the requests should query the database
+    :doc-author: Trelent
+    """
+    path = settings.TARGETS_SNAPSHOT_PATH
+    if not path:
+        return None
+    generation = get_generation()
+    snapshot = snapshot_state["snapshot"]
+    if snapshot is None or snapshot.path != path or snapshot.generation != generation:
+        snapshot = load_snapshot(path)
+    if snapshot is None or snapshot.generation != generation:
+        return None
+    return snapshot
@@ -0,0 +1,225 @@
+import gzip
+import json
+import mimetypes
+import os
+from urllib.parse import urlsplit
+
+import brotli
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.files.base import ContentFile
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import sync_and_async_middleware
+from django.utils.http import http_date, parse_etags
+
+COMPRESSIBLE_EXTENSIONS = (".css", ".js", ".map", ".svg", ".html", ".txt", ".json")
+# The compressed variants, in order of preference, with their file suffix and compressor.
+ENCODINGS = (
+    ("br", ".br", lambda content: brotli.compress(content, quality=11)),
+    ("gzip", ".gz", lambda content: gzip.compress(content, compresslevel=9, mtime=0)),
+)
+# A variant saving less than 5% is not worth sending instead of the file itself.
+MIN_COMPRESSION_RATIO = 0.95
+# The files are kept in memory once served, up to this size; larger ones are read from the disk at each request.
+MAX_CACHED_SIZE = 1024 * 1024
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, max-age=0, must-revalidate"
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Stores the collected files under names including a hash of their content, like ManifestStaticFilesStorage, and
+    next to each text file its brotli (.br) and gzip (.gz) variants, so they are compressed once by collectstatic
+    instead of at each request.
+
+    Outside of DEBUG, the templates of a tree where collectstatic was not run, like in the tests, link to the files
+    under their own names instead of failing.
+    """
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in {*paths, *self.hashed_files.values()}:
+            if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self.compress(name)
+
+    def compress(self, name: str):
+        """
+        The compress function writes the compressed variants of a collected file that are worth it, and removes
+        the ones left from a previous collectstatic that are not anymore.
+
+        :param self: Represent the instance of the class
+        :param name: str: The name of the collected file
+        :return: None
+        :doc-author: Trelent
+        """
+        with self.open(name) as file:
+            content = file.read()
+        for _, suffix, compress in ENCODINGS:
+            compressed = compress(content)
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            if len(compressed) < len(content) * MIN_COMPRESSION_RATIO:
+                self._save(name + suffix, ContentFile(compressed))
+
+
+class StaticFile:
+    """
+    A collected file and its compressed variants, with the headers they are served with.
+    """
+
+    def __init__(self, path: str, immutable: bool):
+        self.content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        self.cache_control = (
+            IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL
+        )
+        # The variants by encoding, None being the file itself, with their path, size, ETag and modification time.
+        self.variants = {}
+        for encoding, suffix, _ in (*ENCODINGS, (None, "", None)):
+            if os.path.exists(path + suffix):
+                stat = os.stat(path + suffix)
+                etag = f'"{int(stat.st_mtime):x}-{stat.st_size:x}"'
+                self.variants[encoding] = (
+                    path + suffix,
+                    stat.st_size,
+                    etag,
+                    stat.st_mtime,
+                )
+        self.contents = {}
+
+    def choose_encoding(self, accept_encoding: str):
+        """
+        The choose_encoding function picks the smallest variant the client accepts.
+
+        :param self: Represent the instance of the class
+        :param accept_encoding: str: The Accept-Encoding header of the request
+        :return: The encoding, or None for the file itself
+        :doc-author: Trelent
+        """
+        accepted = {
+            token.split(";")[0].strip()
+            for token in accept_encoding.split(",")
+            if not token.replace(" ", "").endswith(";q=0")
+        }
+        for encoding, _, _ in ENCODINGS:
+            if encoding in accepted and encoding in self.variants:
+                return encoding
+        return None
+
+    def respond(self, request):
+        """
+        The respond function answers a GET or HEAD request for the file with its best variant, or with a 304 when
+        the client already has it.
+
+        :param self: Represent the instance of the class
+        :param request: The request being answered
+        :return: The response
+        :doc-author: Trelent
+        """
+        encoding = self.choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        path, size, etag, modified = self.variants[encoding]
+
+        if etag in parse_etags(request.META.get("HTTP_IF_NONE_MATCH", "")):
+            response = HttpResponseNotModified()
+        elif request.method == "HEAD":
+            response = HttpResponse(content_type=self.content_type)
+            response["Content-Length"] = size
+        elif size > MAX_CACHED_SIZE:
+            response = FileResponse(open(path, "rb"), content_type=self.content_type)
+            del response["Content-Disposition"]
+        else:
+            content = self.contents.get(encoding)
+            if content is None:
+                with open(path, "rb") as file:
+                    content = self.contents[encoding] = file.read()
+            response = HttpResponse(content, content_type=self.content_type)
+
+        response["Cache-Control"] = self.cache_control
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(modified)
+        # Set by SecurityMiddleware on the other responses, which the static files do not go through.
+        response["X-Content-Type-Options"] = "nosniff"
+        if encoding is not None:
+            response["Content-Encoding"] = encoding
+        if len(self.variants) > 1:
+            patch_vary_headers(response, ("Accept-Encoding",))
+        return response
+
+
+def find_static_files(root: str, prefix: str):
+    """
+    The find_static_files function lists the files collected in STATIC_ROOT by their URL. The files named after a
+    hash of their content are cached forever by the browsers, the other ones are revalidated.
+
+    :param root: str: The STATIC_ROOT directory
+    :param prefix: str: The path of STATIC_URL
+    :return: A dictionary of StaticFile by URL path
+    :doc-author: Trelent
+    """
+    hashed_names = set()
+    manifest_path = os.path.join(root, ManifestStaticFilesStorage.manifest_name)
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as manifest:
+            hashed_names.update(json.load(manifest).get("paths", {}).values())
+    suffixes = tuple(suffix for _, suffix, _ in ENCODINGS)
+    files = {}
+    for directory, _, names in os.walk(root):
+        for name in names:
+            if name.endswith(suffixes):
+                continue
+            path = os.path.join(directory, name)
+            relative = os.path.relpath(path, root).replace(os.sep, "/")
+            files[prefix + relative] = StaticFile(path, relative in hashed_names)
+    return files
+
+
+@sync_and_async_middleware
+def static_files_middleware(get_response):
+    """
+    The static_files_middleware function serves the files collected in STATIC_ROOT, before the other middlewares
+    and the URL resolver get to them. The files are listed once, when the server starts, so collectstatic must run
+    before it. It is not used when STATIC_ROOT is not collected, like under runserver, which serves the static
+    files itself.
+
+    :param get_response: The next middleware or view
+    :return: The middleware
+    :doc-author: Trelent
+    """
+    root = settings.STATIC_ROOT
+    if not root or not os.path.isdir(root):
+        raise MiddlewareNotUsed
+    prefix = urlsplit(settings.STATIC_URL).path
+    files = find_static_files(root, prefix)
+
+    def find(request):
+        if request.method not in ("GET", "HEAD"):
+            return None
+        return files.get(request.path)
+
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            static_file = find(request)
+            if static_file is None:
+                return await get_response(request)
+            return static_file.respond(request)
+
+    else:
+
+        def middleware(request):
+            static_file = find(request)
+            if static_file is None:
+                return get_response(request)
+            return static_file.respond(request)
+
+    return middleware
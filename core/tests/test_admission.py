@@ -0,0 +1,233 @@
+import threading
+import time
+from unittest import mock
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.admission import (
+    CacheBucketStore,
+    ConcurrencyLimiter,
+    LocalBucketStore,
+    get_client_ident,
+)
+from core.metrics import render_metrics
+from core.middleware import admission_middleware
+
+
+class TestBucketStores(SimpleTestCase):
+    def test_take(self):
+        """
+        The test_take function tests that a client gets its burst at once, then one request per 1 / rate seconds,
+        with the time until the next token, in both stores.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        for store in (LocalBucketStore(), CacheBucketStore()):
+            with self.subTest(store=type(store).__name__):
+                now = 1000.0
+                with mock.patch("time.monotonic", lambda: now), mock.patch(
+                    "time.time", lambda: now
+                ):
+                    self.assertEqual(store.take("client", 2, 3), 0)
+                    self.assertEqual(store.take("client", 2, 3), 0)
+                    self.assertEqual(store.take("client", 2, 3), 0)
+                    self.assertEqual(store.take("client", 2, 3), 0.5)
+                    self.assertEqual(store.take("other", 2, 3), 0)
+
+                    now += 0.5
+                    self.assertEqual(store.take("client", 2, 3), 0)
+                    self.assertEqual(store.take("client", 2, 3), 0.5)
+
+    @mock.patch("core.admission.MAX_LOCAL_BUCKETS", 2)
+    def test_drop_full_buckets(self):
+        store = LocalBucketStore()
+        store.take("first", 1000, 1)
+        time.sleep(0.01)
+        store.take("second", 1, 2)
+        store.take("third", 1, 2)
+
+        self.assertEqual(set(store.buckets), {"second", "third"})
+
+    @override_settings(THROTTLE_NUM_PROXIES=1)
+    def test_client_ident_behind_proxy(self):
+        request = RequestFactory().get(
+            "/", HTTP_X_FORWARDED_FOR="10.0.0.1, 203.0.113.7", REMOTE_ADDR="10.0.0.2"
+        )
+
+        self.assertEqual(get_client_ident(request), "203.0.113.7")
+
+
+class TestConcurrencyLimiter(SimpleTestCase):
+    def test_rejects_when_queue_full(self):
+        limiter = ConcurrencyLimiter(1, 0, 1, 0.005)
+
+        self.assertTrue(limiter.acquire())
+        self.assertFalse(limiter.acquire())
+        limiter.release()
+        self.assertTrue(limiter.acquire())
+        self.assertEqual(limiter.stats()["rejected"], 1)
+
+    def test_waits_for_release(self):
+        """
+        The test_waits_for_release function tests that a queued request is admitted when a running one finishes
+        before its queue timeout.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        limiter = ConcurrencyLimiter(1, 1, 5, 5)
+        limiter.acquire()
+        admitted = []
+
+        waiter = threading.Thread(target=lambda: admitted.append(limiter.acquire()))
+        waiter.start()
+        while not limiter.stats()["queued"]:
+            pass
+        limiter.release()
+        waiter.join()
+
+        self.assertEqual(admitted, [True])
+        self.assertEqual(limiter.stats()["in_flight"], 1)
+        self.assertEqual(limiter.stats()["waits"], 1)
+
+    def test_shorter_timeout_when_overloaded(self):
+        """
+        The test_shorter_timeout_when_overloaded function tests that once the queue has not been empty for the
+        queue timeout, the requests only wait for the queue target before being rejected.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        limiter = ConcurrencyLimiter(1, 10, 1, 0.001)
+        limiter.acquire()
+        # Another request has been queued for longer than the queue timeout.
+        limiter.queued = 1
+        limiter.last_empty_at = time.monotonic() - 2
+
+        started_at = time.monotonic()
+        self.assertFalse(limiter.acquire())
+        self.assertLess(time.monotonic() - started_at, 0.5)
+
+
+@override_settings(
+    THROTTLE_RATES={
+        "read": {"rate": 1, "burst": 2},
+        "write": {"rate": 0.1, "burst": 1},
+    },
+    ADMISSION_MAX_CONCURRENCY=1,
+    ADMISSION_MAX_QUEUE=0,
+)
+class TestAdmissionMiddleware(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.middleware = admission_middleware(lambda request: HttpResponse("view"))
+
+    def test_throttles_reads_and_writes_separately(self):
+        """
+        The test_throttles_reads_and_writes_separately function tests that a client over its rate gets a 429 with
+        Retry-After, and that its reads and writes have buckets of their own.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        for _ in range(2):
+            self.assertEqual(
+                self.middleware(self.factory.get("/api/target/")).status_code, 200
+            )
+        res = self.middleware(self.factory.get("/api/target/"))
+
+        self.assertEqual(res.status_code, 429)
+        self.assertEqual(res["Retry-After"], "1")
+        self.assertEqual(
+            self.middleware(self.factory.post("/api/target/")).status_code, 200
+        )
+        res = self.middleware(self.factory.post("/api/target/"))
+        self.assertEqual(res.status_code, 429)
+        self.assertEqual(res["Retry-After"], "10")
+        self.assertIn('admission_rejected_total{reason="throttled"}', render_metrics())
+
+    def test_other_paths_not_limited(self):
+        for _ in range(5):
+            self.assertEqual(
+                self.middleware(self.factory.get("/metrics")).status_code, 200
+            )
+
+    def test_sheds_over_concurrency(self):
+        """
+        The test_sheds_over_concurrency function tests that a request arriving while the limit of concurrent
+        requests is reached, with no room to queue, gets a 503 with Retry-After without reaching the view.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        responses = []
+
+        def view(request):
+            responses.append(middleware(self.factory.get("/api/target/1/")))
+            return HttpResponse("view")
+
+        middleware = admission_middleware(view)
+
+        self.assertEqual(middleware(self.factory.get("/api/target/")).status_code, 200)
+        self.assertEqual(responses[0].status_code, 503)
+        self.assertEqual(responses[0]["Retry-After"], "1")
+
+    @override_settings(THROTTLE_RATES={"read": {"rate": 1, "burst": 5}})
+    def test_streaming_response_keeps_its_slot(self):
+        """
+        The test_streaming_response_keeps_its_slot function tests that a streaming response keeps its slot of the
+        concurrency limit until it is closed, since it keeps working after the view returned.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        middleware = admission_middleware(
+            lambda request: StreamingHttpResponse(iter([b"row"]))
+        )
+
+        streaming = middleware(self.factory.get("/api/target/export/"))
+        self.assertEqual(
+            middleware(self.factory.get("/api/target/export/")).status_code, 503
+        )
+
+        streaming.close()
+        response = middleware(self.factory.get("/api/target/export/"))
+        self.assertEqual(response.status_code, 200)
+        response.close()
+
+    @override_settings(THROTTLE_RATES={"read": {"rate": 1, "burst": 10}})
+    def test_event_streams_hold_no_slot(self):
+        """
+        The test_event_streams_hold_no_slot function tests that the open event streams, idle most of the time, do
+        not take the slots of the concurrency limit, so more of them than the limit still let the API answer.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+
+        def view(request):
+            if request.path == "/api/target/events/":
+                return StreamingHttpResponse(
+                    iter([b"retry: 1000\n\n"]), content_type="text/event-stream"
+                )
+            return HttpResponse("view")
+
+        middleware = admission_middleware(view)
+
+        streams = [
+            middleware(self.factory.get("/api/target/events/")) for _ in range(3)
+        ]
+
+        self.assertEqual([stream.status_code for stream in streams], [200] * 3)
+        self.assertEqual(middleware(self.factory.get("/api/target/")).status_code, 200)
+        for stream in streams:
+            stream.close()
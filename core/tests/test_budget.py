@@ -0,0 +1,106 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.budget import QueryBudget, QueryBudgetExceeded
+from core.models import Target
+
+
+def create_targets(count: int):
+    Target.objects.bulk_create_targets(
+        {"name": f"Test {index}", "latitude": "-5.9241953", "longitude": "-35.2115504"}
+        for index in range(count)
+    )
+
+
+class TestQueryBudget(TestCase):
+    def test_within_budget(self):
+        create_targets(3)
+
+        with QueryBudget(max_queries=1) as budget:
+            list(Target.objects.all())
+
+        self.assertEqual(budget.queries, 1)
+
+    def test_over_budget_raises(self):
+        """
+        The test_over_budget_raises function tests that a block running one query per row goes over its budget, and
+        that the error points at the repeated query.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        create_targets(3)
+
+        with self.assertRaisesRegex(QueryBudgetExceeded, r"ran 4 SQL queries.*\(3x\)"):
+            with QueryBudget(max_queries=1):
+                for target in Target.objects.all():
+                    Target.objects.get(pk=target.pk)
+
+    def test_over_budget_logs(self):
+        with self.assertLogs("core.budget", level="WARNING") as logs:
+            with QueryBudget(max_queries=0, action="log", name="Listing"):
+                list(Target.objects.all())
+
+        self.assertIn("Listing ran 1 SQL queries", logs.output[0])
+
+    def test_decorator(self):
+        """
+        The test_decorator function tests that a decorated function gets a budget of its own on every call.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+
+        @QueryBudget(max_queries=1)
+        def count_targets():
+            return Target.objects.count()
+
+        self.assertEqual(count_targets(), 0)
+        self.assertEqual(count_targets(), 0)
+
+        @QueryBudget(max_queries=1)
+        def count_twice():
+            return Target.objects.count() + Target.objects.count()
+
+        with self.assertRaisesRegex(QueryBudgetExceeded, "count_twice ran 2"):
+            count_twice()
+
+
+@override_settings(
+    QUERY_BUDGET_ACTION="raise",
+    QUERY_BUDGETS={
+        "default": {"queries": 20},
+        "target:target-list": {"queries": 10},
+        "GET target:target-list": {"queries": 0},
+    },
+    TARGETS_CACHE_TIMEOUT=0,
+)
+class TestQueryBudgetMiddleware(TestCase):
+    def test_view_over_budget(self):
+        with self.assertRaisesRegex(
+            QueryBudgetExceeded, "GET target:target-list ran 1 SQL queries"
+        ):
+            self.client.get(reverse("target:target-list"))
+
+    def test_view_within_default_budget(self):
+        create_targets(1)
+
+        res = self.client.get(reverse("target:target-clusters"), {"zoom": 3})
+
+        self.assertEqual(res.status_code, 200)
+
+    def test_method_budget(self):
+        res = self.client.post(
+            reverse("target:target-list"),
+            {"name": "Test", "latitude": "-5.9241953", "longitude": "-35.2115504"},
+        )
+
+        self.assertEqual(res.status_code, 201)
+
+    @override_settings(QUERY_BUDGET_ACTION="off")
+    def test_budget_off(self):
+        res = self.client.get(reverse("target:target-list"))
+
+        self.assertEqual(res.status_code, 200)
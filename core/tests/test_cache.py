@@ -0,0 +1,81 @@
+from django.test import TestCase
+
+from core.cache import (
+    bump_generation,
+    get_generation,
+    get_targets_cache,
+    invalidate_targets,
+)
+from core.models import Target
+
+
+class TestCache(TestCase):
+    def setUp(self):
+        """
+        The setUp function clears the targets cache, so every test starts without a generation.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        get_targets_cache().clear()
+
+    def test_generation_changes_on_bump(self):
+        """
+        The test_generation_changes_on_bump function tests that the generation is stable until it is bumped, and
+        that bumping always moves it forward.
+
+        :param self: Represent the instance of the class
+        :return: The generations before and after the bump
+        :doc-author: Trelent
+        """
+        generation = get_generation()
+
+        self.assertEqual(get_generation(), generation)
+        self.assertGreater(bump_generation(), generation)
+        self.assertGreater(get_generation(), generation)
+
+    def test_invalidate_targets_again_after_commit(self):
+        """
+        The test_invalidate_targets_again_after_commit function tests that invalidating the targets inside a
+        transaction bumps the generation right away and once again when the transaction is committed.
+
+        :param self: Represent the instance of the class
+        :return: The generations before and after the commit
+        :doc-author: Trelent
+        """
+        generation = get_generation()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            invalidate_targets()
+            after_write = get_generation()
+
+        self.assertGreater(after_write, generation)
+        self.assertEqual(len(callbacks), 1)
+        self.assertGreater(get_generation(), after_write)
+
+    def test_writes_invalidate_targets(self):
+        """
+        The test_writes_invalidate_targets function tests that saving and deleting a target, as well as the bulk
+        paths of the manager, bump the generation.
+
+        :param self: Represent the instance of the class
+        :return: The generations after each write
+        :doc-author: Trelent
+        """
+        generations = [get_generation()]
+
+        target = Target.objects.create_target(
+            name="Testing", latitude="-5.9", longitude="-35.2"
+        )
+        generations.append(get_generation())
+
+        Target.objects.bulk_create_targets(
+            [{"name": "Bulk", "latitude": "-5.9", "longitude": "-35.2"}]
+        )
+        generations.append(get_generation())
+
+        Target.objects.bulk_delete_targets([target.id])
+        generations.append(get_generation())
+
+        self.assertEqual(generations, sorted(set(generations)))
@@ -1,52 +1,362 @@
+import datetime
+import json
+import os
+import tempfile
+from io import StringIO
 from unittest.mock import patch
 
-from psycopg2 import OperationalError as Psycopg2OpError
-
 from django.core.management import call_command
-from django.db.utils import OperationalError
-from django.test import SimpleTestCase
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from freezegun import freeze_time
+
+from core.models import Target, TargetChange
+from core.snapshot import TargetSnapshot
+from core.utils import get_expiration_date_default
 
 
-@patch("core.management.commands.wait_for_db.Command.check")
+@patch("core.readiness.probe_database")
 class TestCommands(SimpleTestCase):
-    def test_wait_for_db_ready(self, patched_check):
+    def test_wait_for_db_ready(self, patched_probe):
         """
         The test_wait_for_db_ready function is a test case that checks whether the wait_for_db command works as
         expected.
-        It does so by patching django.db.utils.ConnectionHandler._check_conn() and setting its return value to True,
-        which simulates a successful database connection check.
+        It does so by patching core.readiness.probe_database and setting its return value to True,
+        which simulates a successful database connection probe.
 
         :param self: Access the instance of the class
-        :param patched_check: Patch the check function
+        :param patched_probe: Patch the probe function
         :return: True
         :doc-author: Trelent
         """
-        patched_check.return_value = True
+        patched_probe.return_value = True
 
-        call_command("wait_for_db")
+        call_command("wait_for_db", stdout=StringIO())
 
-        patched_check.assert_called_once_with(databases=["default"])
+        patched_probe.assert_called_once_with("default")
 
     @patch("time.sleep")
-    def test_wait_for_db_delay(self, patched_sleep, patched_check):
+    def test_wait_for_db_delay(self, patched_sleep, patched_probe):
         """
         The test_wait_for_db_delay function tests the wait_for_db command.
-        It does this by patching the sleep function and check database functions,
+        It does this by patching the sleep function and probe database functions,
         and then calling the wait_for_db command. It asserts that:
-            - The patched check function was called 6 times (5 times for errors + 1 time for success)
-            - The patched check function was called with 'default' as an argument
+            - The patched probe function was called 6 times (5 times for errors + 1 time for success)
+            - The sleeps between the attempts never exceed the exponentially growing delay
+
+        :param self: Access the class instance
+        :param patched_sleep: Mock the sleep function
+        :param patched_probe: Mock the probe function
+        :return: The number of times patched_probe was called
+        :doc-author: Trelent
+        """
+        patched_probe.side_effect = [False] * 5 + [True]
+
+        call_command("wait_for_db", stdout=StringIO())
+
+        self.assertEqual(patched_probe.call_count, 6)
+        self.assertEqual(patched_sleep.call_count, 5)
+        for attempt, call in enumerate(patched_sleep.call_args_list):
+            self.assertLessEqual(call.args[0], 0.05 * 2**attempt)
+
+    @patch("time.sleep")
+    def test_wait_for_db_timeout(self, patched_sleep, patched_probe):
+        """
+        The test_wait_for_db_timeout function tests that the wait_for_db command gives up once the database did not
+        answer for --timeout seconds.
 
         :param self: Access the class instance
         :param patched_sleep: Mock the sleep function
-        :param patched_check: Mock the check function
-        :return: The number of times patched_check was called
+        :param patched_probe: Mock the probe function
+        :return: None
+        :doc-author: Trelent
+        """
+        patched_probe.return_value = False
+
+        with self.assertRaisesMessage(
+            CommandError, "still unavailable after 1 attempts"
+        ):
+            call_command("wait_for_db", "--timeout", "0", stdout=StringIO())
+
+        patched_sleep.assert_not_called()
+
+
+class TestImportTargets(TestCase):
+    def setUp(self):
+        """
+        The setUp function creates a temporary directory where the files to be imported are written.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write_file(self, name: str, content: str):
+        """
+        The write_file function writes a file to the temporary directory and returns its path.
+
+        :param self: Represent the instance of the class
+        :param name: str: Name of the file
+        :param content: str: Content of the file
+        :return: The path of the file
+        :doc-author: Trelent
+        """
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+        return path
+
+    def test_import_targets_from_csv(self):
+        """
+        The test_import_targets_from_csv function tests the import_targets command with a CSV file.
+        It asserts that the valid rows are imported in batches and that the invalid ones are reported.
+
+        :param self: Represent the instance of the class
+        :return: The imported targets
+        :doc-author: Trelent
+        """
+        expiration_date = get_expiration_date_default() + datetime.timedelta(days=3)
+        path = self.write_file(
+            "targets.csv",
+            "name,latitude,longitude,expiration_date\n"
+            "First,-5.9,-35.2,\n"
+            f"Second,-5.8,-35.1,{expiration_date.isoformat()}\n"
+            "Third,north,-35.1,\n"
+            "Fourth,-5.7,-35.0,\n",
+        )
+        stdout, stderr = StringIO(), StringIO()
+
+        call_command("import_targets", path, batch_size=2, stdout=stdout, stderr=stderr)
+
+        self.assertEqual(
+            sorted(Target.objects.values_list("name", flat=True)),
+            ["First", "Fourth", "Second"],
+        )
+        self.assertEqual(
+            Target.objects.get(name="Second").expiration_date, expiration_date
+        )
+        self.assertEqual(Target.objects.get(name="First").lat, -5.9)
+        self.assertIn("Imported 3 targets", stdout.getvalue())
+        self.assertIn("rejected 1 rows", stdout.getvalue())
+        self.assertIn(
+            "Line 4: Latitude must be a number between -90 and 90.", stderr.getvalue()
+        )
+
+    def test_import_targets_from_ndjson(self):
+        """
+        The test_import_targets_from_ndjson function tests the import_targets command with a NDJSON file, including
+        lines that are not valid JSON and expiration dates in the past.
+
+        :param self: Represent the instance of the class
+        :return: The imported targets
+        :doc-author: Trelent
+        """
+        yesterday = datetime.date.today() - datetime.timedelta(days=1)
+        path = self.write_file(
+            "targets.ndjson",
+            '{"name": "First", "latitude": "-5.9", "longitude": "-35.2"}\n'
+            "\n"
+            "{not json\n"
+            '{"name": "Old", "latitude": "-5.9", "longitude": "-35.2", '
+            f'"expiration_date": "{yesterday.isoformat()}"}}\n',
+        )
+        stdout, stderr = StringIO(), StringIO()
+
+        call_command("import_targets", path, stdout=stdout, stderr=stderr)
+
+        self.assertEqual(list(Target.objects.values_list("name", flat=True)), ["First"])
+        self.assertIn("rejected 2 rows", stdout.getvalue())
+        self.assertIn("Line 3: Invalid JSON.", stderr.getvalue())
+        self.assertIn(
+            "Line 4: Expiration Date must be at least one day ahead.", stderr.getvalue()
+        )
+
+    def test_import_targets_with_too_long_name(self):
+        """
+        The test_import_targets_with_too_long_name function tests that a row whose name does not fit the column is
+        rejected, instead of failing the COPY of its whole batch.
+
+        :param self: Represent the instance of the class
+        :return: The imported targets
+        :doc-author: Trelent
+        """
+        path = self.write_file(
+            "targets.csv",
+            "name,latitude,longitude\n"
+            f"{'x' * 257},-5.9,-35.2\n"
+            "First,-5.9,-35.2\n",
+        )
+        stdout, stderr = StringIO(), StringIO()
+
+        call_command("import_targets", path, stdout=stdout, stderr=stderr)
+
+        self.assertEqual(list(Target.objects.values_list("name", flat=True)), ["First"])
+        self.assertIn("Line 2: Name must be at most 256 characters.", stderr.getvalue())
+
+    def test_import_targets_batch_is_atomic(self):
+        """
+        The test_import_targets_batch_is_atomic function tests that a batch whose change log entries can not be
+        written is rolled back, so no target is left without them.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        path = self.write_file(
+            "targets.csv", "name,latitude,longitude\nFirst,-5.9,-35.2\n"
+        )
+
+        with patch.object(
+            TargetChange.objects, "record", side_effect=RuntimeError
+        ), self.assertRaises(RuntimeError):
+            call_command("import_targets", path, stdout=StringIO())
+
+        self.assertFalse(Target.objects.exists())
+
+    def test_import_targets_with_unknown_format(self):
+        """
+        The test_import_targets_with_unknown_format function tests that the import_targets command refuses files
+        whose format can not be guessed.
+
+        :param self: Represent the instance of the class
+        :return: A CommandError
+        :doc-author: Trelent
+        """
+        path = self.write_file("targets.txt", "")
+
+        with self.assertRaises(CommandError):
+            call_command("import_targets", path)
+
+
+class TestExportTargets(TestCase):
+    def test_export_targets_round_trip(self):
+        """
+        The test_export_targets_round_trip function tests the export_targets command.
+        It exports the targets to a file, deletes them, imports the file back with the import_targets command and
+        asserts that the same targets exist again.
+
+        :param self: Represent the instance of the class
+        :return: The imported targets
+        :doc-author: Trelent
+        """
+        for name in ("First", "Second", "Third"):
+            Target.objects.create_target(name=name, latitude="-5.9", longitude="-35.2")
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "targets.csv")
+
+            call_command("export_targets", format="csv", output=path, chunk_size=2)
+            Target.objects.all().delete()
+            call_command("import_targets", path, stdout=StringIO())
+
+        self.assertEqual(
+            sorted(Target.objects.values_list("name", flat=True)),
+            ["First", "Second", "Third"],
+        )
+
+    def test_export_targets_to_stdout(self):
+        """
+        The test_export_targets_to_stdout function tests that the export_targets command writes NDJSON to stdout by
+        default.
+
+        :param self: Represent the instance of the class
+        :return: The exported targets
+        :doc-author: Trelent
+        """
+        target = Target.objects.create_target(
+            name="Testing", latitude="-5.9", longitude="-35.2"
+        )
+        stdout = StringIO()
+
+        call_command("export_targets", stdout=stdout)
+
+        rows = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual([row["id"] for row in rows], [str(target.id)])
+
+
+class TestBuildTargetSnapshot(TestCase):
+    def test_build_target_snapshot(self):
+        """
+        The test_build_target_snapshot function tests that the build_target_snapshot command writes the live
+        targets to the snapshot, and leaves the expired ones out.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        Target.objects.create_target(name="Expired", latitude="-5.9", longitude="-35.2")
+        later = get_expiration_date_default() + datetime.timedelta(days=5)
+        target = Target.objects.create_target(
+            name="Live", latitude="-5.9", longitude="-35.2", expiration_date=later
+        )
+        stdout = StringIO()
+
+        with tempfile.TemporaryDirectory() as directory, freeze_time(
+            later - datetime.timedelta(days=1)
+        ):
+            path = os.path.join(directory, "targets.snapshot")
+            call_command("build_target_snapshot", path=path, stdout=stdout)
+            snapshot = TargetSnapshot(path)
+
+            self.assertEqual(list(snapshot.rows(["id"])), [(target.id,)])
+        self.assertIn("Wrote 1 targets", stdout.getvalue())
+
+    def test_build_target_snapshot_without_path(self):
+        with self.assertRaises(CommandError):
+            call_command("build_target_snapshot", path="")
+
+
+class TestPurgeExpiredTargets(TestCase):
+    def test_purge_expired_targets(self):
+        """
+        The test_purge_expired_targets function tests the purge_expired_targets command.
+        It creates targets that will be expired in a few days, moves the clock past their expiration and asserts that
+        only the expired ones are deleted, in batches.
+
+        :param self: Represent the instance of the class
+        :return: The targets left in the database
+        :doc-author: Trelent
+        """
+        for name in ("First", "Second", "Third"):
+            Target.objects.create_target(name=name, latitude="-5.9", longitude="-35.2")
+        later = get_expiration_date_default() + datetime.timedelta(days=5)
+        Target.objects.create_target(
+            name="Live", latitude="-5.9", longitude="-35.2", expiration_date=later
+        )
+        stdout = StringIO()
+
+        with freeze_time(later - datetime.timedelta(days=1)):
+            call_command("purge_expired_targets", batch_size=2, stdout=stdout)
+
+        self.assertEqual(list(Target.objects.values_list("name", flat=True)), ["Live"])
+        self.assertIn("Deleted 3 expired targets", stdout.getvalue())
+
+    def test_purge_old_changes(self):
+        """
+        The test_purge_old_changes function tests that the purge_expired_targets command also deletes the change log
+        entries older than the retention, and keeps the recent ones.
+
+        :param self: Represent the instance of the class
+        :return: The change log entries left in the database
         :doc-author: Trelent
         """
-        patched_check.side_effect = (
-            [Psycopg2OpError] * 2 + [OperationalError] * 3 + [True]
+        old = Target.objects.create_target(
+            name="Old", latitude="-5.9", longitude="-35.2"
         )
+        recent = Target.objects.create_target(
+            name="Recent", latitude="-5.9", longitude="-35.2"
+        )
+        TargetChange.objects.filter(target_id=old.id).update(
+            created_at=timezone.now() - datetime.timedelta(days=30)
+        )
+        stdout = StringIO()
 
-        call_command("wait_for_db")
+        call_command("purge_expired_targets", stdout=stdout)
 
-        self.assertEqual(patched_check.call_count, 6)
-        patched_check.assert_called_with(databases=["default"])
+        self.assertEqual(
+            list(TargetChange.objects.values_list("target_id", flat=True)), [recent.id]
+        )
+        self.assertIn("and 1 old change log entries", stdout.getvalue())
@@ -0,0 +1,262 @@
+import threading
+import time
+from unittest import mock
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from core.db import pool
+from core.db.backends.pooled_postgresql.base import DatabaseWrapper
+from core.db.cursors import iterate_queryset
+from core.db.pool import ConnectionPool, PoolTimeout, get_pool_stats
+from core.models import Target
+from core.routers import ReplicaRouter, read_from_replica
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestConnectionPool(SimpleTestCase):
+    def test_reuses_released_connections(self):
+        """
+        The test_reuses_released_connections function tests that a released connection is handed out again instead
+        of a new one being opened.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        connections_pool = ConnectionPool(max_size=2, timeout=1)
+        connect = mock.Mock(side_effect=FakeConnection)
+
+        first = connections_pool.acquire(connect)
+        connections_pool.release(first)
+        second = connections_pool.acquire(connect)
+
+        self.assertIs(first, second)
+        self.assertEqual(connect.call_count, 1)
+        stats = connections_pool.stats()
+        self.assertEqual(stats["size"], 1)
+        self.assertEqual(stats["in_use"], 1)
+        self.assertEqual(stats["acquired"], 2)
+
+    def test_times_out_when_saturated(self):
+        """
+        The test_times_out_when_saturated function tests that acquiring a connection from a full pool waits for the
+        timeout, then fails, and that both the wait and the timeout are counted.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        connections_pool = ConnectionPool(max_size=1, timeout=0.01)
+        connections_pool.acquire(FakeConnection)
+
+        with self.assertRaises(PoolTimeout):
+            connections_pool.acquire(FakeConnection)
+
+        stats = connections_pool.stats()
+        self.assertEqual(stats["saturation"], 1.0)
+        self.assertEqual(stats["waits"], 1)
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertGreater(stats["wait_seconds"], 0)
+
+    def test_waits_for_released_connection(self):
+        """
+        The test_waits_for_released_connection function tests that a thread waiting on a full pool gets the
+        connection released by another thread.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        connections_pool = ConnectionPool(max_size=1, timeout=5)
+        first = connections_pool.acquire(FakeConnection)
+        acquired = []
+
+        waiter = threading.Thread(
+            target=lambda: acquired.append(connections_pool.acquire(FakeConnection))
+        )
+        waiter.start()
+        while not connections_pool.stats()["waiting"]:
+            pass
+        connections_pool.release(first)
+        waiter.join()
+
+        self.assertEqual(acquired, [first])
+        self.assertEqual(connections_pool.stats()["waits"], 1)
+
+    def test_discards_unhealthy_connections(self):
+        """
+        The test_discards_unhealthy_connections function tests that an idle connection failing the health check
+        is closed and replaced by a new one.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        connections_pool = ConnectionPool(
+            max_size=1, timeout=1, check=lambda connection: not connection.closed
+        )
+        first = connections_pool.acquire(FakeConnection)
+        first.closed = True
+        connections_pool.release(first)
+
+        second = connections_pool.acquire(FakeConnection)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(connections_pool.stats()["size"], 1)
+        self.assertEqual(connections_pool.stats()["discarded"], 1)
+
+    def test_checks_only_long_idle_connections(self):
+        """
+        The test_checks_only_long_idle_connections function tests that the health check is skipped for the
+        connections released less than check_idle_seconds ago, and run for the others.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        check = mock.Mock(return_value=True)
+        connections_pool = ConnectionPool(
+            max_size=1, timeout=1, check=check, check_idle_seconds=30
+        )
+        first = connections_pool.acquire(FakeConnection)
+        connections_pool.release(first)
+
+        self.assertIs(connections_pool.acquire(FakeConnection), first)
+        check.assert_not_called()
+
+        connections_pool.release(first)
+        with mock.patch("time.monotonic", return_value=time.monotonic() + 31):
+            self.assertIs(connections_pool.acquire(FakeConnection), first)
+        check.assert_called_once_with(first)
+
+    def test_failed_connect_frees_slot(self):
+        """
+        The test_failed_connect_frees_slot function tests that a connection that could not be opened does not
+        keep its slot of the pool.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        connections_pool = ConnectionPool(max_size=1, timeout=0.01)
+
+        with self.assertRaises(OSError):
+            connections_pool.acquire(mock.Mock(side_effect=OSError))
+
+        self.assertIsInstance(connections_pool.acquire(FakeConnection), FakeConnection)
+
+
+class TestPooledBackend(SimpleTestCase):
+    def test_closes_held_cursors_before_release(self):
+        """
+        The test_closes_held_cursors_before_release function tests that a connection that declared a server-side
+        cursor WITH HOLD closes it before going back to the pool, and that the other ones are released as they are.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        wrapper = DatabaseWrapper(
+            {**connection.settings_dict, "CONN_HEALTH_CHECKS": False}, "pooled"
+        )
+        connections_pool = ConnectionPool(max_size=1, timeout=1)
+        raw = mock.MagicMock(closed=False, autocommit=True)
+        raw.info.transaction_status = 0
+
+        with mock.patch.dict(pool.pools, {"pooled": connections_pool}, clear=True):
+            wrapper.connection = raw
+            with mock.patch(
+                "django.db.backends.postgresql.base.DatabaseWrapper.create_cursor"
+            ):
+                wrapper.create_cursor("iterator")
+            wrapper._close()
+
+            cursor = raw.cursor.return_value.__enter__.return_value
+            cursor.execute.assert_called_once_with("CLOSE ALL")
+            self.assertFalse(wrapper.holds_cursors)
+
+            wrapper.connection = connections_pool.acquire(FakeConnection)
+            wrapper._close()
+
+            cursor.execute.assert_called_once()
+            self.assertEqual(connections_pool.stats()["idle"], 1)
+
+
+class TestReplicaRouter(SimpleTestCase):
+    @override_settings(DATABASE_REPLICAS=["replica_1"])
+    def test_reads_go_to_replica_inside_block(self):
+        """
+        The test_reads_go_to_replica_inside_block function tests that only the reads done inside read_from_replica
+        go to a replica, and that the writes always go to the primary.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        router = ReplicaRouter()
+
+        self.assertIsNone(router.db_for_read(Target))
+        with read_from_replica():
+            self.assertEqual(router.db_for_read(Target), "replica_1")
+            self.assertEqual(router.db_for_write(Target), "default")
+        self.assertIsNone(router.db_for_read(Target))
+
+    def test_reads_stay_on_primary_without_replicas(self):
+        with read_from_replica():
+            self.assertIsNone(ReplicaRouter().db_for_read(Target))
+
+    @override_settings(DATABASE_REPLICAS=["replica_1"])
+    def test_replicas_are_not_migrated(self):
+        router = ReplicaRouter()
+
+        self.assertFalse(router.allow_migrate("replica_1", "core"))
+        self.assertIsNone(router.allow_migrate("default", "core"))
+
+
+class TestDatabase(TestCase):
+    def test_iterate_queryset_in_transaction_when_pooled(self):
+        """
+        The test_iterate_queryset_in_transaction_when_pooled function tests that behind a transaction pooler the
+        rows are read inside a transaction, so the server-side cursor does not outlive it.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        Target.objects.create_target(
+            name="Test", latitude="-5.9241953", longitude="-35.2115504"
+        )
+        queryset = Target.objects.values_list("name", flat=True)
+
+        with mock.patch.dict(connection.settings_dict, TRANSACTION_POOLING=True):
+            with mock.patch("core.db.cursors.transaction.atomic") as atomic:
+                self.assertEqual(list(iterate_queryset(queryset, 100)), ["Test"])
+
+        atomic.assert_called_once_with(using="default")
+
+    def test_database_pools(self):
+        """
+        The test_database_pools function tests that the stats of the connection pools are exposed as JSON.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        connections_pool = ConnectionPool(max_size=4, timeout=1)
+        connections_pool.acquire(FakeConnection)
+
+        with mock.patch.dict(pool.pools, {"default": connections_pool}, clear=True):
+            response = self.client.get(reverse("database-pools"))
+            self.assertEqual(response.json(), get_pool_stats())
+
+        self.assertEqual(response.json()["default"]["in_use"], 1)
+        self.assertEqual(response.json()["default"]["saturation"], 0.25)
@@ -0,0 +1,309 @@
+import asyncio
+import datetime
+import json
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.db import OperationalError
+from django.test import TestCase, override_settings
+
+from core.events import (
+    EXPIRED,
+    REMOVED,
+    RESET,
+    ChangeLogBroker,
+    LocalBroker,
+    load_expired_events,
+    load_logged_events,
+    stream_events,
+)
+from core.models import Target, TargetChange
+
+
+def create_target(**params):
+    """
+    The create_target function creates a target object with the given parameters.
+
+    :param **params: Receive a dictionary of parameters
+    :return: A target object
+    :doc-author: Trelent
+    """
+    default = {"name": "Test", "latitude": "-5.9241953", "longitude": "-35.2115504"}
+    default.update(**params)
+    return Target.objects.create_target(**default)
+
+
+def read_event(message: str):
+    """
+    The read_event function parses a Server-Sent Event back into its name and data.
+
+    :param message: str: The event as sent to the clients
+    :return: A tuple with the name of the event and its data
+    :doc-author: Trelent
+    """
+    name, data = message.strip().split("\n")
+    return name.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+
+class TestEvents(TestCase):
+    async def test_publish_to_subscribers_in_bbox(self):
+        """
+        The test_publish_to_subscribers_in_bbox function tests that a target event is only delivered to the
+        subscribers whose bounding box contains the target, and to those without a bounding box.
+
+        :param self: Represent the instance of the class
+        :return: The events received by each subscriber
+        :doc-author: Trelent
+        """
+        target = await sync_to_async(create_target)()
+        broker = LocalBroker()
+        inside = broker.subscribe((-36.0, -6.0, -35.0, -5.0))
+        outside = broker.subscribe((10.0, 10.0, 20.0, 20.0))
+        everywhere = broker.subscribe()
+
+        await sync_to_async(broker.publish_changes)(
+            TargetChange.UPDATED, [target.id], "default"
+        )
+
+        for subscription in (inside, everywhere):
+            name, data = read_event(await asyncio.wait_for(subscription.get(), 1))
+            self.assertEqual(name, TargetChange.UPDATED)
+            self.assertEqual(data["id"], str(target.id))
+            self.assertEqual(data["target"]["name"], target.name)
+        self.assertTrue(outside.queue.empty())
+
+        for subscription in (inside, outside, everywhere):
+            broker.unsubscribe(subscription)
+        self.assertFalse(broker.has_subscribers())
+        self.assertEqual(broker.tasks, {})
+
+    async def test_publish_removed_to_subscribers_left(self):
+        """
+        The test_publish_removed_to_subscribers_left function tests that when an update moves a target out of a
+        bounding box, the subscribers of that box get a removed event, read from the position recorded in the
+        change log, while the subscribers of the box it moved into get the update.
+
+        :param self: Represent the instance of the class
+        :return: The events received by each subscriber
+        :doc-author: Trelent
+        """
+        target = await sync_to_async(create_target)()
+        since = await sync_to_async(TargetChange.objects.get_last_position)()
+        broker = LocalBroker()
+        left = broker.subscribe((-36.0, -6.0, -35.0, -5.0))
+        entered = broker.subscribe((10.0, 10.0, 20.0, 20.0))
+        elsewhere = broker.subscribe((-80.0, -40.0, -70.0, -30.0))
+
+        target.latitude, target.longitude = "15", "15"
+        await sync_to_async(target.save)()
+        _, events = await sync_to_async(load_logged_events)(since)
+        broker.publish(events)
+
+        name, data = read_event(await asyncio.wait_for(left.get(), 1))
+        self.assertEqual(
+            (name, data["id"], data["target"]), (REMOVED, str(target.id), None)
+        )
+        name, data = read_event(await asyncio.wait_for(entered.get(), 1))
+        self.assertEqual(
+            (name, data["target"]["latitude"]), (TargetChange.UPDATED, "15")
+        )
+        self.assertTrue(elsewhere.queue.empty())
+
+        for subscription in (left, entered, elsewhere):
+            broker.unsubscribe(subscription)
+
+    async def test_publish_deleted_targets_to_every_subscriber(self):
+        """
+        The test_publish_deleted_targets_to_every_subscriber function tests that the events of targets that do not
+        exist anymore are delivered as deletions to every subscriber, since their position is not known.
+
+        :param self: Represent the instance of the class
+        :return: The event received by the subscriber
+        :doc-author: Trelent
+        """
+        target = await sync_to_async(create_target)()
+        await target.adelete()
+        broker = LocalBroker()
+        subscription = broker.subscribe((10.0, 10.0, 20.0, 20.0))
+
+        await sync_to_async(broker.publish_changes)(
+            TargetChange.UPDATED, [target.id], "default"
+        )
+
+        name, data = read_event(await asyncio.wait_for(subscription.get(), 1))
+        self.assertEqual(name, TargetChange.DELETED)
+        self.assertIsNone(data["target"])
+        broker.unsubscribe(subscription)
+
+    @override_settings(TARGETS_EVENTS_POLL_INTERVAL=0.01)
+    async def test_poll_changes_after_database_error(self):
+        """
+        The test_poll_changes_after_database_error function tests that a poll of the change log failing does not
+        stop the broker: the error is logged, the connections are checked, and the changes written meanwhile are
+        still published. A broker task that stopped anyway is started again by the next subscriber.
+
+        :param self: Represent the instance of the class
+        :return: The event received by the subscriber
+        :doc-author: Trelent
+        """
+        broker = ChangeLogBroker()
+        failed = []
+
+        def load_once_failing(since):
+            if not failed:
+                failed.append(since)
+                raise OperationalError("server closed the connection unexpectedly")
+            return load_logged_events(since)
+
+        with mock.patch(
+            "core.events.load_logged_events", side_effect=load_once_failing
+        ), mock.patch("core.events.close_old_connections") as close_connections:
+            with self.assertLogs("core.events", "ERROR"):
+                subscription = broker.subscribe()
+                while not close_connections.called:
+                    await asyncio.sleep(0.01)
+            target = await sync_to_async(create_target)()
+
+            name, data = read_event(await asyncio.wait_for(subscription.get(), 2))
+
+        self.assertEqual((name, data["id"]), (TargetChange.CREATED, str(target.id)))
+        close_connections.assert_called_once_with()
+
+        task = broker.tasks[subscription.loop]
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        other = broker.subscribe()
+        self.assertIsNot(broker.tasks[subscription.loop], task)
+        for each in (subscription, other):
+            broker.unsubscribe(each)
+
+    @override_settings(TARGETS_EVENTS_QUEUE_SIZE=1)
+    async def test_slow_subscriber_is_dropped(self):
+        """
+        The test_slow_subscriber_is_dropped function tests that a subscriber whose queue is full is closed instead
+        of buffering more events.
+
+        :param self: Represent the instance of the class
+        :return: The subscription after the queue overflowed
+        :doc-author: Trelent
+        """
+        broker = LocalBroker()
+        subscription = broker.subscribe()
+
+        subscription.deliver("first")
+        subscription.deliver("second")
+
+        self.assertTrue(subscription.closed)
+        self.assertIsNone(await subscription.get())
+        broker.unsubscribe(subscription)
+
+    async def test_stream_events(self):
+        """
+        The test_stream_events function tests that the event stream subscribes the client once it starts, sends the
+        published events and unsubscribes the client once it is closed.
+
+        :param self: Represent the instance of the class
+        :return: The chunks of the stream
+        :doc-author: Trelent
+        """
+        target = await sync_to_async(create_target)()
+        broker = LocalBroker()
+        stream = stream_events(broker)
+
+        self.assertTrue((await anext(stream)).startswith("retry: "))
+        self.assertTrue(broker.has_subscribers())
+
+        await sync_to_async(broker.publish_changes)(
+            TargetChange.CREATED, [target.id], "default"
+        )
+        name, data = read_event(await asyncio.wait_for(anext(stream), 1))
+        self.assertEqual(name, TargetChange.CREATED)
+        self.assertEqual(data["id"], str(target.id))
+
+        await stream.aclose()
+        self.assertFalse(broker.has_subscribers())
+
+    def test_notify_without_subscribers(self):
+        """
+        The test_notify_without_subscribers function tests that writes do not schedule any work to publish their
+        events when nobody is subscribed.
+
+        :param self: Represent the instance of the class
+        :return: The callbacks scheduled by the notification
+        :doc-author: Trelent
+        """
+        target = create_target()
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            LocalBroker().notify(TargetChange.UPDATED, [target.id])
+
+        self.assertEqual(callbacks, [])
+
+    def test_load_logged_events(self):
+        """
+        The test_load_logged_events function tests that the change log is read into one event per target, with the
+        last change of each target.
+
+        :param self: Represent the instance of the class
+        :return: The events read from the change log
+        :doc-author: Trelent
+        """
+        updated = create_target(name="Updated")
+        updated.name = "Renamed"
+        updated.save()
+        deleted_id = create_target(name="Deleted").id
+        Target.objects.filter(id=deleted_id).delete()
+
+        since, events = load_logged_events((0, 0))
+
+        self.assertEqual(since, TargetChange.objects.get_last_position())
+        self.assertEqual(
+            {(event.action, event.target_id) for event in events},
+            {
+                (TargetChange.UPDATED, str(updated.id)),
+                (TargetChange.DELETED, str(deleted_id)),
+            },
+        )
+        self.assertEqual(load_logged_events(since), (since, []))
+
+    @override_settings(TARGETS_CHANGES_PAGE_SIZE=2)
+    def test_load_logged_events_past_the_limit(self):
+        """
+        The test_load_logged_events_past_the_limit function tests that a backlog longer than
+        TARGETS_CHANGES_PAGE_SIZE is skipped with a single reset event, instead of being replayed.
+
+        :param self: Represent the instance of the class
+        :return: The events read from the change log
+        :doc-author: Trelent
+        """
+        for _ in range(3):
+            create_target()
+
+        since, events = load_logged_events((0, 0))
+
+        self.assertEqual(since, TargetChange.objects.get_last_position())
+        self.assertEqual([event.action for event in events], [RESET])
+        self.assertEqual(read_event(events[0].message)[0], RESET)
+        self.assertEqual(load_logged_events(since), (since, []))
+
+    def test_load_expired_events(self):
+        """
+        The test_load_expired_events function tests that the targets expiring on a date are published as expired
+        events, with their position.
+
+        :param self: Represent the instance of the class
+        :return: The expired events
+        :doc-author: Trelent
+        """
+        today = datetime.date.today()
+        expired = Target.objects.create(
+            name="Expired", latitude="10", longitude="20", expiration_date=today
+        )
+        create_target()
+
+        events = load_expired_events(today)
+
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].action, EXPIRED)
+        self.assertEqual(events[0].target_id, str(expired.id))
+        self.assertEqual((events[0].lat, events[0].lng), (10.0, 20.0))
@@ -0,0 +1,143 @@
+import copy
+import re
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from core.cache import get_targets_cache
+from core.db import pool
+from core.db.pool import ConnectionPool
+from core.metrics import REQUEST_QUERIES, Histogram, render_metrics
+from core.models import Target
+
+
+class TestHistogram(SimpleTestCase):
+    def test_render(self):
+        """
+        The test_render function tests that a histogram is rendered in the Prometheus text format, with cumulative
+        buckets and escaped label values.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        histogram = Histogram("latency", "Latency.", (0.1, 1), ("view",))
+        histogram.observe(0.05, 'say "hi"')
+        histogram.observe(0.1, 'say "hi"')
+        histogram.observe(5, 'say "hi"')
+
+        self.assertEqual(
+            list(histogram.render()),
+            [
+                "# HELP latency Latency.",
+                "# TYPE latency histogram",
+                'latency_bucket{view="say \\"hi\\"",le="0.1"} 2',
+                'latency_bucket{view="say \\"hi\\"",le="1"} 2',
+                'latency_bucket{view="say \\"hi\\"",le="+Inf"} 3',
+                'latency_sum{view="say \\"hi\\""} 5.15',
+                'latency_count{view="say \\"hi\\""} 3',
+            ],
+        )
+
+    def test_render_pools(self):
+        connections_pool = ConnectionPool(max_size=4, timeout=1)
+        connections_pool.acquire(object)
+
+        with mock.patch.dict(pool.pools, {"default": connections_pool}, clear=True):
+            rendered = render_metrics()
+
+        self.assertIn('db_pool_in_use{database="default"} 1', rendered)
+        self.assertIn("# TYPE db_pool_timeouts_total counter", rendered)
+
+
+class TestMetricsMiddleware(TestCase):
+    def setUp(self):
+        Target.objects.create_target(
+            name="Test", latitude="-5.9241953", longitude="-35.2115504"
+        )
+
+    @override_settings(TARGETS_CACHE_TIMEOUT=0)
+    def test_sampled_request(self):
+        """
+        The test_sampled_request function tests that a sampled request reports its SQL queries in the Server-Timing
+        header, and that its metrics are served at /metrics under the name of its view.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        res = self.client.get(reverse("target:target-list"))
+
+        self.assertIn('db;desc="queries: 1"', res["Server-Timing"])
+        self.assertIn("serialize;dur=", res["Server-Timing"])
+        self.assertIn("total;dur=", res["Server-Timing"])
+
+        res = self.client.get(reverse("metrics"))
+        metrics = res.content.decode()
+        self.assertTrue(res["Content-Type"].startswith("text/plain; version=0.0.4"))
+        self.assertIn(
+            'http_request_duration_seconds_count{view="target:target-list",method="GET",status="200"}',
+            metrics,
+        )
+        self.assertIn(
+            'http_response_size_bytes_count{view="target:target-list"}', metrics
+        )
+        self.assertIn(
+            'serializer_duration_seconds_count{view="target:target-list"}', metrics
+        )
+
+    def test_response_cache_counters(self):
+        """
+        The test_response_cache_counters function tests that the hits and misses of the response cache are served
+        at /metrics.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+
+        def read_counters():
+            metrics = self.client.get(reverse("metrics")).content.decode()
+            return {
+                outcome: float(
+                    re.search(
+                        rf"^targets_response_cache_{outcome}_total (\S+)$",
+                        metrics,
+                        re.MULTILINE,
+                    ).group(1)
+                )
+                for outcome in ("hits", "misses")
+            }
+
+        get_targets_cache().clear()
+        before = read_counters()
+
+        for _ in range(2):
+            self.client.get(reverse("target:target-list"))
+
+        after = read_counters()
+        self.assertEqual(after["hits"] - before["hits"], 1)
+        self.assertEqual(after["misses"] - before["misses"], 1)
+
+    @override_settings(METRICS_SAMPLE_RATE=0)
+    def test_request_not_sampled(self):
+        """
+        The test_request_not_sampled function tests that the requests left out by the sample rate are not measured.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        series = copy.deepcopy(REQUEST_QUERIES.series)
+
+        res = self.client.get(reverse("target:target-list"))
+
+        self.assertNotIn("Server-Timing", res)
+        self.assertEqual(REQUEST_QUERIES.series, series)
+
+    @override_settings(METRICS_SERVER_TIMING=False)
+    def test_server_timing_disabled(self):
+        res = self.client.get(reverse("target:target-list"))
+
+        self.assertNotIn("Server-Timing", res)
@@ -1,9 +1,10 @@
 import datetime
+import random
 
 from django.test import TestCase
 
-from core.models import Target
-from core.utils import get_expiration_date_default
+from core.models import Target, TargetChange
+from core.utils import get_expiration_date_default, haversine_km
 
 
 class TestModels(TestCase):
@@ -62,6 +63,38 @@ class TestModels(TestCase):
             str(exception), "Expiration Date must be at least one day ahead."
         )
 
+    def test_create_target_with_expiration_date_string(self):
+        """
+        The test_create_target_with_expiration_date_string function tests that create_target accepts the expiration
+        date written as YYYY-MM-DD, as the API sends it, and rejects it with a ValueError when it is not a date.
+
+        :param self: Refer to the object itself
+        :return: The created target and the error message of the invalid date
+        :doc-author: Trelent
+        """
+        expiration_date = get_expiration_date_default() + datetime.timedelta(days=1)
+
+        target = Target.objects.create_target(
+            name="Testing",
+            latitude="-5.9241953",
+            longitude="-35.2115504",
+            expiration_date=expiration_date.isoformat(),
+        )
+
+        target.refresh_from_db()
+        self.assertEqual(target.expiration_date, expiration_date)
+        for value, message in (
+            ("tomorrow", "Expiration Date must be written as YYYY-MM-DD."),
+            (1, "Expiration Date must be a date."),
+        ):
+            with self.assertRaisesMessage(ValueError, message):
+                Target.objects.create_target(
+                    name="Testing",
+                    latitude="-5.9241953",
+                    longitude="-35.2115504",
+                    expiration_date=value,
+                )
+
     def test_create_target_without_name(self):
         """
         The test_create_target_without_name function tests the create_target function in the Target model.
@@ -118,3 +151,258 @@ class TestModels(TestCase):
 
         exception = cm.exception
         self.assertEqual(str(exception), "Longitude must be provided.")
+
+    def test_create_target_with_invalid_latitude(self):
+        """
+        The test_create_target_with_invalid_latitude function tests the create_target function in the Target model
+        manager.
+        It checks that a ValueError is raised when the latitude is not a number between -90 and 90.
+
+        :param self: Represent the instance of the class
+        :return: A valueerror exception
+        :doc-author: Trelent
+        """
+        for latitude in ("north", "91"):
+            with self.assertRaises(ValueError) as cm:
+                Target.objects.create_target(
+                    name="Teste",
+                    latitude=latitude,
+                    longitude="-35.2115504",
+                )
+
+            exception = cm.exception
+            self.assertEqual(
+                str(exception), "Latitude must be a number between -90 and 90."
+            )
+
+    def test_create_target_fills_numeric_coordinates(self):
+        """
+        The test_create_target_fills_numeric_coordinates function tests that the numeric lat/lng columns are filled
+        from the latitude and longitude strings, both on creation and when the target is updated.
+
+        :param self: Represent the instance of the class
+        :return: The numeric coordinates of the target
+        :doc-author: Trelent
+        """
+        target = Target.objects.create_target(
+            name="Testing", latitude="-5.9241953", longitude="-35.2115504"
+        )
+
+        self.assertEqual(target.lat, -5.9241953)
+        self.assertEqual(target.lng, -35.2115504)
+
+        target.latitude = "10.5"
+        target.save(update_fields=["latitude"])
+        target.refresh_from_db()
+
+        self.assertEqual(target.lat, 10.5)
+
+    def test_filter_targets_in_bbox(self):
+        """
+        The test_filter_targets_in_bbox function tests the in_bbox queryset function.
+        It creates targets inside and outside of a box, including a box that crosses the antimeridian, and asserts that
+        only the targets inside the box are returned.
+
+        :param self: Represent the instance of the class
+        :return: The targets inside the bounding box
+        :doc-author: Trelent
+        """
+        inside = Target.objects.create_target(
+            name="Inside", latitude="-5.9", longitude="-35.2"
+        )
+        Target.objects.create_target(
+            name="Outside", latitude="-23.5", longitude="-46.6"
+        )
+        east = Target.objects.create_target(
+            name="East", latitude="10", longitude="179.5"
+        )
+        west = Target.objects.create_target(
+            name="West", latitude="10", longitude="-179.5"
+        )
+
+        self.assertEqual(
+            list(Target.objects.in_bbox(-36, -6, -35, -5)),
+            [inside],
+        )
+        self.assertEqual(
+            set(Target.objects.in_bbox(179, 0, -179, 20)),
+            {east, west},
+        )
+
+    def test_nearest_targets(self):
+        """
+        The test_nearest_targets function tests that the nearest queryset function returns the same targets as
+        sorting every target by distance, for points in dense and sparse areas and near the antimeridian, and that
+        the radius limits the returned targets.
+
+        :param self: Represent the instance of the class
+        :return: The nearest targets of a few points
+        :doc-author: Trelent
+        """
+        generator = random.Random(7)
+        points = [
+            (
+                -5.8 + generator.uniform(-0.05, 0.05),
+                -35.2 + generator.uniform(-0.05, 0.05),
+            )
+            for _ in range(60)
+        ]
+        points += [
+            (generator.uniform(-80, 80), generator.uniform(-180, 180))
+            for _ in range(60)
+        ]
+        points += [(10.0, 179.9), (10.0, -179.9)]
+        Target.objects.bulk_create_targets(
+            {"name": f"Target {index}", "latitude": str(lat), "longitude": str(lng)}
+            for index, (lat, lng) in enumerate(points)
+        )
+        targets = list(Target.objects.all())
+
+        for lat, lng, k in ((-5.8, -35.2, 5), (10.0, -179.95, 3), (45.0, 90.0, 10)):
+            expected = sorted(
+                targets,
+                key=lambda target: haversine_km(lat, lng, target.lat, target.lng),
+            )[:k]
+
+            nearest = Target.objects.nearest(lat, lng, k)
+
+            self.assertEqual(nearest, expected)
+            self.assertEqual(
+                [target.distance_km for target in nearest],
+                [haversine_km(lat, lng, target.lat, target.lng) for target in expected],
+            )
+
+        nearest = Target.objects.nearest(10.0, -179.95, 10, radius_km=50)
+        self.assertEqual(
+            {target.name for target in nearest}, {"Target 120", "Target 121"}
+        )
+
+    def test_nearest_targets_are_live(self):
+        """
+        The test_nearest_targets_are_live function tests that the nearest function can be chained to live, so
+        the expired targets are left out.
+
+        :param self: Represent the instance of the class
+        :return: The nearest live targets
+        :doc-author: Trelent
+        """
+        live = Target.objects.create_target(
+            name="Live", latitude="-5.9", longitude="-35.2"
+        )
+        Target.objects.create(
+            name="Expired",
+            latitude="-5.9",
+            longitude="-35.2",
+            expiration_date=datetime.date.today(),
+        )
+
+        self.assertEqual(Target.objects.live().nearest(-5.9, -35.2, 5), [live])
+
+    def test_bulk_create_targets(self):
+        """
+        The test_bulk_create_targets function tests the bulk_create_targets function in the Target model manager.
+        It asserts that the valid targets are created in batches and that the invalid ones are reported by index.
+
+        :param self: Represent the instance of the class
+        :return: The created targets and the errors
+        :doc-author: Trelent
+        """
+        items = [
+            {"name": "First", "latitude": "-5.9", "longitude": "-35.2"},
+            {"name": "Second", "latitude": "north", "longitude": "-35.2"},
+            {"name": "Third", "latitude": "-5.8", "longitude": "-35.1"},
+            {"name": "Fourth", "latitude": "-5.7", "longitude": "-35.0", "id": 1},
+        ]
+
+        created, errors = Target.objects.bulk_create_targets(items, batch_size=1)
+
+        self.assertEqual([target.name for target in created], ["First", "Third"])
+        self.assertEqual(
+            errors,
+            {
+                1: "Latitude must be a number between -90 and 90.",
+                3: "Unknown fields: id.",
+            },
+        )
+        self.assertEqual(Target.objects.filter(lat__isnull=False).count(), 2)
+
+    def test_bulk_update_and_delete_targets(self):
+        """
+        The test_bulk_update_and_delete_targets function tests the bulk_update_targets and bulk_delete_targets
+        functions of the Target queryset.
+
+        :param self: Represent the instance of the class
+        :return: The updated targets and the amount of deleted targets
+        :doc-author: Trelent
+        """
+        first = Target.objects.create_target(
+            name="First", latitude="-5.9", longitude="-35.2"
+        )
+        second = Target.objects.create_target(
+            name="Second", latitude="-5.8", longitude="-35.1"
+        )
+
+        updated, errors = Target.objects.bulk_update_targets(
+            [
+                {"id": first.id, "longitude": "-36"},
+                {"id": second.id, "name": ""},
+                {"id": "not-an-id", "name": "Missing"},
+            ]
+        )
+
+        self.assertEqual(updated, [first])
+        self.assertEqual(errors, {1: "Name must be provided.", 2: "Target not found."})
+        first.refresh_from_db()
+        self.assertEqual(first.lng, -36)
+
+        deleted = Target.objects.bulk_delete_targets(
+            [first.id, second.id], batch_size=1
+        )
+
+        self.assertEqual(deleted, 2)
+        self.assertFalse(Target.objects.exists())
+
+    def test_target_ids_are_time_ordered(self):
+        """
+        The test_target_ids_are_time_ordered function tests that the targets get UUIDv7 primary keys, so listing
+        them by key returns them in creation order.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        names = [f"Target {index}" for index in range(5)]
+        for name in names:
+            Target.objects.create_target(name=name, latitude="-5.9", longitude="-35.2")
+
+        self.assertEqual(Target.objects.first().id.version, 7)
+        self.assertEqual(
+            list(Target.objects.order_by("id").values_list("name", flat=True)), names
+        )
+
+    def test_change_log_is_read_in_commit_order(self):
+        """
+        The test_change_log_is_read_in_commit_order function tests that the change log is read by transaction id,
+        so an entry that took a lower id but committed after the entries of a newer transaction is still read after
+        the position of those.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        target = Target.objects.create_target(
+            name="Target", latitude="-5.9", longitude="-35.2"
+        )
+        TargetChange.objects.all().delete()
+        late = TargetChange.objects.create(
+            target_id=target.id, action=TargetChange.UPDATED, transaction_id=11
+        )
+        early = TargetChange.objects.create(
+            target_id=target.id, action=TargetChange.UPDATED, transaction_id=10
+        )
+
+        position = TargetChange.objects.get_last_position()
+        self.assertEqual(position, (11, late.id))
+        self.assertEqual(list(TargetChange.objects.after((0, 0))), [early, late])
+        self.assertEqual(list(TargetChange.objects.after((10, early.id))), [late])
+        self.assertEqual(list(TargetChange.objects.after(position)), [])
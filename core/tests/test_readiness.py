@@ -0,0 +1,110 @@
+from unittest import mock
+
+from psycopg2 import OperationalError as Psycopg2OpError
+
+from django.db import connection
+from django.db.utils import OperationalError
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from core import readiness
+from core.metrics import render_metrics
+from core.readiness import probe_database, warm_up
+
+
+class TestProbeDatabase(SimpleTestCase):
+    def test_unavailable(self):
+        """
+        The test_unavailable function tests that the probe reports a database refusing connections, whether Django
+        wrapped the error of the driver or not, and closes the connection.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        for error in (OperationalError, Psycopg2OpError):
+            with mock.patch.object(connection, "ensure_connection", side_effect=error):
+                with mock.patch.object(connection, "close") as close:
+                    self.assertFalse(probe_database())
+            close.assert_called_once_with()
+
+
+class TestReadiness(TestCase):
+    def setUp(self):
+        state = {"ready": False, "boot_seconds": None, "steps": {}}
+        patcher = mock.patch.dict(readiness.readiness_state, state)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_healthz(self):
+        res = self.client.get(reverse("healthz"))
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json(), {"status": "ok"})
+
+    def test_readyz_before_warm_up(self):
+        """
+        The test_readyz_before_warm_up function tests that a process whose warm-up could not reach the database is
+        not ready, and that the readiness probes retry the warm-up until the database answers.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        with mock.patch(
+            "core.readiness.probe_database", return_value=False
+        ), self.assertLogs("core.readiness", "WARNING"):
+            self.assertIsNone(warm_up())
+            res = self.client.get(reverse("readyz"))
+
+        self.assertFalse(readiness.readiness_state["ready"])
+        self.assertNotIn("database", readiness.readiness_state["steps"])
+        self.assertEqual(res.status_code, 503)
+        self.assertEqual(res.json()["status"], "unavailable")
+
+        warm_up_urls = mock.Mock()
+        with mock.patch.dict(
+            readiness.WARM_UP_STEPS, {"urls": warm_up_urls}
+        ), self.assertLogs("core.readiness", "INFO"):
+            res = self.client.get(reverse("readyz"))
+
+        warm_up_urls.assert_not_called()
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.json()["warmed_up"])
+
+    def test_readyz_after_warm_up(self):
+        """
+        The test_readyz_after_warm_up function tests that a process is ready once it warmed up, reports its
+        boot-to-ready time, and is not ready anymore when its database stops answering.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        with self.assertLogs("core.readiness", "INFO") as logs:
+            boot_seconds = warm_up()
+
+        self.assertIn("Ready", logs.output[0])
+        self.assertEqual(
+            set(readiness.readiness_state["steps"]), {"urls", "serializers", "database"}
+        )
+        self.assertIn(f"process_boot_seconds {boot_seconds}", render_metrics())
+
+        res = self.client.get(reverse("readyz"))
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(
+            res.json(),
+            {
+                "status": "ready",
+                "warmed_up": True,
+                "database": True,
+                "boot_seconds": boot_seconds,
+            },
+        )
+
+        with mock.patch("core.views.probe_database", return_value=False):
+            res = self.client.get(reverse("readyz"))
+
+        self.assertEqual(res.status_code, 503)
+        self.assertFalse(res.json()["database"])
@@ -0,0 +1,143 @@
+import datetime
+import os
+import random
+import tempfile
+import uuid
+
+from django.test import TestCase, override_settings
+
+from core.cache import bump_generation
+from core.models import Target
+from core.snapshot import (
+    COLUMNS,
+    TargetSnapshot,
+    build_snapshot,
+    get_current_snapshot,
+    load_snapshot,
+)
+
+
+class TestSnapshot(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "targets.snapshot")
+
+    def create_targets(self):
+        targets, _ = Target.objects.bulk_create_targets(
+            [
+                {"name": "Natal", "latitude": "-5.79", "longitude": "-35.2"},
+                {"name": "Fiji", "latitude": "-17.7", "longitude": "179.9"},
+                {"name": "Samoa", "latitude": "-13.8", "longitude": "-171.7"},
+            ]
+        )
+        return targets
+
+    def test_build(self):
+        """
+        The test_build function tests that a snapshot holds the same rows as the database, in order of id, and
+        finds each target by id.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        self.create_targets()
+
+        count, _ = build_snapshot(self.path)
+        snapshot = TargetSnapshot(self.path)
+
+        expected = list(Target.objects.order_by("id").values_list(*COLUMNS))
+        self.assertEqual(count, 3)
+        self.assertEqual(list(snapshot.rows(COLUMNS)), expected)
+        for index, row in enumerate(expected):
+            self.assertEqual(snapshot.find(row[0]), index)
+        self.assertIsNone(snapshot.find(uuid.uuid4()))
+
+    def test_rows_in_bbox(self):
+        """
+        The test_rows_in_bbox function tests that the rows of a snapshot are filtered by a viewport like in_bbox
+        does, also when it crosses the antimeridian, and that the expired targets are left out.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        _, fiji, _ = self.create_targets()
+        build_snapshot(self.path)
+        snapshot = TargetSnapshot(self.path)
+
+        self.assertEqual(
+            list(snapshot.rows(["name"], (170, -20, -170, -10))),
+            [("Fiji",), ("Samoa",)],
+        )
+        self.assertEqual(
+            list(snapshot.rows(["name"], (-36, -6, -35, -5))), [("Natal",)]
+        )
+
+        tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+        index = snapshot.find(fiji.id)
+        self.assertTrue(snapshot.is_live(index))
+        self.assertFalse(snapshot.is_live(index, tomorrow.toordinal()))
+
+    def test_rows_in_bbox_match_the_database(self):
+        """
+        The test_rows_in_bbox_match_the_database function tests that the targets read from the lat order of a
+        snapshot are the ones the database finds in each viewport, including the targets without coordinates.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        random.seed(7)
+        items = [
+            {
+                "name": f"Target {index}",
+                "latitude": f"{random.uniform(-90, 90):.4f}",
+                "longitude": f"{random.uniform(-180, 180):.4f}",
+            }
+            for index in range(200)
+        ]
+        targets, _ = Target.objects.bulk_create_targets(items)
+        Target.objects.filter(id=targets[0].id).update(lat=None, lng=None)
+        build_snapshot(self.path)
+        snapshot = TargetSnapshot(self.path)
+
+        for bbox in ((-10, -20, 30, 40), (170, -90, -170, 90), (0, 10, 1, 5)):
+            with self.subTest(bbox=bbox):
+                expected = Target.objects.live().in_bbox(*bbox).values_list("id")
+                self.assertCountEqual(snapshot.rows(["id"], bbox), expected)
+
+    def test_swap_on_rebuild(self):
+        """
+        The test_swap_on_rebuild function tests that the current snapshot is only used at the generation it was
+        built at, and that the workers map the new file once it is rebuilt.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        self.create_targets()
+        build_snapshot(self.path)
+
+        with override_settings(TARGETS_SNAPSHOT_PATH=self.path):
+            first = get_current_snapshot()
+            self.assertEqual(first.count, 3)
+
+            bump_generation()
+            self.assertIsNone(get_current_snapshot())
+
+            build_snapshot(self.path)
+            second = get_current_snapshot()
+
+        self.assertIsNot(first, second)
+        self.assertGreater(second.generation, first.generation)
+        self.assertEqual(list(first.rows(["name"])), list(second.rows(["name"])))
+
+    def test_invalid_file(self):
+        with open(self.path, "wb") as file:
+            file.write(b"not a snapshot" * 10)
+
+        with self.assertLogs("core.snapshot", "WARNING"):
+            self.assertIsNone(load_snapshot(self.path))
+        self.assertIsNone(load_snapshot(self.path + ".missing"))
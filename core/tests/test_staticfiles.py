@@ -0,0 +1,146 @@
+import os
+import tempfile
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.staticfiles import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    static_files_middleware,
+)
+
+STYLESHEET = "body { color: red; }\n" * 100
+
+
+class TestStaticFiles(SimpleTestCase):
+    def setUp(self):
+        """
+        The setUp function collects a stylesheet and an image into a temporary STATIC_ROOT, with the storage of
+        the project, and builds the static files middleware over it.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        source = tempfile.TemporaryDirectory()
+        self.addCleanup(source.cleanup)
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        os.mkdir(os.path.join(source.name, "css"))
+        with open(os.path.join(source.name, "css", "app.css"), "w") as file:
+            file.write(STYLESHEET)
+        with open(os.path.join(source.name, "logo.png"), "wb") as file:
+            file.write(os.urandom(256))
+
+        settings = override_settings(
+            DEBUG=False,
+            STATIC_ROOT=root.name,
+            STATICFILES_DIRS=[source.name],
+            STATICFILES_FINDERS=["django.contrib.staticfiles.finders.FileSystemFinder"],
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        call_command("collectstatic", interactive=False, verbosity=0)
+
+        self.root = root.name
+        self.hashed_url = staticfiles_storage.url("css/app.css")
+        self.middleware = static_files_middleware(lambda request: HttpResponse("view"))
+        self.factory = RequestFactory()
+
+    def test_collect(self):
+        """
+        The test_collect function tests that collectstatic stores the files under hashed names, with the brotli and
+        gzip variants of the text files only.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        hashed_name = self.hashed_url.removeprefix("/static/")
+
+        self.assertRegex(hashed_name, r"^css/app\.[0-9a-f]{12}\.css$")
+        for name in (hashed_name, "css/app.css"):
+            for suffix in ("", ".br", ".gz"):
+                self.assertTrue(os.path.exists(os.path.join(self.root, name + suffix)))
+        self.assertFalse(os.path.exists(os.path.join(self.root, "logo.png.gz")))
+
+    def test_serve_compressed(self):
+        """
+        The test_serve_compressed function tests that a hashed file is served in the best encoding the client
+        accepts, cached forever.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        for accept_encoding, encoding in (
+            ("gzip, deflate, br", "br"),
+            ("gzip, br;q=0", "gzip"),
+            ("", None),
+        ):
+            with self.subTest(accept_encoding=accept_encoding):
+                request = self.factory.get(
+                    self.hashed_url, HTTP_ACCEPT_ENCODING=accept_encoding
+                )
+
+                res = self.middleware(request)
+
+                self.assertEqual(res.status_code, 200)
+                self.assertEqual(res.get("Content-Encoding"), encoding)
+                self.assertEqual(res["Cache-Control"], IMMUTABLE_CACHE_CONTROL)
+                self.assertEqual(res["Vary"], "Accept-Encoding")
+                self.assertTrue(res["Content-Type"].startswith("text/css"))
+                if encoding is None:
+                    self.assertEqual(res.content.decode(), STYLESHEET)
+                else:
+                    self.assertLess(len(res.content), len(STYLESHEET) / 10)
+
+    def test_not_modified(self):
+        """
+        The test_not_modified function tests that a file the client already has is answered with a 304, and that
+        the files collected under their own names are revalidated.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        res = self.middleware(
+            self.factory.get("/static/css/app.css", HTTP_ACCEPT_ENCODING="gzip")
+        )
+        self.assertEqual(res["Cache-Control"], REVALIDATE_CACHE_CONTROL)
+
+        res = self.middleware(
+            self.factory.get(
+                "/static/css/app.css",
+                HTTP_ACCEPT_ENCODING="gzip",
+                HTTP_IF_NONE_MATCH=res["ETag"],
+            )
+        )
+
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res.content, b"")
+
+    def test_other_requests(self):
+        """
+        The test_other_requests function tests that the requests for other paths, or with other methods, go on to
+        the views.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        for request in (
+            self.factory.get("/static/missing.css"),
+            self.factory.get("/api/target/"),
+            self.factory.post(self.hashed_url),
+        ):
+            self.assertEqual(self.middleware(request).content, b"view")
+
+    def test_not_collected(self):
+        with override_settings(STATIC_ROOT=os.path.join(self.root, "missing")):
+            with self.assertRaises(MiddlewareNotUsed):
+                static_files_middleware(lambda request: HttpResponse())
@@ -1,8 +1,19 @@
 import datetime
+import math
+import time
+from unittest import mock
 
 from django.test import SimpleTestCase
 
-from core.utils import get_expiration_date_default
+from core import utils
+from core.utils import (
+    UUID7_COUNTER_MAX,
+    bbox_around,
+    bbox_contains,
+    get_expiration_date_default,
+    haversine_km,
+    uuid7,
+)
 
 
 class TestUtils(SimpleTestCase):
@@ -22,3 +33,92 @@ class TestUtils(SimpleTestCase):
         )
 
         self.assertEqual(after_tomorrow_date, default_date)
+
+    def test_haversine_km(self):
+        """
+        The test_haversine_km function tests the great-circle distance between known points.
+
+        :param self: Represent the instance of the class
+        :return: The distances in kilometers
+        :doc-author: Trelent
+        """
+        self.assertEqual(haversine_km(-5.79, -35.2, -5.79, -35.2), 0)
+        self.assertAlmostEqual(haversine_km(0, 0, 0, 1), 111.195, places=2)
+        self.assertAlmostEqual(haversine_km(0, 179.5, 0, -179.5), 111.195, places=2)
+        self.assertAlmostEqual(haversine_km(90, 0, -90, 0), 20015.1, places=0)
+
+    def test_bbox_around(self):
+        """
+        The test_bbox_around function tests that the box around a point contains the points at the given distance
+        in every direction, crossing the antimeridian and reaching the poles when needed.
+
+        :param self: Represent the instance of the class
+        :return: The boxes around a few points
+        :doc-author: Trelent
+        """
+        for lat, lng in ((-5.79, -35.2), (60.0, 179.9), (-45.0, -179.95)):
+            bbox = bbox_around(lat, lng, 50)
+            for bearing in range(0, 360, 15):
+                # Moves 49.9 km from the point towards the bearing, on the sphere.
+                angle = 49.9 / 6371.0088
+                phi = math.radians(lat)
+                theta = math.radians(bearing)
+                target_phi = math.asin(
+                    math.sin(phi) * math.cos(angle)
+                    + math.cos(phi) * math.sin(angle) * math.cos(theta)
+                )
+                target_lambda = math.radians(lng) + math.atan2(
+                    math.sin(theta) * math.sin(angle) * math.cos(phi),
+                    math.cos(angle) - math.sin(phi) * math.sin(target_phi),
+                )
+                target_lat = math.degrees(target_phi)
+                target_lng = (math.degrees(target_lambda) + 540) % 360 - 180
+                self.assertTrue(bbox_contains(bbox, target_lat, target_lng))
+
+        min_lng, min_lat, max_lng, max_lat = bbox_around(89.9, 10, 50)
+        self.assertEqual((min_lng, max_lng, max_lat), (-180.0, 180.0, 90.0))
+        self.assertAlmostEqual(min_lat, 89.45, places=2)
+
+    def test_uuid7(self):
+        """
+        The test_uuid7 function tests that uuid7 generates version 7 UUIDs starting with the current Unix time in
+        milliseconds, which sort in the order they were generated.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        before = time.time_ns() // 1_000_000
+        # Other tests may have frozen the clock in the future, which the keys never go back from.
+        with mock.patch.dict(utils.uuid7_state, {"ms": 0, "counter": 0}):
+            keys = [uuid7() for _ in range(10000)]
+        after = time.time_ns() // 1_000_000
+
+        self.assertEqual(keys[0].version, 7)
+        self.assertEqual(keys[0].variant, "specified in RFC 4122")
+        self.assertLessEqual(before, keys[0].int >> 80)
+        self.assertLessEqual(keys[-1].int >> 80, after + 1)
+        self.assertEqual(keys, sorted(set(keys)))
+
+    def test_uuid7_counter_overflow(self):
+        """
+        The test_uuid7_counter_overflow function tests that the keys keep increasing when the counter of a
+        millisecond runs out or the clock goes back, by borrowing the next millisecond.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        ms = time.time_ns() // 1_000_000 + 1000
+        state = {"ms": ms, "counter": UUID7_COUNTER_MAX - 1}
+
+        with mock.patch.dict(utils.uuid7_state, state):
+            first = uuid7()
+            second = uuid7()
+            third = uuid7()
+
+        self.assertEqual(first.int >> 80, ms)
+        self.assertEqual(second.int >> 80, ms + 1)
+        self.assertEqual(third.int >> 80, ms + 1)
+        self.assertLess(first, second)
+        self.assertLess(second, third)
@@ -1,4 +1,18 @@
 import datetime
+import math
+import os
+import threading
+import time
+import uuid
+
+
+# Mean radius of the Earth, used for the haversine distances.
+EARTH_RADIUS_KM = 6371.0088
+
+# Millisecond and counter of the last UUIDv7 generated by this process, so the next one sorts after it.
+uuid7_state = {"ms": 0, "counter": 0}
+uuid7_lock = threading.Lock()
+UUID7_COUNTER_MAX = 0xFFF
 
 
 def get_expiration_date_default():
@@ -10,3 +24,136 @@ def get_expiration_date_default():
     :doc-author: Trelent
     """
     return datetime.date.today() + datetime.timedelta(days=1)
+
+
+def parse_coordinate(value, limit: float):
+    """
+    The parse_coordinate function converts a latitude or longitude, usually received as a string, into a float.
+    It raises a ValueError when the value is not a finite number or when it falls outside of [-limit, limit].
+
+    :param value: The raw coordinate, as a string or a number
+    :param limit: float: The maximum absolute value accepted (90 for latitudes, 180 for longitudes)
+    :return: The coordinate as a float
+    :doc-author: Trelent
+    """
+    number = float(value)
+    if not -limit <= number <= limit:
+        raise ValueError(f"{value} is out of the [-{limit}, {limit}] range.")
+    return number
+
+
+def seconds_until_midnight():
+    """
+    The seconds_until_midnight function returns how many seconds are left until the date changes, which is when
+    the targets expiring today stop being live.
+
+    :return: The number of seconds until midnight, at least 1
+    :doc-author: Trelent
+    """
+    now = datetime.datetime.now()
+    midnight = datetime.datetime.combine(
+        now.date() + datetime.timedelta(days=1), datetime.time.min
+    )
+    return max(1, int((midnight - now).total_seconds()))
+
+
+def bbox_contains(bbox, lat: float, lng: float):
+    """
+    The bbox_contains function checks whether a point is inside a bounding box, with the same rules as the in_bbox
+    filter of the targets: a min_lng greater than max_lng means that the box crosses the antimeridian.
+
+    :param bbox: A tuple with min_lng, min_lat, max_lng and max_lat
+    :param lat: float: Latitude of the point
+    :param lng: float: Longitude of the point
+    :return: True if the point is inside the box
+    :doc-author: Trelent
+    """
+    min_lng, min_lat, max_lng, max_lat = bbox
+    if not min_lat <= lat <= max_lat:
+        return False
+    if min_lng <= max_lng:
+        return min_lng <= lng <= max_lng
+    return lng >= min_lng or lng <= max_lng
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float):
+    """
+    The haversine_km function computes the great-circle distance between two points, in kilometers.
+
+    :param lat1: float: Latitude of the first point
+    :param lng1: float: Longitude of the first point
+    :param lat2: float: Latitude of the second point
+    :param lng2: float: Longitude of the second point
+    :return: The distance in kilometers
+    :doc-author: Trelent
+    """
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    half_dphi = (phi2 - phi1) / 2
+    half_dlambda = math.radians(lng2 - lng1) / 2
+    a = (
+        math.sin(half_dphi) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(half_dlambda) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bbox_around(lat: float, lng: float, radius_km: float):
+    """
+    The bbox_around function returns the smallest bounding box that contains every point within the given
+    distance of a point. The box crosses the antimeridian when it needs to, and spans every longitude when it
+    reaches a pole.
+
+    :param lat: float: Latitude of the center
+    :param lng: float: Longitude of the center
+    :param radius_km: float: The distance from the center, in kilometers
+    :return: A tuple with min_lng, min_lat, max_lng and max_lat
+    :doc-author: Trelent
+    """
+    angle = radius_km / EARTH_RADIUS_KM
+    min_lat = lat - math.degrees(angle)
+    max_lat = lat + math.degrees(angle)
+    if min_lat <= -90 or max_lat >= 90 or angle >= math.pi / 2:
+        return -180.0, max(min_lat, -90.0), 180.0, min(max_lat, 90.0)
+
+    delta_lng = math.degrees(
+        math.asin(min(1.0, math.sin(angle) / math.cos(math.radians(lat))))
+    )
+    min_lng = lng - delta_lng
+    max_lng = lng + delta_lng
+    if min_lng < -180:
+        min_lng += 360
+    if max_lng > 180:
+        max_lng -= 360
+    return min_lng, min_lat, max_lng, max_lat
+
+
+def uuid7():
+    """
+    The uuid7 function generates a time-ordered UUID (version 7, RFC 9562): the first 48 bits are the Unix time in
+    milliseconds, followed by a 12-bit counter and 62 random bits. Consecutive keys land next to each other in the
+    primary key index, instead of all over it like uuid4 keys, and they sort in creation order.
+    The counter starts at a random value every millisecond and goes up with each key of the same millisecond, so
+    the keys of a process are strictly increasing, even when the clock goes back.
+
+    :return: A uuid.UUID
+    :doc-author: Trelent
+    """
+    ms = time.time_ns() // 1_000_000
+    with uuid7_lock:
+        if ms > uuid7_state["ms"]:
+            uuid7_state["ms"] = ms
+            # Half of the counter is left for the keys generated in the same millisecond.
+            uuid7_state["counter"] = int.from_bytes(os.urandom(2), "big") >> 5
+        elif uuid7_state["counter"] < UUID7_COUNTER_MAX:
+            uuid7_state["counter"] += 1
+        else:
+            uuid7_state["ms"] += 1
+            uuid7_state["counter"] = 0
+        ms = uuid7_state["ms"]
+        counter = uuid7_state["counter"]
+
+    random_bits = int.from_bytes(os.urandom(8), "big") & (1 << 62) - 1
+    return uuid.UUID(
+        int=ms << 80 | 0x7 << 76 | counter << 64 | 0b10 << 62 | random_bits
+    )
@@ -0,0 +1,73 @@
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.http import require_GET
+
+from core.db.pool import get_pool_stats
+from core.metrics import render_metrics
+from core.readiness import probe_database, readiness_state, warm_up
+
+
+@require_GET
+def database_pools(request):
+    """
+    The database_pools function returns the saturation and wait time metrics of the connection pools of this
+    process, one entry per database alias using the pooled backend.
+
+    :param request: The request being answered
+    :return: A JSON response with the stats of each pool
+    :doc-author: Trelent
+    """
+    return JsonResponse(get_pool_stats())
+
+
+@require_GET
+def metrics(request):
+    """
+    The metrics function serves the request and connection pool metrics of this process in the Prometheus text
+    format. Each worker process keeps its own metrics, so every worker must be scraped.
+
+    :param request: The request being answered
+    :return: A plain text response with the metrics
+    :doc-author: Trelent
+    """
+    return HttpResponse(
+        render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@require_GET
+def healthz(request):
+    """
+    The healthz function answers the liveness probes: it only shows that the process handles requests, so a
+    database outage does not get every worker restarted.
+
+    :param request: The request being answered
+    :return: A JSON response
+    :doc-author: Trelent
+    """
+    return JsonResponse({"status": "ok"})
+
+
+@require_GET
+def readyz(request):
+    """
+    The readyz function answers the readiness probes: the process is ready once it warmed up and while its
+    database connection answers a SELECT 1. The response includes how many seconds the process took to get ready.
+    A process whose warm-up could not reach the database retries it here, so it gets ready once the database is up.
+
+    :param request: The request being answered
+    :return: A JSON response, with the status 503 when the process is not ready
+    :doc-author: Trelent
+    """
+    if not readiness_state["ready"]:
+        warm_up()
+    database = readiness_state["ready"] and probe_database()
+    ready = readiness_state["ready"] and database
+    return JsonResponse(
+        {
+            "status": "ready" if ready else "unavailable",
+            "warmed_up": readiness_state["ready"],
+            "database": database,
+            "boot_seconds": readiness_state["boot_seconds"],
+        },
+        status=200 if ready else 503,
+    )
@@ -9,8 +9,11 @@ https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
 
 import os
 
+# Imported first, so the boot time it reports includes the setup of Django.
+from core.readiness import warm_up
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_join_test.settings")
 
 application = get_asgi_application()
+warm_up()
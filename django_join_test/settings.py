@@ -28,7 +28,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = "django-insecure-m&0yyyie37g9y7et8-fy11n4jye4vb0kj%lg8(l7(1adc$72-$"
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.environ.get("DEBUG", "true").lower() == "true"
 
 ALLOWED_HOSTS = []
 
@@ -52,7 +52,12 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.staticfiles.static_files_middleware",
+    "core.middleware.metrics_middleware",
+    "core.middleware.admission_middleware",
+    "core.middleware.query_budget_middleware",
     "django.middleware.security.SecurityMiddleware",
+    "core.middleware.read_your_writes_middleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -86,13 +91,72 @@ WSGI_APPLICATION = "django_join_test.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
+# Connections are kept open for DB_CONN_MAX_AGE seconds and checked before being reused by a new request.
+# With DB_POOL=true, they are borrowed from a pool of up to DB_POOL_MAX_SIZE connections per process instead, and a
+# request waits up to DB_POOL_TIMEOUT seconds for one when all of them are in use. Pooled connections are only checked
+# when they were idle for more than DB_POOL_CHECK_IDLE_SECONDS.
+# Set DB_PGBOUNCER=true when connecting through PgBouncer in transaction mode, so server-side cursors are only used
+# inside transactions (see core.db.cursors).
+DB_POOL = os.environ.get("DB_POOL", "false").lower() == "true"
+
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        "ENGINE": (
+            "core.db.backends.pooled_postgresql"
+            if DB_POOL
+            else "django.db.backends.postgresql"
+        ),
         "NAME": os.environ.get("DB_NAME"),
         "HOST": os.environ.get("DB_HOST"),
         "USER": os.environ.get("DB_USER"),
         "PASSWORD": os.environ.get("DB_PASS"),
+        # The pool keeps the connections, so Django gives them back at the end of each request.
+        "CONN_MAX_AGE": 0 if DB_POOL else int(os.environ.get("DB_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": os.environ.get("DB_CONN_HEALTH_CHECKS", "true").lower()
+        == "true",
+        "TRANSACTION_POOLING": os.environ.get("DB_PGBOUNCER", "false").lower()
+        == "true",
+        "POOL": {
+            "MAX_SIZE": int(os.environ.get("DB_POOL_MAX_SIZE", 20)),
+            "TIMEOUT": float(os.environ.get("DB_POOL_TIMEOUT", 10)),
+            "CHECK_IDLE_SECONDS": float(
+                os.environ.get("DB_POOL_CHECK_IDLE_SECONDS", 30)
+            ),
+        },
+    }
+}
+
+# Read replicas, as a comma separated list of hosts with the same database and credentials as the primary.
+# The reads of the target API go to one of them (see core.routers), the writes always go to the primary.
+DATABASE_REPLICAS = []
+for index, host in enumerate(
+    filter(None, os.environ.get("DB_REPLICA_HOSTS", "").split(","))
+):
+    alias = f"replica_{index + 1}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["core.routers.ReplicaRouter"]
+# For how many seconds after a write the same client keeps reading from the primary (see core.middleware), which
+# must be longer than the usual replication lag.
+DATABASE_REPLICA_STICKY_SECONDS = int(os.environ.get("DB_REPLICA_STICKY_SECONDS", 5))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# Local memory works for a single process. With multiple workers, use a shared cache (e.g. Redis), otherwise
+# writes handled by one worker do not invalidate the target responses cached by the others.
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
     }
 }
 
@@ -133,6 +197,13 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 STATICFILES_DIRS = [os.path.join(BASE_DIR, "static")]
+# collectstatic writes the files there under hashed names, with their brotli and gzip variants, and
+# core.staticfiles.static_files_middleware serves them with far-future caching.
+STATIC_ROOT = os.environ.get("STATIC_ROOT", os.path.join(BASE_DIR, "staticfiles"))
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "core.staticfiles.CompressedManifestStaticFilesStorage"},
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
@@ -145,3 +216,111 @@ GOOGLE_MAPS_API_KEY = os.environ.get("GOOGLE_MAPS_API_KEY")
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
+
+# How many targets are written on each INSERT/UPDATE/DELETE by the bulk endpoints, and how many they accept at once.
+TARGETS_BULK_BATCH_SIZE = int(os.environ.get("TARGETS_BULK_BATCH_SIZE", 500))
+TARGETS_BULK_MAX_ITEMS = int(os.environ.get("TARGETS_BULK_MAX_ITEMS", 10000))
+
+# How many targets the exports fetch from the database at a time.
+TARGETS_EXPORT_CHUNK_SIZE = int(os.environ.get("TARGETS_EXPORT_CHUNK_SIZE", 2000))
+
+# Cache used for the target responses, and for how long they are kept (they always expire at midnight).
+TARGETS_CACHE_ALIAS = os.environ.get("TARGETS_CACHE_ALIAS", "default")
+TARGETS_CACHE_TIMEOUT = int(os.environ.get("TARGETS_CACHE_TIMEOUT", 300))
+
+# How many change log entries the change feed reads at once, and for how many days they are kept.
+TARGETS_CHANGES_PAGE_SIZE = int(os.environ.get("TARGETS_CHANGES_PAGE_SIZE", 1000))
+TARGETS_CHANGES_RETENTION_DAYS = int(
+    os.environ.get("TARGETS_CHANGES_RETENTION_DAYS", 7)
+)
+
+# Class that pushes the target events to the subscribers of /api/target/events/. LocalBroker only sees the writes
+# of its own process; core.events.ChangeLogBroker polls the change log, so it works with multiple workers.
+TARGETS_EVENTS_BROKER = os.environ.get(
+    "TARGETS_EVENTS_BROKER", "core.events.LocalBroker"
+)
+TARGETS_EVENTS_POLL_INTERVAL = float(os.environ.get("TARGETS_EVENTS_POLL_INTERVAL", 1))
+# Seconds between keepalive comments on idle streams, and how many messages a slow subscriber may have queued.
+TARGETS_EVENTS_KEEPALIVE = int(os.environ.get("TARGETS_EVENTS_KEEPALIVE", 15))
+TARGETS_EVENTS_QUEUE_SIZE = int(os.environ.get("TARGETS_EVENTS_QUEUE_SIZE", 100))
+
+# Snapshot of the live targets written by the build_target_snapshot command, which every worker maps in memory to
+# answer the target list and detail without the database, as long as no target was written since it was built.
+# The workers and the command must share the TARGETS_CACHE_ALIAS cache, whose generation tells them so.
+TARGETS_SNAPSHOT_PATH = os.environ.get("TARGETS_SNAPSHOT_PATH", "")
+
+# The most targets the nearest targets endpoint returns at once.
+TARGETS_NEAREST_MAX_K = int(os.environ.get("TARGETS_NEAREST_MAX_K", 100))
+
+# Fraction of the requests measured by core.middleware.metrics_middleware and served at /metrics, and whether their
+# timings are also sent to the clients in the Server-Timing header.
+METRICS_SAMPLE_RATE = float(os.environ.get("METRICS_SAMPLE_RATE", 1))
+METRICS_SERVER_TIMING = (
+    os.environ.get("METRICS_SERVER_TIMING", "true").lower() == "true"
+)
+
+# How many SQL queries, and seconds spent on them, each view may use before core.middleware.query_budget_middleware
+# logs a warning (or raises, with QUERY_BUDGET_ACTION=raise; off disables it). The views not listed get "default",
+# and a view can be limited for a single method with "<method> <view>".
+QUERY_BUDGET_ACTION = os.environ.get("QUERY_BUDGET_ACTION", "log")
+QUERY_BUDGETS = {
+    "default": {
+        "queries": int(os.environ.get("QUERY_BUDGET_MAX_QUERIES", 20)),
+        "seconds": float(os.environ.get("QUERY_BUDGET_MAX_SECONDS", 1)),
+    },
+    "target:target-list": {"queries": 5},
+    "GET target:target-list": {"queries": 2},
+    "target:target-detail": {"queries": 5},
+    "GET target:target-detail": {"queries": 2},
+    "target:target-nearest": {"queries": 10},
+    "target:target-bulk": {"queries": None, "seconds": 10},
+}
+
+# Sends the logs of the core app to the console, e.g. the boot-to-ready time of each process and the requests over
+# their query budget.
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "core": {
+            "handlers": ["console"],
+            "level": os.environ.get("CORE_LOG_LEVEL", "INFO"),
+        },
+    },
+}
+
+# Admission control of the target API (core.middleware.admission_middleware). Each client may make "rate" requests
+# per second on average, and "burst" at once, separately for reads and writes, before getting 429 responses. The
+# token buckets are kept by each process, or shared through the THROTTLE_CACHE_ALIAS cache with
+# THROTTLE_STORE=core.admission.CacheBucketStore. Behind proxies, set THROTTLE_NUM_PROXIES so the clients are told
+# apart by X-Forwarded-For.
+THROTTLE_RATES = {
+    "read": {
+        "rate": float(os.environ.get("THROTTLE_READ_RATE", 50)),
+        "burst": int(os.environ.get("THROTTLE_READ_BURST", 100)),
+    },
+    "write": {
+        "rate": float(os.environ.get("THROTTLE_WRITE_RATE", 5)),
+        "burst": int(os.environ.get("THROTTLE_WRITE_BURST", 20)),
+    },
+}
+THROTTLE_STORE = os.environ.get("THROTTLE_STORE", "core.admission.LocalBucketStore")
+THROTTLE_CACHE_ALIAS = os.environ.get("THROTTLE_CACHE_ALIAS", "default")
+THROTTLE_NUM_PROXIES = int(os.environ.get("THROTTLE_NUM_PROXIES", 0))
+# Each process runs at most ADMISSION_MAX_CONCURRENCY requests of the target API at once (by default as many as the
+# connections of its pool, 0 disables the limit). Up to ADMISSION_MAX_QUEUE more wait for ADMISSION_QUEUE_TIMEOUT
+# seconds, or only ADMISSION_QUEUE_TARGET seconds once the queue has not been empty for that long; the others get
+# 503 responses telling them to retry after ADMISSION_RETRY_AFTER seconds. The event streams stay open while idle, so
+# they are left out of the concurrency limit by ADMISSION_EXEMPT_PATHS, and only throttled.
+ADMISSION_PATHS = ["/api/target/"]
+ADMISSION_EXEMPT_PATHS = ["/api/target/events/"]
+ADMISSION_MAX_CONCURRENCY = int(
+    os.environ.get(
+        "ADMISSION_MAX_CONCURRENCY", DATABASES["default"]["POOL"]["MAX_SIZE"]
+    )
+)
+ADMISSION_MAX_QUEUE = int(os.environ.get("ADMISSION_MAX_QUEUE", 50))
+ADMISSION_QUEUE_TIMEOUT = float(os.environ.get("ADMISSION_QUEUE_TIMEOUT", 0.1))
+ADMISSION_QUEUE_TARGET = float(os.environ.get("ADMISSION_QUEUE_TARGET", 0.005))
+ADMISSION_RETRY_AFTER = int(os.environ.get("ADMISSION_RETRY_AFTER", 1))
@@ -19,6 +19,8 @@ from django.urls import path, include
 from django.views.generic import TemplateView
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
+from core.views import database_pools, healthz, metrics, readyz
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/schema/", SpectacularAPIView.as_view(), name="api-schema"),
@@ -28,5 +30,9 @@ urlpatterns = [
         name="api-docs",
     ),
     path("api/target/", include("targets.urls")),
+    path("api/db/pools/", database_pools, name="database-pools"),
+    path("metrics", metrics, name="metrics"),
+    path("healthz", healthz, name="healthz"),
+    path("readyz", readyz, name="readyz"),
     path("", TemplateView.as_view(template_name="index.html")),
 ]
@@ -9,8 +9,11 @@ https://docs.djangoproject.com/en/5.0/howto/deployment/wsgi/
 
 import os
 
+# Imported first, so the boot time it reports includes the setup of Django.
+from core.readiness import warm_up
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_join_test.settings")
 
 application = get_wsgi_application()
+warm_up()
@@ -0,0 +1,92 @@
+import datetime
+import functools
+import hashlib
+
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.response import Response
+
+from core.cache import get_generation, get_targets_cache, response_cache_stats
+from core.routers import reads_may_be_stale
+from core.utils import seconds_until_midnight
+
+
+def get_response_cache_key(request, generation: int):
+    """
+    The get_response_cache_key function builds the cache key of a response from the path, the query parameters
+    and the Accept header of the request, plus the current generation of the targets table and today's date, so a
+    write or a date rollover makes every previous key unreachable.
+
+    :param request: The request being answered
+    :param generation: int: The current generation of the targets table
+    :return: The cache key as a string
+    :doc-author: Trelent
+    """
+    raw_key = f"{request.get_full_path()}|{request.META.get('HTTP_ACCEPT', '')}"
+    digest = hashlib.md5(raw_key.encode(), usedforsecurity=False).hexdigest()
+    return f"targets:response:{generation}:{datetime.date.today()}:{digest}"
+
+
+def cache_response(view_method=None, *, formats=("json",)):
+    """
+    The cache_response function decorates a viewset method so its rendered bytes are cached.
+    Only successful responses rendered in one of the given formats are cached, so the browsable API, which
+    embeds per-user data, is always rendered again. Neither are the responses read from a replica that may not
+    have replicated the current generation yet, which would keep its old rows cached under the new generation.
+
+    :param view_method: The viewset method being decorated
+    :param formats: The formats of the renderers whose output can be cached
+    :return: The decorated method
+    :doc-author: Trelent
+    """
+    if view_method is None:
+        return functools.partial(cache_response, formats=formats)
+
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        cache = get_targets_cache()
+        generation = get_generation()
+        key = get_response_cache_key(request, generation)
+
+        cached = cache.get(key)
+        response_cache_stats.record(hit=cached is not None)
+        if cached is not None:
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+            response["X-Cache"] = "HIT"
+            return response
+
+        response = view_method(self, request, *args, **kwargs)
+        if (
+            isinstance(response, Response)
+            and response.status_code == 200
+            and not reads_may_be_stale(generation)
+        ):
+            response.add_post_render_callback(
+                functools.partial(store_response, key, formats)
+            )
+        response["X-Cache"] = "MISS"
+        return response
+
+    return wrapper
+
+
+def store_response(key: str, formats, response):
+    """
+    The store_response function is called once a response is rendered and stores its bytes in the cache until
+    midnight, or for TARGETS_CACHE_TIMEOUT seconds if that comes first.
+
+    :param key: str: The cache key of the response
+    :param formats: The formats of the renderers whose output can be cached
+    :param response: The rendered response
+    :return: None
+    :doc-author: Trelent
+    """
+    if response.accepted_renderer.format not in formats:
+        return
+
+    get_targets_cache().set(
+        key,
+        (response.content, response["Content-Type"]),
+        timeout=min(settings.TARGETS_CACHE_TIMEOUT, seconds_until_midnight()),
+    )
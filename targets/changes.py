@@ -0,0 +1,150 @@
+import base64
+import binascii
+import datetime
+import uuid
+
+from django.conf import settings
+from rest_framework.exceptions import NotFound, ValidationError
+
+from core.events import EXPIRED
+from core.models import Target, TargetChange
+
+
+class ChangeTokenExpired(NotFound):
+    status_code = 410
+    default_detail = "The change token is too old, reload every target."
+    default_code = "gone"
+
+
+def encode_change_token(position, date: datetime.date, expired_after=None):
+    """
+    The encode_change_token function builds the opaque token given to the clients of the change feed, made of the
+    position of the last change log entry they have seen and of the date their live targets were computed for.
+    While the targets expired since that date are being paged through, it also holds the id of the last one sent.
+
+    :param position: A tuple with the transaction id and the id of the last change log entry seen by the client
+    :param date: datetime.date: The date the client live targets were computed for
+    :param expired_after: The id of the last expired target sent, or None
+    :return: The token as a string
+    :doc-author: Trelent
+    """
+    transaction_id, sequence = position
+    raw = f"{transaction_id}-{sequence}:{date.isoformat()}"
+    if expired_after is not None:
+        raw += f":{expired_after}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_change_token(token: str):
+    """
+    The decode_change_token function reads back a token built by encode_change_token. The tokens given before the
+    change log recorded transaction ids only have the id of the entry, whose entries all come first.
+
+    :param token: str: The token sent by the client
+    :return: A tuple with the position, the date and the id of the last expired target sent, or None
+    :doc-author: Trelent
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        position, date, *expired_after = raw.split(":")
+        transaction_id, _, sequence = position.rpartition("-")
+        return (
+            (int(transaction_id or 0), int(sequence)),
+            datetime.date.fromisoformat(date),
+            uuid.UUID(*expired_after) if expired_after else None,
+        )
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise ValidationError({"since": "Invalid change token."})
+
+
+def get_current_change_token():
+    """
+    The get_current_change_token function returns the token that represents the current state of the targets.
+
+    :return: The token as a string
+    :doc-author: Trelent
+    """
+    return encode_change_token(
+        TargetChange.objects.get_last_position(), datetime.date.today()
+    )
+
+
+def get_changes_since(token: str, limit: int):
+    """
+    The get_changes_since function computes what changed in the live targets since the given token.
+    The targets that expired because the date changed since the token are returned first, as expired tombstones,
+    limit at a time. Then the change log is read from the token on, in commit order, and only the last change of
+    each target is kept. Targets that were created or updated are returned with their current data, unless they are
+    expired by now.
+
+    :param token: str: The token sent by the client
+    :param limit: int: The maximum number of expired targets or change log entries read at once
+    :return: A tuple with the changes, the next token and whether there are more changes to be read
+    :doc-author: Trelent
+    """
+    position, since_date, expired_after = decode_change_token(token)
+    today = datetime.date.today()
+    retention = datetime.timedelta(days=settings.TARGETS_CHANGES_RETENTION_DAYS)
+    if since_date < today - retention:
+        raise ChangeTokenExpired()
+
+    expired_ids = []
+    if since_date < today:
+        expired = Target.objects.filter(
+            expiration_date__gt=since_date, expiration_date__lte=today
+        )
+        if expired_after is not None:
+            expired = expired.filter(id__gt=expired_after)
+        expired_ids = list(
+            expired.order_by("id").values_list("id", flat=True)[: limit + 1]
+        )
+        if len(expired_ids) > limit:
+            expired_ids = expired_ids[:limit]
+            changes = [
+                {"id": target_id, "action": EXPIRED, "target": None}
+                for target_id in expired_ids
+            ]
+            return (
+                changes,
+                encode_change_token(position, since_date, expired_ids[-1]),
+                True,
+            )
+
+    entries = list(
+        TargetChange.objects.after(position).values_list(
+            "transaction_id", "id", "target_id", "action"
+        )[: limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    last_actions = {}
+    for _, _, target_id, action in entries:
+        last_actions.pop(target_id, None)
+        last_actions[target_id] = action
+
+    current_targets = Target.objects.in_bulk(
+        [
+            target_id
+            for target_id, action in last_actions.items()
+            if action != TargetChange.DELETED
+        ]
+    )
+
+    changes = [
+        {"id": target_id, "action": EXPIRED, "target": None}
+        for target_id in expired_ids
+        if target_id not in last_actions
+    ]
+
+    for target_id, action in last_actions.items():
+        target = current_targets.get(target_id)
+        if target is None:
+            action = TargetChange.DELETED
+        elif target.expiration_date <= today:
+            action, target = EXPIRED, None
+        changes.append({"id": target_id, "action": action, "target": target})
+
+    if entries:
+        position = entries[-1][:2]
+    return changes, encode_change_token(position, today), has_more
@@ -0,0 +1,110 @@
+import datetime
+import functools
+import hashlib
+import time
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from core.cache import get_generation
+from core.routers import reads_may_be_stale
+
+
+def make_etag(*parts):
+    """
+    The make_etag function hashes the given parts into a quoted ETag.
+
+    :param *parts: The values the represented content depends on
+    :return: The quoted ETag
+    :doc-author: Trelent
+    """
+    raw = "|".join(str(part) for part in parts)
+    return quote_etag(hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest())
+
+
+def get_table_validators(request, generation: int):
+    """
+    The get_table_validators function computes the ETag and the Last-Modified of a response built from the whole
+    targets table, without querying the database: both come from the table generation, which changes on every
+    write, and from today's date, which changes the set of live targets at midnight.
+
+    :param request: The request being answered
+    :param generation: int: The current generation of the targets table
+    :return: A tuple with the ETag and the Last-Modified timestamp
+    :doc-author: Trelent
+    """
+    today = datetime.date.today()
+    etag = make_etag(
+        generation, today, request.get_full_path(), request.META.get("HTTP_ACCEPT", "")
+    )
+    midnight = datetime.datetime.combine(today, datetime.time.min).timestamp()
+    return etag, max(generation / 1e9, midnight)
+
+
+def get_instance_validators(request, instance):
+    """
+    The get_instance_validators function computes the ETag and the Last-Modified of a response built from a single
+    target, from its id and the moment it was last updated.
+
+    :param request: The request being answered
+    :param instance: The target being represented
+    :return: A tuple with the ETag and the Last-Modified timestamp
+    :doc-author: Trelent
+    """
+    etag = make_etag(
+        instance.pk,
+        instance.updated_at.isoformat(),
+        request.get_full_path(),
+        request.META.get("HTTP_ACCEPT", ""),
+    )
+    return etag, instance.updated_at.timestamp()
+
+
+def set_validators(response, etag: str, last_modified: float):
+    """
+    The set_validators function adds the ETag and Last-Modified headers to a response.
+        Last-Modified only has a resolution of one second, so another write in the same second would get the same
+        one, and a client sending it back in If-Modified-Since would get a 304 for an outdated version. It is only
+        sent once that second is over, and until then the ETag is the only validator.
+
+    :param response: The response being returned
+    :param etag: str: The ETag of the response
+    :param last_modified: float: The Last-Modified timestamp of the response
+    :return: The response
+    :doc-author: Trelent
+    """
+    response["ETag"] = etag
+    if int(last_modified) < int(time.time()):
+        response["Last-Modified"] = http_date(last_modified)
+    return response
+
+
+def conditional_table_response(view_method):
+    """
+    The conditional_table_response function decorates a viewset method that answers with data from the whole
+    targets table, so it answers 304 Not Modified when the client already has the current version, without
+    querying the database nor serializing anything.
+    A response read from a replica that may not have replicated the current generation yet is sent without
+    validators, since it may hold the targets of the previous generation.
+
+    :param view_method: The viewset method being decorated
+    :return: The decorated method
+    :doc-author: Trelent
+    """
+
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        generation = get_generation()
+        etag, last_modified = get_table_validators(request, generation)
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=int(last_modified)
+        )
+        if response is None:
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code != 200 or reads_may_be_stale(generation):
+                return response
+
+        return set_validators(response, etag, last_modified)
+
+    return wrapper
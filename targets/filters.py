@@ -0,0 +1,184 @@
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+
+from core.utils import parse_coordinate
+
+
+def parse_bbox(value: str):
+    """
+    The parse_bbox function parses the bbox query parameter, written as minLng,minLat,maxLng,maxLat.
+    A minLng greater than maxLng is accepted and means that the box crosses the antimeridian.
+
+    :param value: str: The raw value of the bbox query parameter
+    :return: A tuple with min_lng, min_lat, max_lng and max_lat as floats
+    :doc-author: Trelent
+    """
+    parts = value.split(",")
+    if len(parts) != 4:
+        raise ValidationError(
+            {"bbox": "bbox must be written as minLng,minLat,maxLng,maxLat."}
+        )
+
+    try:
+        min_lng = parse_coordinate(parts[0], 180)
+        min_lat = parse_coordinate(parts[1], 90)
+        max_lng = parse_coordinate(parts[2], 180)
+        max_lat = parse_coordinate(parts[3], 90)
+    except ValueError:
+        raise ValidationError({"bbox": "bbox must contain valid coordinates."})
+
+    if min_lat > max_lat:
+        raise ValidationError({"bbox": "minLat must not be greater than maxLat."})
+
+    return min_lng, min_lat, max_lng, max_lat
+
+
+def parse_precision(value: str):
+    """
+    The parse_precision function parses the precision query parameter of the columnar format, the bits of each
+    coordinate. float32 is precise to about a meter, float64 keeps the stored coordinates as they are.
+
+    :param value: str: The raw value of the precision query parameter
+    :return: The precision as an int, 32 or 64
+    :doc-author: Trelent
+    """
+    if value is None:
+        return 64
+    if value not in ("32", "64"):
+        raise ValidationError({"precision": "precision must be 32 or 64."})
+    return int(value)
+
+
+def parse_point(lat: str, lng: str):
+    """
+    The parse_point function parses the lat and lng query parameters of the nearest targets endpoint.
+
+    :param lat: str: The raw value of the lat query parameter
+    :param lng: str: The raw value of the lng query parameter
+    :return: A tuple with the latitude and the longitude as floats
+    :doc-author: Trelent
+    """
+    errors = {}
+    point = []
+    for name, value, limit in (("lat", lat, 90), ("lng", lng, 180)):
+        try:
+            point.append(parse_coordinate(value, limit))
+        except (TypeError, ValueError):
+            errors[name] = f"{name} must be a number between -{limit} and {limit}."
+    if errors:
+        raise ValidationError(errors)
+    return tuple(point)
+
+
+def parse_k(value: str):
+    """
+    The parse_k function parses the k query parameter of the nearest targets endpoint, how many targets are
+    returned. When it is not given, 10 targets are returned.
+
+    :param value: str: The raw value of the k query parameter
+    :return: The number of targets as an int
+    :doc-author: Trelent
+    """
+    if value is None:
+        return 10
+
+    max_k = settings.TARGETS_NEAREST_MAX_K
+    try:
+        k = int(value)
+    except ValueError:
+        raise ValidationError({"k": f"k must be an integer between 1 and {max_k}."})
+
+    if not 1 <= k <= max_k:
+        raise ValidationError({"k": f"k must be an integer between 1 and {max_k}."})
+
+    return k
+
+
+def parse_radius(value: str):
+    """
+    The parse_radius function parses the radius_km query parameter of the nearest targets endpoint, the maximum
+    distance of the returned targets.
+
+    :param value: str: The raw value of the radius_km query parameter
+    :return: The radius in kilometers as a float, or None when it is not given
+    :doc-author: Trelent
+    """
+    if value is None:
+        return None
+
+    try:
+        radius_km = float(value)
+    except ValueError:
+        radius_km = None
+
+    if radius_km is None or not radius_km > 0 or radius_km == float("inf"):
+        raise ValidationError({"radius_km": "radius_km must be a positive number."})
+
+    return radius_km
+
+
+def parse_zoom(value: str):
+    """
+    The parse_zoom function parses the zoom query parameter used by the clusters endpoint.
+    Zoom levels follow the web map convention, from 0 (the whole world) to 22.
+
+    :param value: str: The raw value of the zoom query parameter
+    :return: The zoom level as an int
+    :doc-author: Trelent
+    """
+    try:
+        zoom = int(value)
+    except (TypeError, ValueError):
+        raise ValidationError({"zoom": "zoom must be an integer between 0 and 22."})
+
+    if not 0 <= zoom <= 22:
+        raise ValidationError({"zoom": "zoom must be an integer between 0 and 22."})
+
+    return zoom
+
+
+def parse_fields(value: str, allowed_fields):
+    """
+    The parse_fields function parses the fields query parameter, a comma separated list of the fields that the
+    client wants to receive. The fields are returned in the order of allowed_fields, whatever the order they were
+    given in, so every serializer answers with the keys in the same order.
+
+    :param value: str: The raw value of the fields query parameter
+    :param allowed_fields: The names of the fields that can be requested, in the order they are rendered
+    :return: A list with the requested fields, in the order of allowed_fields
+    :doc-author: Trelent
+    """
+    fields = [field.strip() for field in value.split(",") if field.strip()]
+    if not fields:
+        raise ValidationError({"fields": "fields must list at least one field."})
+
+    unknown_fields = [field for field in fields if field not in allowed_fields]
+    if unknown_fields:
+        raise ValidationError(
+            {"fields": f"Unknown fields: {', '.join(unknown_fields)}."}
+        )
+
+    return [field for field in allowed_fields if field in fields]
+
+
+def parse_batch_size(value: str):
+    """
+    The parse_batch_size function parses the batch_size query parameter of the bulk endpoints.
+    When it is not given, the TARGETS_BULK_BATCH_SIZE setting is used.
+
+    :param value: str: The raw value of the batch_size query parameter
+    :return: The batch size as an int
+    :doc-author: Trelent
+    """
+    if value is None:
+        return settings.TARGETS_BULK_BATCH_SIZE
+
+    try:
+        batch_size = int(value)
+    except ValueError:
+        raise ValidationError({"batch_size": "batch_size must be a positive integer."})
+
+    if batch_size < 1:
+        raise ValidationError({"batch_size": "batch_size must be a positive integer."})
+
+    return batch_size
@@ -0,0 +1,15 @@
+from rest_framework.pagination import CursorPagination
+
+
+class TargetCursorPagination(CursorPagination):
+    """
+    Keyset pagination over the primary key index. The keys are time-ordered (UUIDv7), so the pages list the targets
+    in creation order, except for the older targets with random uuid4 keys, which are spread among them.
+    It is opt-in: the list stays unpaginated unless the client asks for a page_size, so existing clients keep
+    receiving a plain list.
+    """
+
+    ordering = "id"
+    page_size = None
+    page_size_query_param = "page_size"
+    max_page_size = 1000
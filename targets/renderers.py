@@ -0,0 +1,55 @@
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer that encodes with orjson, when it is installed, into the exact same bytes as JSONRenderer.
+    Whatever orjson would encode differently, like dates, times or custom objects, is handed back to JSONRenderer.
+    Floats are not checked, since orjson writes exponents differently, so it must only render data without floats.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, option=orjson.OPT_PASSTHROUGH_DATETIME)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same escaping as JSONRenderer, so the output is a strict javascript subset.
+        return ret.replace("\u2028".encode(), b"\\u2028").replace(
+            "\u2029".encode(), b"\\u2029"
+        )
+
+
+class ColumnarRenderer(BaseRenderer):
+    """
+    Renderer of the packed columnar payload built by targets.columnar, selected with ?format=columnar or with its
+    media type in the Accept header. Anything else, like validation errors, is rendered as JSON.
+    """
+
+    media_type = "application/vnd.targets.columnar"
+    format = "columnar"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, bytes):
+            return data
+
+        response = (renderer_context or {}).get("response")
+        if response is not None:
+            response["Content-Type"] = JSONRenderer.media_type
+        return JSONRenderer().render(data, renderer_context=renderer_context)
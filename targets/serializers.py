@@ -1,7 +1,19 @@
+import datetime
+
+from django.conf import settings
 from rest_framework import serializers
 
+from core.db.cursors import iterate_queryset
+from core.metrics import measure_serialization
 from core.models import Target
-from core.utils import get_expiration_date_default
+from core.utils import get_expiration_date_default, parse_coordinate
+
+
+class MeasuredListSerializer(serializers.ListSerializer):
+    @property
+    def data(self):
+        with measure_serialization():
+            return super().data
 
 
 class TargetSerializer(serializers.ModelSerializer):
@@ -9,19 +21,84 @@ class TargetSerializer(serializers.ModelSerializer):
         model = Target
         fields = ["id", "name", "latitude", "longitude", "expiration_date"]
         read_only_fields = ["id"]
+        list_serializer_class = MeasuredListSerializer
+
+    def __init__(self, *args, fields=None, **kwargs):
+        """
+        The __init__ function accepts an optional list of fields, so the same serializer can emit only the fields
+        that a client asked for.
+
+        :param self: Represent the instance of the class
+        :param *args: Pass the instance or the data to the serializer
+        :param fields: The names of the fields to keep, or None to keep all of them
+        :param **kwargs: Pass the remaining arguments to the serializer
+        :return: None
+        :doc-author: Trelent
+        """
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
+    @property
+    def data(self):
+        with measure_serialization():
+            return super().data
+
+    def validate_latitude(self, value):
+        """
+        The validate_latitude function checks that the latitude is a number between -90 and 90, so it can be stored
+        in the numeric column used by the bounding box queries.
+
+        :param self: Access the object that is being validated
+        :param value: Pass the value of the field to be validated
+        :return: The value if it is a valid latitude
+        :doc-author: Trelent
+        """
+        try:
+            parse_coordinate(value, 90)
+        except ValueError:
+            raise serializers.ValidationError(
+                "Latitude must be a number between -90 and 90."
+            )
+        return value
+
+    def validate_longitude(self, value):
+        """
+        The validate_longitude function checks that the longitude is a number between -180 and 180, so it can be
+        stored in the numeric column used by the bounding box queries.
+
+        :param self: Access the object that is being validated
+        :param value: Pass the value of the field to be validated
+        :return: The value if it is a valid longitude
+        :doc-author: Trelent
+        """
+        try:
+            parse_coordinate(value, 180)
+        except ValueError:
+            raise serializers.ValidationError(
+                "Longitude must be a number between -180 and 180."
+            )
+        return value
 
     def validate_expiration_date(self, value):
         """
         The validate_expiration_date function is a custom validation function that checks if the expiration date
             of an item is at least one day ahead. If it isn't, then the serializer will raise a ValidationError.
+            The bulk endpoints pass the minimum date through the context, so a whole batch uses the same date.
 
         :param self: Access the object that is being validated
         :param value: Pass the value of the field to be validated
         :return: The value if it is not none and the value is greater than one day ahead
         :doc-author: Trelent
         """
+        min_expiration_date = self.context.get("min_expiration_date")
+        if min_expiration_date is None:
+            min_expiration_date = get_expiration_date_default()
+
         if value is not None:
-            if value < get_expiration_date_default():
+            if value < min_expiration_date:
                 raise serializers.ValidationError(
                     "Expiration Date must be at least one day ahead."
                 )
@@ -40,3 +117,89 @@ class TargetSerializer(serializers.ModelSerializer):
         :doc-author: Trelent
         """
         return Target.objects.create_target(**validated_data)
+
+
+class TargetNearestSerializer(TargetSerializer):
+    distance_km = serializers.FloatField(read_only=True)
+
+    class Meta(TargetSerializer.Meta):
+        fields = TargetSerializer.Meta.fields + ["distance_km"]
+
+
+class TargetValuesSerializer:
+    """
+    Read-only fast path of TargetSerializer for lists. It builds the same output straight from values_list()
+    rows, without instantiating the models nor calling the to_representation of each field.
+    """
+
+    # How each column is turned into its representation, for the fields that are not already strings.
+    converters = {"id": str, "expiration_date": datetime.date.isoformat}
+
+    def __init__(self, queryset=None, fields=None):
+        self.queryset = queryset
+        self.fields = list(fields or TargetSerializer.Meta.fields)
+
+    @property
+    def data(self):
+        rows = self.queryset.values_list(*self.fields)
+        with measure_serialization():
+            return self.to_representation(
+                iterate_queryset(rows, settings.TARGETS_EXPORT_CHUNK_SIZE)
+            )
+
+    def to_representation(self, rows):
+        """
+        The to_representation function turns values_list() rows into the dictionaries TargetSerializer would build
+        for the same targets.
+
+        :param self: Represent the instance of the class
+        :param rows: An iterable of tuples with the values of the fields, in order
+        :return: A list of dictionaries
+        :doc-author: Trelent
+        """
+        fields = self.fields
+        conversions = [
+            (index, self.converters[field])
+            for index, field in enumerate(fields)
+            if field in self.converters
+        ]
+        data = []
+        for row in rows:
+            if conversions:
+                row = list(row)
+                for index, converter in conversions:
+                    row[index] = converter(row[index])
+            data.append(dict(zip(fields, row)))
+        return data
+
+
+class TargetClusterSerializer(serializers.Serializer):
+    latitude = serializers.FloatField(read_only=True)
+    longitude = serializers.FloatField(read_only=True)
+    count = serializers.IntegerField(read_only=True)
+
+
+class TargetBulkDeleteSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.UUIDField(), allow_empty=False)
+
+    def validate_ids(self, value):
+        """
+        The validate_ids function checks that no more ids are sent than the TARGETS_BULK_MAX_ITEMS setting, the
+        same limit of the other bulk writes.
+
+        :param self: Access the object that is being validated
+        :param value: Pass the list of ids to be validated
+        :return: The ids if there are not too many of them
+        :doc-author: Trelent
+        """
+        if len(value) > settings.TARGETS_BULK_MAX_ITEMS:
+            raise serializers.ValidationError(
+                f"Expected at most {settings.TARGETS_BULK_MAX_ITEMS} ids."
+            )
+        return value
+
+
+class TargetChangeSerializer(serializers.Serializer):
+    id = serializers.UUIDField(read_only=True)
+    action = serializers.CharField(read_only=True)
+    target = TargetSerializer(read_only=True, allow_null=True)
@@ -1,16 +1,42 @@
+import csv
 import datetime
+import io
+import json
+import os
+import tempfile
 from uuid import UUID
 
-from django.test import TestCase
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import AsyncClient, TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 from freezegun import freeze_time
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from core.budget import QueryBudget
+from core.cache import get_targets_cache
+from core.middleware import PRIMARY_COOKIE
 from core.models import Target
+from core.snapshot import build_snapshot
 from targets import serializers
+from targets.cache import response_cache_stats
+from targets.columnar import decode_target_columns
+from targets.renderers import FastJSONRenderer
+from targets.changes import encode_change_token
 
 TARGETS_URLS = reverse("target:target-list")
+CLUSTERS_URL = reverse("target:target-clusters")
+BULK_URL = reverse("target:target-bulk")
+EXPORT_URL = reverse("target:target-export")
+CHANGES_URL = reverse("target:target-changes")
+NEAREST_URL = reverse("target:target-nearest")
+EVENTS_URL = reverse("target:target-events")
+ASYNC_TARGETS_URL = reverse("target:target-async-list")
 
 
 def custom_today():
@@ -63,6 +89,7 @@ class TestTargetsApi(TestCase):
         """
         self.client = APIClient()
         self.today = datetime.datetime.now().date()
+        get_targets_cache().clear()
 
     def test_create_target_success(self):
         """
@@ -205,3 +232,1261 @@ class TestTargetsApi(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data["id"], str(target.id))
         self.assertEqual(res.data["name"], payload["name"])
+
+    def test_create_target_with_invalid_coordinates(self):
+        """
+        The test_create_target_with_invalid_coordinates function tests that the API rejects latitudes and longitudes
+        that are not numbers inside their valid ranges.
+
+        :param self: Represent the instance of the class
+        :return: The status code 400 and the errors of both coordinates
+        :doc-author: Trelent
+        """
+        payload = {"name": "Test", "latitude": "north", "longitude": "200"}
+
+        res = self.client.post(TARGETS_URLS, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("latitude", res.data)
+        self.assertIn("longitude", res.data)
+        self.assertFalse(Target.objects.exists())
+
+    def test_retrieve_targets_in_bbox(self):
+        """
+        The test_retrieve_targets_in_bbox function tests the bbox query parameter of the list endpoint.
+        It creates one target inside and one outside of the viewport and asserts that only the first one is returned.
+
+        :param self: Represent the instance of the class
+        :return: The status code 200 and the targets inside the viewport
+        :doc-author: Trelent
+        """
+        inside = create_target()
+        create_target(latitude="-23.5489", longitude="-46.6388")
+
+        res = self.client.get(TARGETS_URLS, {"bbox": "-36,-6,-35,-5"})
+
+        target_serializer = serializers.TargetSerializer([inside], many=True)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, target_serializer.data)
+
+    def test_retrieve_targets_with_invalid_bbox(self):
+        """
+        The test_retrieve_targets_with_invalid_bbox function tests that malformed bbox values are answered with
+        a 400 instead of being ignored.
+
+        :param self: Represent the instance of the class
+        :return: The status code 400
+        :doc-author: Trelent
+        """
+        for bbox in ("1,2,3", "a,b,c,d", "-36,-5,-35,-6"):
+            res = self.client.get(TARGETS_URLS, {"bbox": bbox})
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("bbox", res.data)
+
+    def test_retrieve_target_clusters(self):
+        """
+        The test_retrieve_target_clusters function tests the clusters endpoint.
+        It creates two targets close to each other and one far away, and asserts that at a low zoom the close targets
+        are grouped together in a cluster whose position is their centroid.
+
+        :param self: Represent the instance of the class
+        :return: The status code 200 and one cluster per grid cell
+        :doc-author: Trelent
+        """
+        create_target(latitude="-5.90", longitude="-35.20")
+        create_target(latitude="-5.80", longitude="-35.10")
+        create_target(latitude="-23.5489", longitude="-46.6388")
+
+        res = self.client.get(CLUSTERS_URL, {"zoom": 5})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 2)
+
+        counts = sorted(cluster["count"] for cluster in res.data)
+        self.assertEqual(counts, [1, 2])
+
+        cluster = next(cluster for cluster in res.data if cluster["count"] == 2)
+        self.assertAlmostEqual(cluster["latitude"], -5.85)
+        self.assertAlmostEqual(cluster["longitude"], -35.15)
+
+    def test_retrieve_target_clusters_in_bbox(self):
+        """
+        The test_retrieve_target_clusters_in_bbox function tests that the clusters endpoint only groups the targets
+        inside the bbox and that expired targets are left out.
+
+        :param self: Represent the instance of the class
+        :return: The status code 200 and the clusters inside the viewport
+        :doc-author: Trelent
+        """
+        create_target()
+
+        with freeze_time(custom_today()):
+            expiration_date = custom_today() + datetime.timedelta(days=1)
+            create_target(expiration_date=expiration_date)
+            create_target(
+                latitude="-23.5489",
+                longitude="-46.6388",
+                expiration_date=expiration_date,
+            )
+
+            res = self.client.get(CLUSTERS_URL, {"zoom": 10, "bbox": "-36,-6,-35,-5"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 1)
+        self.assertEqual(res.data[0]["count"], 1)
+
+    def test_retrieve_target_clusters_with_invalid_zoom(self):
+        """
+        The test_retrieve_target_clusters_with_invalid_zoom function tests that zoom levels that are not integers
+        between 0 and 22 are answered with a 400.
+
+        :param self: Represent the instance of the class
+        :return: The status code 400
+        :doc-author: Trelent
+        """
+        for zoom in ("far", "23", "-1"):
+            res = self.client.get(CLUSTERS_URL, {"zoom": zoom})
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("zoom", res.data)
+
+    def test_retrieve_targets_with_cursor_pagination(self):
+        """
+        The test_retrieve_targets_with_cursor_pagination function tests the opt-in cursor pagination of the list
+        endpoint.
+        It creates three targets, asks for pages of two and follows the next link, asserting that every target is
+        returned exactly once.
+
+        :param self: Represent the instance of the class
+        :return: The status code 200 and the pages of targets
+        :doc-author: Trelent
+        """
+        targets = [create_target() for _ in range(3)]
+
+        res = self.client.get(TARGETS_URLS, {"page_size": 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]), 2)
+        self.assertIsNone(res.data["previous"])
+        self.assertIsNotNone(res.data["next"])
+
+        next_res = self.client.get(res.data["next"])
+
+        self.assertEqual(next_res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(next_res.data["results"]), 1)
+        self.assertIsNone(next_res.data["next"])
+
+        returned_ids = [
+            target["id"] for target in res.data["results"] + next_res.data["results"]
+        ]
+        self.assertEqual(returned_ids, sorted(str(target.id) for target in targets))
+
+    def test_retrieve_targets_with_fields(self):
+        """
+        The test_retrieve_targets_with_fields function tests the fields query parameter of the list endpoint.
+        It asserts that only the requested fields are returned, fetched in a single query.
+
+        :param self: Represent the instance of the class
+        :return: The status code 200 and the targets with only the requested fields
+        :doc-author: Trelent
+        """
+        target = create_target()
+
+        with self.assertNumQueries(1):
+            res = self.client.get(TARGETS_URLS, {"fields": "id,latitude,longitude"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data,
+            [
+                {
+                    "id": str(target.id),
+                    "latitude": target.latitude,
+                    "longitude": target.longitude,
+                }
+            ],
+        )
+
+    def test_list_fast_path_matches_serializer(self):
+        """
+        The test_list_fast_path_matches_serializer function tests that the list, served from values_list() rows,
+        answers with the same bytes TargetSerializer and JSONRenderer would produce, with and without fields, even
+        when they are not requested in the order of the serializer.
+
+        :param self: Represent the instance of the class
+        :return: The content of the responses
+        :doc-author: Trelent
+        """
+        create_target(name="Natal")
+        create_target(name='São Paulo \u2028 "Centro" \U0001F600')
+
+        for fields in (None, ["name", "expiration_date"], ["name", "id"]):
+            targets = Target.objects.live()
+            params = {}
+            if fields is not None:
+                params["fields"] = ",".join(fields)
+            expected = JSONRenderer().render(
+                serializers.TargetSerializer(targets, many=True, fields=fields).data
+            )
+
+            res = self.client.get(TARGETS_URLS, params)
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(res.content, expected)
+
+    def test_fast_json_renderer_matches_json_renderer(self):
+        """
+        The test_fast_json_renderer_matches_json_renderer function tests that FastJSONRenderer gives the same bytes
+        as JSONRenderer, including for the data it hands back to JSONRenderer.
+
+        :param self: Represent the instance of the class
+        :return: The rendered data
+        :doc-author: Trelent
+        """
+        for data in (
+            [{"name": "a\u2028b\u2029c", "id": str(UUID(int=1)), "count": 3}],
+            {"updated_at": datetime.datetime(2024, 1, 2, 3, 4, 5, 678901)},
+            {"nested": [None, True, "\x00\t\n\u00e9"]},
+        ):
+            self.assertEqual(
+                FastJSONRenderer().render(data), JSONRenderer().render(data)
+            )
+        self.assertEqual(
+            FastJSONRenderer().render([1], "application/json; indent=4"),
+            JSONRenderer().render([1], "application/json; indent=4"),
+        )
+
+    def test_list_targets_in_columnar_format(self):
+        """
+        The test_list_targets_in_columnar_format function tests that the list is packed into the columnar format
+        when it is asked for through the format query parameter or the Accept header, with float64 coordinates by
+        default and float32 ones on request.
+
+        :param self: Represent the instance of the class
+        :return: The decoded payloads
+        :doc-author: Trelent
+        """
+        natal = create_target(name="Natal")
+        create_target(name="Lisbon", latitude="38.7223", longitude="-9.1393")
+        bbox = "-36,-6,-35,-5"
+
+        res = self.client.get(TARGETS_URLS, {"format": "columnar", "bbox": bbox})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], "application/vnd.targets.columnar")
+        self.assertEqual(
+            decode_target_columns(res.content),
+            [(natal.id, "Natal", natal.lat, natal.lng)],
+        )
+
+        res = self.client.get(
+            TARGETS_URLS,
+            {"bbox": bbox, "precision": "32"},
+            HTTP_ACCEPT="application/vnd.targets.columnar",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        [(target_id, name, lat, lng)] = decode_target_columns(res.content)
+        self.assertEqual((target_id, name), (natal.id, "Natal"))
+        self.assertAlmostEqual(lat, natal.lat, places=5)
+        self.assertAlmostEqual(lng, natal.lng, places=5)
+
+    def test_list_targets_in_columnar_format_with_invalid_precision(self):
+        """
+        The test_list_targets_in_columnar_format_with_invalid_precision function tests that errors of the columnar
+        format are answered as JSON.
+
+        :param self: Represent the instance of the class
+        :return: The status code 400
+        :doc-author: Trelent
+        """
+        res = self.client.get(TARGETS_URLS, {"format": "columnar", "precision": "16"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res["Content-Type"], "application/json")
+        self.assertIn("precision", res.json())
+
+    def test_retrieve_targets_with_unknown_fields(self):
+        """
+        The test_retrieve_targets_with_unknown_fields function tests that asking for fields that do not exist is
+        answered with a 400.
+
+        :param self: Represent the instance of the class
+        :return: The status code 400
+        :doc-author: Trelent
+        """
+        res = self.client.get(TARGETS_URLS, {"fields": "id,password"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("fields", res.data)
+
+    def test_retrieve_targets_with_empty_fields(self):
+        """
+        The test_retrieve_targets_with_empty_fields function tests that a fields query parameter without any field
+        is answered with a 400, with and without pagination, instead of a list of all or of no fields.
+
+        :param self: Represent the instance of the class
+        :return: The status code 400
+        :doc-author: Trelent
+        """
+        create_target()
+
+        for params in ({"fields": ","}, {"fields": " ", "page_size": 2}):
+            res = self.client.get(TARGETS_URLS, params)
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("fields", res.data)
+
+    def test_retrieve_nearest_targets(self):
+        """
+        The test_retrieve_nearest_targets function tests that the nearest endpoint returns the k closest live
+        targets to a point, closest first, with their distances, and that radius_km leaves the farther ones out.
+
+        :param self: Represent the instance of the class
+        :return: The nearest targets
+        :doc-author: Trelent
+        """
+        natal = create_target(name="Natal", latitude="-5.79", longitude="-35.2")
+        recife = create_target(name="Recife", latitude="-8.05", longitude="-34.9")
+        create_target(name="Lisbon", latitude="38.72", longitude="-9.14")
+
+        res = self.client.get(NEAREST_URL, {"lat": "-6", "lng": "-35", "k": "2"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [target["id"] for target in res.data], [str(natal.id), str(recife.id)]
+        )
+        self.assertAlmostEqual(res.data[0]["distance_km"], 32.17, places=2)
+        self.assertEqual(res.data[0]["name"], "Natal")
+
+        res = self.client.get(
+            NEAREST_URL, {"lat": "-6", "lng": "-35", "radius_km": "100"}
+        )
+
+        self.assertEqual([target["name"] for target in res.data], ["Natal"])
+
+    def test_retrieve_nearest_targets_with_invalid_parameters(self):
+        """
+        The test_retrieve_nearest_targets_with_invalid_parameters function tests that the nearest endpoint refuses
+        missing coordinates, a k out of range and a radius that is not positive.
+
+        :param self: Represent the instance of the class
+        :return: The status code 400 and the invalid parameters
+        :doc-author: Trelent
+        """
+        for params, invalid in (
+            ({"lng": "-35"}, "lat"),
+            ({"lat": "-6", "lng": "200"}, "lng"),
+            ({"lat": "-6", "lng": "-35", "k": "0"}, "k"),
+            ({"lat": "-6", "lng": "-35", "radius_km": "-1"}, "radius_km"),
+        ):
+            res = self.client.get(NEAREST_URL, params)
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn(invalid, res.data)
+
+    def test_bulk_create_targets(self):
+        """
+        The test_bulk_create_targets function tests the POST of the bulk endpoint.
+        It sends two valid targets and an invalid one, and asserts that the valid ones are created with a constant
+        number of queries while the invalid one is reported with its index.
+
+        :param self: Represent the instance of the class
+        :return: The status code 201, the created targets and the errors
+        :doc-author: Trelent
+        """
+        payload = [
+            {"name": "First", "latitude": "-5.9241953", "longitude": "-35.2115504"},
+            {"name": "", "latitude": "-5.9241953", "longitude": "-35.2115504"},
+            {"name": "Third", "latitude": "-23.5489", "longitude": "-46.6388"},
+        ]
+
+        # One INSERT for the targets and one for the change log, no matter how many targets.
+        with self.assertNumQueries(2):
+            res = self.client.post(BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [target["name"] for target in res.data["created"]], ["First", "Third"]
+        )
+        self.assertEqual(len(res.data["errors"]), 1)
+        self.assertEqual(res.data["errors"][0]["index"], 1)
+        self.assertIn("name", res.data["errors"][0]["errors"])
+
+        self.assertEqual(Target.objects.count(), 2)
+        self.assertEqual(Target.objects.get(name="Third").lat, -23.5489)
+
+    def test_bulk_create_targets_all_invalid(self):
+        """
+        The test_bulk_create_targets_all_invalid function tests that a bulk POST with only invalid targets, or with
+        a body that is not a list, is answered with a 400.
+
+        :param self: Represent the instance of the class
+        :return: The status code 400
+        :doc-author: Trelent
+        """
+        yesterday = self.today - datetime.timedelta(days=1)
+        payload = [
+            {
+                "name": "Test",
+                "latitude": "-5.9241953",
+                "longitude": "-35.2115504",
+                "expiration_date": yesterday.isoformat(),
+            }
+        ]
+
+        res = self.client.post(BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("expiration_date", res.data["errors"][0]["errors"])
+
+        res = self.client.post(BULK_URL, {"name": "Test"}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Target.objects.exists())
+
+    def test_bulk_update_targets(self):
+        """
+        The test_bulk_update_targets function tests the PATCH of the bulk endpoint.
+        It updates two targets and sends an unknown id, and asserts that the targets are updated while the unknown
+        id is reported with its index.
+
+        :param self: Represent the instance of the class
+        :return: The status code 200, the updated targets and the errors
+        :doc-author: Trelent
+        """
+        first = create_target()
+        second = create_target()
+
+        payload = [
+            {"id": str(first.id), "name": "First update"},
+            {"id": str(second.id), "latitude": "10.5"},
+            {"id": "0d3c3e38-2b36-4c4c-9e68-1df5e8d3a1f1", "name": "Missing"},
+        ]
+
+        res = self.client.patch(BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["updated"]), 2)
+        self.assertEqual(res.data["errors"][0]["index"], 2)
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.name, "First update")
+        self.assertEqual(second.latitude, "10.5")
+        self.assertEqual(second.lat, 10.5)
+
+    def test_bulk_delete_targets(self):
+        """
+        The test_bulk_delete_targets function tests the DELETE of the bulk endpoint.
+        It deletes two of three targets in a single request and asserts that only the third one is left.
+
+        :param self: Represent the instance of the class
+        :return: The status code 200 and the amount of deleted targets
+        :doc-author: Trelent
+        """
+        targets = [create_target() for _ in range(3)]
+
+        res = self.client.delete(
+            BULK_URL,
+            {"ids": [str(target.id) for target in targets[:2]]},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["deleted"], 2)
+        self.assertEqual(list(Target.objects.all()), [targets[2]])
+
+    @override_settings(TARGETS_BULK_MAX_ITEMS=2)
+    def test_bulk_delete_too_many_targets(self):
+        """
+        The test_bulk_delete_too_many_targets function tests that a bulk DELETE with more ids than the
+        TARGETS_BULK_MAX_ITEMS setting is answered with a 400, without deleting any target.
+
+        :param self: Represent the instance of the class
+        :return: The status code 400
+        :doc-author: Trelent
+        """
+        targets = [create_target() for _ in range(3)]
+
+        res = self.client.delete(
+            BULK_URL, {"ids": [str(target.id) for target in targets]}, format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("ids", res.data)
+        self.assertEqual(Target.objects.count(), 3)
+
+    def test_export_targets(self):
+        """
+        The test_export_targets function tests the export endpoint in its three formats.
+        It creates a live and an expired target and asserts that only the live one is streamed, with the same fields
+        returned by the list endpoint.
+
+        :param self: Represent the instance of the class
+        :return: The status code 200 and the exported targets
+        :doc-author: Trelent
+        """
+        create_target()
+
+        with freeze_time(custom_today()):
+            target = create_target(
+                name="Live", expiration_date=custom_today() + datetime.timedelta(days=1)
+            )
+            expected = dict(serializers.TargetSerializer(target).data)
+
+            res = self.client.get(EXPORT_URL)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(res["Content-Type"], "application/x-ndjson")
+            lines = b"".join(res.streaming_content).decode().splitlines()
+            self.assertEqual([json.loads(line) for line in lines], [expected])
+
+            res = self.client.get(EXPORT_URL, {"output": "csv"})
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            content = b"".join(res.streaming_content).decode()
+            self.assertEqual(list(csv.DictReader(io.StringIO(content))), [expected])
+
+            res = self.client.get(EXPORT_URL, {"output": "geojson"})
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            collection = json.loads(b"".join(res.streaming_content))
+            self.assertEqual(len(collection["features"]), 1)
+            self.assertEqual(collection["features"][0]["properties"], expected)
+            self.assertEqual(
+                collection["features"][0]["geometry"]["coordinates"],
+                [target.lng, target.lat],
+            )
+
+    def test_export_targets_with_invalid_output(self):
+        """
+        The test_export_targets_with_invalid_output function tests that unknown export formats are answered with
+        a 400.
+
+        :param self: Represent the instance of the class
+        :return: The status code 400
+        :doc-author: Trelent
+        """
+        res = self.client.get(EXPORT_URL, {"output": "xml"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("output", res.data)
+
+    async def test_export_targets_under_asgi(self):
+        """
+        The test_export_targets_under_asgi function tests that the ASGI application gets the export as an
+        asynchronous stream, which it sends as it is read instead of buffering it.
+
+        :param self: Represent the instance of the class
+        :return: The status code 200 and the exported targets
+        :doc-author: Trelent
+        """
+        with freeze_time(custom_today()):
+            target = await sync_to_async(create_target)(
+                expiration_date=custom_today() + datetime.timedelta(days=1)
+            )
+
+            res = await AsyncClient().get(EXPORT_URL)
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertTrue(res.is_async)
+            content = b"".join([chunk async for chunk in res.streaming_content])
+        rows = [json.loads(line) for line in content.decode().splitlines()]
+        self.assertEqual([row["id"] for row in rows], [str(target.id)])
+
+    def test_list_response_is_cached(self):
+        """
+        The test_list_response_is_cached function tests the response cache of the list endpoint.
+        It asserts that a second identical request is answered from the cache without touching the database, and that
+        creating a target, one by one or in bulk, invalidates the cached response.
+
+        :param self: Represent the instance of the class
+        :return: The cached and the fresh responses
+        :doc-author: Trelent
+        """
+        create_target()
+        hits = response_cache_stats.as_dict()["hits"]
+
+        res = self.client.get(TARGETS_URLS)
+        self.assertEqual(res["X-Cache"], "MISS")
+
+        with self.assertNumQueries(0):
+            cached_res = self.client.get(TARGETS_URLS)
+        self.assertEqual(cached_res["X-Cache"], "HIT")
+        self.assertEqual(cached_res.content, res.content)
+        self.assertEqual(response_cache_stats.as_dict()["hits"], hits + 1)
+
+        create_target()
+        res = self.client.get(TARGETS_URLS)
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(len(res.data), 2)
+
+        self.client.post(
+            BULK_URL,
+            [{"name": "Bulk", "latitude": "-5.9", "longitude": "-35.2"}],
+            format="json",
+        )
+        res = self.client.get(TARGETS_URLS)
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(len(res.data), 3)
+
+    def test_list_response_cache_expires_at_midnight(self):
+        """
+        The test_list_response_cache_expires_at_midnight function tests that cached responses are not served after
+        the date changes, since that is when targets expire.
+
+        :param self: Represent the instance of the class
+        :return: The responses before and after midnight
+        :doc-author: Trelent
+        """
+        create_target()
+
+        res = self.client.get(TARGETS_URLS)
+        self.assertEqual(len(res.data), 1)
+
+        with freeze_time(custom_today()):
+            res = self.client.get(TARGETS_URLS)
+
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(res.data, [])
+
+    def test_list_conditional_get(self):
+        """
+        The test_list_conditional_get function tests the ETag of the list endpoint.
+        It asserts that sending back the ETag is answered with a 304 without querying the database, and that creating
+        a target changes the ETag.
+
+        :param self: Represent the instance of the class
+        :return: The 304 and the 200 responses
+        :doc-author: Trelent
+        """
+        create_target()
+
+        res = self.client.get(TARGETS_URLS)
+        etag = res["ETag"]
+
+        with self.assertNumQueries(0):
+            res = self.client.get(TARGETS_URLS, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b"")
+
+        res = self.client.get(
+            TARGETS_URLS, {"bbox": "-36,-6,-35,-5"}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        create_target()
+
+        res = self.client.get(TARGETS_URLS, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+        self.assertEqual(len(res.data), 2)
+
+    def test_list_last_modified_after_its_second(self):
+        """
+        The test_list_last_modified_after_its_second function tests that the list endpoint only sends Last-Modified
+        once the second of the last write is over, since another write in that second would have the same one, and
+        that it is answered with a 304 until the next write.
+
+        :param self: Represent the instance of the class
+        :return: The 304 and the 200 responses
+        :doc-author: Trelent
+        """
+        with freeze_time(timezone.now()) as frozen:
+            create_target()
+
+            res = self.client.get(TARGETS_URLS)
+            self.assertNotIn("Last-Modified", res)
+
+            frozen.tick(1)
+            res = self.client.get(TARGETS_URLS)
+            last_modified = res["Last-Modified"]
+
+            res = self.client.get(TARGETS_URLS, HTTP_IF_MODIFIED_SINCE=last_modified)
+            self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+            frozen.tick(1)
+            create_target()
+
+            res = self.client.get(TARGETS_URLS, HTTP_IF_MODIFIED_SINCE=last_modified)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertNotIn("Last-Modified", res)
+
+    def test_retrieve_conditional_get(self):
+        """
+        The test_retrieve_conditional_get function tests the ETag and the Last-Modified of the detail endpoint.
+        It asserts that they are answered with a 304 until the target is updated.
+
+        :param self: Represent the instance of the class
+        :return: The 304 and the 200 responses
+        :doc-author: Trelent
+        """
+        with freeze_time(timezone.now()) as frozen:
+            target = create_target()
+            frozen.tick(1)
+
+            res = self.client.get(detail_url(target.id))
+            etag = res["ETag"]
+            last_modified = res["Last-Modified"]
+
+            res = self.client.get(detail_url(target.id), HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+            res = self.client.get(
+                detail_url(target.id), HTTP_IF_MODIFIED_SINCE=last_modified
+            )
+            self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+            self.client.patch(detail_url(target.id), {"name": "Testing update"})
+
+            res = self.client.get(
+                detail_url(target.id), HTTP_IF_MODIFIED_SINCE=last_modified
+            )
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(res.data["name"], "Testing update")
+            self.assertNotIn("Last-Modified", res)
+
+    def test_retrieve_target_changes(self):
+        """
+        The test_retrieve_target_changes function tests the change feed.
+        It takes a token, then creates, updates and deletes targets, and asserts that the feed returns only the last
+        change of each target since the token, with the current data of the live ones and tombstones for the
+        deleted ones.
+
+        :param self: Represent the instance of the class
+        :return: The changes since the token
+        :doc-author: Trelent
+        """
+        untouched = create_target()
+        updated = create_target()
+        deleted = create_target()
+
+        res = self.client.get(CHANGES_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["changes"], [])
+        token = res.data["next"]
+
+        created = create_target(name="Created")
+        self.client.patch(detail_url(updated.id), {"name": "Updated"})
+        self.client.delete(detail_url(deleted.id))
+        self.client.patch(detail_url(created.id), {"name": "Created and updated"})
+
+        res = self.client.get(CHANGES_URL, {"since": token})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertFalse(res.data["has_more"])
+        changes = {change["id"]: change for change in res.data["changes"]}
+        self.assertNotIn(str(untouched.id), changes)
+        self.assertEqual(changes[str(updated.id)]["action"], "updated")
+        self.assertEqual(changes[str(updated.id)]["target"]["name"], "Updated")
+        self.assertEqual(changes[str(deleted.id)]["action"], "deleted")
+        self.assertIsNone(changes[str(deleted.id)]["target"])
+        self.assertEqual(changes[str(created.id)]["action"], "updated")
+        self.assertEqual(
+            changes[str(created.id)]["target"]["name"], "Created and updated"
+        )
+
+        res = self.client.get(CHANGES_URL, {"since": res.data["next"]})
+        self.assertEqual(res.data["changes"], [])
+
+    def test_retrieve_target_changes_with_expired_targets(self):
+        """
+        The test_retrieve_target_changes_with_expired_targets function tests that the targets that expired because
+        the date changed since the token are returned as expired tombstones.
+
+        :param self: Represent the instance of the class
+        :return: The expired tombstones
+        :doc-author: Trelent
+        """
+        target = create_target()
+        token = self.client.get(CHANGES_URL).data["next"]
+
+        with freeze_time(custom_today()):
+            res = self.client.get(CHANGES_URL, {"since": token})
+
+        self.assertEqual(
+            res.data["changes"],
+            [{"id": str(target.id), "action": "expired", "target": None}],
+        )
+
+    @override_settings(TARGETS_CHANGES_PAGE_SIZE=2)
+    def test_retrieve_target_changes_with_paged_expired_targets(self):
+        """
+        The test_retrieve_target_changes_with_paged_expired_targets function tests that the expired tombstones are
+        paged with the change token, TARGETS_CHANGES_PAGE_SIZE at a time.
+
+        :param self: Represent the instance of the class
+        :return: The expired tombstones of each page
+        :doc-author: Trelent
+        """
+        targets = [create_target() for _ in range(3)]
+        token = self.client.get(CHANGES_URL).data["next"]
+
+        with freeze_time(custom_today()):
+            first = self.client.get(CHANGES_URL, {"since": token}).data
+            second = self.client.get(CHANGES_URL, {"since": first["next"]}).data
+            third = self.client.get(CHANGES_URL, {"since": second["next"]}).data
+
+        self.assertTrue(first["has_more"])
+        self.assertEqual(len(first["changes"]), 2)
+        self.assertFalse(second["has_more"])
+        self.assertEqual(
+            {change["id"] for change in first["changes"] + second["changes"]},
+            {str(target.id) for target in targets},
+        )
+        self.assertEqual(third["changes"], [])
+
+    def test_retrieve_target_changes_with_invalid_token(self):
+        """
+        The test_retrieve_target_changes_with_invalid_token function tests that malformed tokens are answered with a
+        400, and tokens older than the change log retention with a 410.
+
+        :param self: Represent the instance of the class
+        :return: The status codes 400 and 410
+        :doc-author: Trelent
+        """
+        res = self.client.get(CHANGES_URL, {"since": "not-a-token"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        old_token = encode_change_token(
+            (0, 0), self.today - datetime.timedelta(days=30)
+        )
+        res = self.client.get(CHANGES_URL, {"since": old_token})
+        self.assertEqual(res.status_code, status.HTTP_410_GONE)
+
+    async def test_stream_target_events(self):
+        """
+        The test_stream_target_events function tests that the events endpoint answers with an event stream when it
+        is served by the ASGI application.
+
+        :param self: Represent the instance of the class
+        :return: The headers and the first chunk of the stream
+        :doc-author: Trelent
+        """
+        res = await AsyncClient().get(EVENTS_URL, {"bbox": "-36,-6,-35,-5"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], "text/event-stream")
+        self.assertEqual(res["Cache-Control"], "no-cache")
+        stream = aiter(res.streaming_content)
+        self.assertTrue((await anext(stream)).startswith(b"retry: "))
+        await stream.aclose()
+
+    async def test_stream_target_events_with_invalid_bbox(self):
+        """
+        The test_stream_target_events_with_invalid_bbox function tests that the events endpoint refuses malformed
+        bounding boxes before opening the stream.
+
+        :param self: Represent the instance of the class
+        :return: The status code 400
+        :doc-author: Trelent
+        """
+        res = await AsyncClient().get(EVENTS_URL, {"bbox": "1,2,3"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("bbox", res.json())
+
+    def test_stream_target_events_requires_asgi(self):
+        """
+        The test_stream_target_events_requires_asgi function tests that the events endpoint is refused when it is
+        served by the WSGI application, which would hold a thread for each subscriber.
+
+        :param self: Represent the instance of the class
+        :return: The status code 501
+        :doc-author: Trelent
+        """
+        res = self.client.get(EVENTS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+
+    async def test_async_list_matches_sync_list(self):
+        """
+        The test_async_list_matches_sync_list function tests that the async list endpoint answers with the same
+        bytes as the list of the sync viewset, with and without the bbox and fields query parameters.
+
+        :param self: Represent the instance of the class
+        :return: The responses of both endpoints
+        :doc-author: Trelent
+        """
+        await sync_to_async(create_target)(name="Natal")
+        await sync_to_async(create_target)(
+            name="Lisbon", latitude="38.7223", longitude="-9.1393"
+        )
+        client = AsyncClient()
+
+        for params in ({}, {"bbox": "-36,-6,-35,-5"}, {"fields": "name"}):
+            sync_res = await sync_to_async(self.client.get)(TARGETS_URLS, params)
+            async_res = await client.get(ASYNC_TARGETS_URL, params)
+
+            self.assertEqual(async_res.status_code, status.HTTP_200_OK)
+            self.assertEqual(async_res.content, sync_res.content)
+
+        res = await client.get(ASYNC_TARGETS_URL, {"bbox": "1,2,3"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_async_retrieve_target(self):
+        """
+        The test_async_retrieve_target function tests that the async detail endpoint answers with a live target, and
+        with a 404 for an expired one.
+
+        :param self: Represent the instance of the class
+        :return: The status codes 200 and 404
+        :doc-author: Trelent
+        """
+        target = await sync_to_async(create_target)()
+        expired = await Target.objects.acreate(
+            name="Expired", latitude="1", longitude="1", expiration_date=self.today
+        )
+        client = AsyncClient()
+
+        res = await client.get(reverse("target:target-async-detail", args=[target.id]))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), serializers.TargetSerializer(target).data)
+
+        res = await client.get(reverse("target:target-async-detail", args=[expired.id]))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_async_create_target(self):
+        """
+        The test_async_create_target function tests that the async create endpoint applies the same validation as
+        the sync one, and creates valid targets.
+
+        :param self: Represent the instance of the class
+        :return: The status codes 201 and 400
+        :doc-author: Trelent
+        """
+        client = AsyncClient()
+        payload = {"name": "Test", "latitude": "-5.9241953", "longitude": "-35.2115504"}
+
+        res = await client.post(
+            ASYNC_TARGETS_URL, payload, content_type="application/json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(await Target.objects.filter(id=res.json()["id"]).aexists())
+
+        res = await client.post(
+            ASYNC_TARGETS_URL,
+            {**payload, "expiration_date": self.today.isoformat()},
+            content_type="application/json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("expiration_date", res.json())
+
+        res = await client.post(ASYNC_TARGETS_URL, "{", content_type="application/json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(
+    DATABASE_REPLICAS=["replica_1"],
+    DATABASE_REPLICA_STICKY_SECONDS=5,
+    TARGETS_CACHE_TIMEOUT=0,
+)
+class TestReplicaReads(TestCase):
+    """
+    The replica is an in-memory SQLite database of its own, not a copy of the primary, so the tests can tell which
+    database answered. It is only registered while these tests run, since the test runner sets up the databases of
+    the settings before.
+    """
+
+    replicas = ("replica_1",)
+
+    @classmethod
+    def setUpClass(cls):
+        for alias in cls.replicas:
+            connections.settings[alias] = connections.configure_settings(
+                {
+                    DEFAULT_DB_ALIAS: {},
+                    alias: {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+                }
+            )[alias]
+            with connections[alias].schema_editor() as editor:
+                for model in apps.get_app_config("core").get_models():
+                    editor.create_model(model)
+        cls.databases = {DEFAULT_DB_ALIAS, *cls.replicas}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.databases = {DEFAULT_DB_ALIAS}
+        for alias in cls.replicas:
+            connections[alias].connection.close()
+            del connections[alias]
+            del connections.settings[alias]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.primary_target = create_target(name="Primary")
+        self.replica_target = Target.objects.db_manager("replica_1").create_target(
+            name="Replica", latitude="-5.9241953", longitude="-35.2115504"
+        )
+
+    def test_reads_go_to_replica(self):
+        """
+        The test_reads_go_to_replica function tests that the list, retrieve and export endpoints read the targets
+        from the replica.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        res = self.client.get(TARGETS_URLS)
+        self.assertEqual([target["name"] for target in res.json()], ["Replica"])
+
+        res = self.client.get(detail_url(self.replica_target.id))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        res = self.client.get(detail_url(self.primary_target.id))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+        res = self.client.get(EXPORT_URL)
+        rows = [
+            json.loads(line) for line in b"".join(res.streaming_content).splitlines()
+        ]
+        self.assertEqual([row["name"] for row in rows], ["Replica"])
+
+    def test_writes_go_to_primary_and_stick(self):
+        """
+        The test_writes_go_to_primary_and_stick function tests that a created target is written to the primary,
+        and that the client that created it reads from the primary until the sticky window is over.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        payload = {
+            "name": "Created",
+            "latitude": "-5.9241953",
+            "longitude": "-35.2115504",
+        }
+
+        with freeze_time() as frozen_time:
+            res = self.client.post(TARGETS_URLS, payload)
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            self.assertIn(PRIMARY_COOKIE, res.cookies)
+            self.assertTrue(Target.objects.filter(name="Created").exists())
+            self.assertFalse(
+                Target.objects.using("replica_1").filter(name="Created").exists()
+            )
+
+            res = self.client.get(TARGETS_URLS)
+            self.assertEqual(
+                sorted(target["name"] for target in res.json()), ["Created", "Primary"]
+            )
+            res = APIClient().get(TARGETS_URLS)
+            self.assertEqual([target["name"] for target in res.json()], ["Replica"])
+
+            frozen_time.tick(datetime.timedelta(seconds=6))
+            res = self.client.get(TARGETS_URLS)
+            self.assertEqual([target["name"] for target in res.json()], ["Replica"])
+
+    def test_reads_do_not_stick(self):
+        res = self.client.get(TARGETS_URLS)
+
+        self.assertNotIn(PRIMARY_COOKIE, res.cookies)
+
+    @override_settings(TARGETS_CACHE_TIMEOUT=300)
+    def test_lagging_reads_are_not_cached(self):
+        """
+        The test_lagging_reads_are_not_cached function tests that a list read from the replica right after a write
+        on the primary, which the replica misses, is neither cached nor validated under the new generation, and that
+        it is once the replication lag window is over.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        # Generations left by the other tests may be ahead of the frozen clock.
+        get_targets_cache().clear()
+        with freeze_time() as frozen_time:
+            create_target(name="Written")
+
+            res = self.client.get(TARGETS_URLS)
+            self.assertEqual([target["name"] for target in res.json()], ["Replica"])
+            self.assertNotIn("ETag", res)
+            res = self.client.get(TARGETS_URLS)
+            self.assertEqual(res["X-Cache"], "MISS")
+
+            frozen_time.tick(datetime.timedelta(seconds=6))
+            res = self.client.get(TARGETS_URLS)
+            self.assertIn("ETag", res)
+            res = self.client.get(TARGETS_URLS)
+            self.assertEqual(res["X-Cache"], "HIT")
+
+    def test_export_command_reads_from_replica(self):
+        """
+        The test_export_command_reads_from_replica function tests that the export_targets command reads from a
+        replica, unless a database is given.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        output = io.StringIO()
+        call_command("export_targets", stdout=output)
+        self.assertEqual(
+            [json.loads(line)["name"] for line in output.getvalue().splitlines()],
+            ["Replica"],
+        )
+
+        output = io.StringIO()
+        call_command("export_targets", "--database", "default", stdout=output)
+        self.assertEqual(
+            [json.loads(line)["name"] for line in output.getvalue().splitlines()],
+            ["Primary"],
+        )
+
+
+@override_settings(TARGETS_CACHE_TIMEOUT=0)
+class TestTargetsQueryBudget(TestCase):
+    """
+    Pins how many SQL queries each read of the target API runs, whatever the number of targets, so a change that
+    makes them run one query per target fails here.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def create_targets(self, count: int):
+        targets, _ = Target.objects.bulk_create_targets(
+            {
+                "name": f"Test {index}",
+                "latitude": "-5.9241953",
+                "longitude": "-35.2115504",
+            }
+            for index in range(count)
+        )
+        return targets
+
+    def test_list_queries(self):
+        """
+        The test_list_queries function tests that every variant of the list runs a single query, with 1 target and
+        with 50 targets.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        for count in (1, 49):
+            self.create_targets(count)
+            for params in (
+                {},
+                {"fields": "id,name"},
+                {"page_size": 10},
+                {"format": "columnar"},
+                {"bbox": "-36,-6,-35,-5"},
+            ):
+                with self.subTest(count=count, params=params):
+                    with QueryBudget(max_queries=1):
+                        res = self.client.get(TARGETS_URLS, params)
+                    self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_retrieve_queries(self):
+        targets = self.create_targets(10)
+
+        with QueryBudget(max_queries=1):
+            res = self.client.get(detail_url(targets[0].id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+
+class TestSnapshotReads(TestCase):
+    """
+    Checks that the list and the detail answered from the snapshot of the live targets are the same as the ones
+    answered from the database, without querying it.
+    """
+
+    def setUp(self):
+        """
+        The setUp function creates targets, one of them expired and one outside the viewport, and builds a
+        snapshot of them in a temporary directory.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        self.client = APIClient()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "targets.snapshot")
+
+        self.target = create_target(name="Natal ✓")
+        create_target(name="Lisboa", latitude="38.7223", longitude="-9.1393")
+        expired = create_target(name="Expired")
+        Target.objects.filter(id=expired.id).update(
+            expiration_date=datetime.date.today()
+        )
+        self.expired = expired
+        build_snapshot(self.path)
+
+    @override_settings(TARGETS_CACHE_TIMEOUT=0)
+    def test_list(self):
+        """
+        The test_list function tests that every variant of the unpaginated list answers the same from the snapshot
+        as from the database, without any query.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        for params in (
+            {},
+            {"fields": "id,name"},
+            {"format": "columnar"},
+            {"bbox": "-36,-6,-35,-5"},
+        ):
+            with self.subTest(params=params):
+                expected = self.client.get(TARGETS_URLS, params)
+                with override_settings(TARGETS_SNAPSHOT_PATH=self.path):
+                    with self.assertNumQueries(0):
+                        res = self.client.get(TARGETS_URLS, params)
+
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+                if params.get("format") == "columnar":
+                    self.assertCountEqual(
+                        decode_target_columns(res.content),
+                        decode_target_columns(expected.content),
+                    )
+                else:
+                    self.assertCountEqual(res.json(), expected.json())
+
+    def test_retrieve(self):
+        """
+        The test_retrieve function tests that a target is answered from the snapshot with the same body and ETag
+        as from the database, and that an expired target is not found.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        expected = self.client.get(detail_url(self.target.id))
+
+        with override_settings(TARGETS_SNAPSHOT_PATH=self.path):
+            with self.assertNumQueries(0):
+                res = self.client.get(detail_url(self.target.id))
+                missing = self.client.get(detail_url(self.expired.id))
+
+        self.assertEqual(res.json(), expected.json())
+        self.assertEqual(res["ETag"], expected["ETag"])
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(TARGETS_CACHE_TIMEOUT=0)
+    def test_write_falls_back_to_database(self):
+        """
+        The test_write_falls_back_to_database function tests that once a target is written, the reads go to the
+        database until the snapshot is built again.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        target = create_target(name="New")
+
+        with override_settings(TARGETS_SNAPSHOT_PATH=self.path):
+            res = self.client.get(detail_url(target.id))
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+            build_snapshot(self.path)
+            with self.assertNumQueries(0):
+                res = self.client.get(TARGETS_URLS)
+
+        self.assertIn("New", [item["name"] for item in res.json()])
@@ -12,4 +12,14 @@ router.register("", views.TargetViewSet)
 
 app_name = "target"
 
-urlpatterns = [path("", include(router.urls))]
+urlpatterns = [
+    # Declared before the router, whose detail route would take events/ and async/ for target ids.
+    path("events/", views.target_events, name="target-events"),
+    path("async/", views.TargetAsyncListView.as_view(), name="target-async-list"),
+    path(
+        "async/<uuid:pk>/",
+        views.TargetAsyncDetailView.as_view(),
+        name="target-async-detail",
+    ),
+    path("", include(router.urls)),
+]
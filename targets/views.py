@@ -1,22 +1,632 @@
-import datetime
+import uuid
 
-from rest_framework import viewsets
+from django.conf import settings
+from django.db.models import Avg, Count, F
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.utils.cache import get_conditional_response
+from django.db.models.functions import Floor
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ParseError, ValidationError
+from rest_framework.parsers import JSONParser
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
 
+from core.events import get_broker, stream_events
+from core.exporters import EXPORTERS, export_targets, iterate_in_thread
+from core.db.cursors import iterate_queryset
+from core.metrics import measure_serialization
 from core.models import Target
+from core.routers import read_from_replica
+from core.snapshot import get_current_snapshot
+from core.utils import get_expiration_date_default
 from targets import serializers
+from targets.cache import cache_response
+from targets.changes import get_changes_since, get_current_change_token
+from targets.conditional import (
+    conditional_table_response,
+    get_instance_validators,
+    set_validators,
+)
+from targets.columnar import COLUMNS, encode_target_columns
+from targets.filters import (
+    parse_batch_size,
+    parse_bbox,
+    parse_fields,
+    parse_k,
+    parse_point,
+    parse_precision,
+    parse_radius,
+    parse_zoom,
+)
+from targets.pagination import TargetCursorPagination
+from targets.renderers import ColumnarRenderer, FastJSONRenderer
+
+# A 256px map tile is split in 4x4 cells, so each cluster covers roughly 64x64 pixels on screen.
+CLUSTER_CELLS_PER_TILE = 4
 
 
 class TargetViewSet(viewsets.ModelViewSet):
     serializer_class = serializers.TargetSerializer
     queryset = Target.objects.all()
+    pagination_class = TargetCursorPagination
+    bbox_actions = ("list", "clusters", "export")
 
     def get_queryset(self):
         """
         The get_queryset function is used to filter the queryset.
         In this case, we are filtering out all expired jobs from the queryset.
+        When listing with the bbox query parameter, only the targets inside that viewport are returned.
+        When listing with the fields query parameter, only those columns are fetched, as dictionaries.
 
         :param self: Refer to the current instance of the class
         :return: The queryset attribute of the class
         :doc-author: Trelent
         """
-        return self.queryset.filter(expiration_date__gt=datetime.date.today())
+        queryset = self.queryset.live()
+
+        bbox = self.get_bbox()
+        if bbox and self.action in self.bbox_actions:
+            queryset = queryset.in_bbox(*bbox)
+
+        fields = self.get_requested_fields()
+        if fields is not None:
+            # The id is always fetched, since it is the key of the cursor pagination.
+            queryset = queryset.values("id", *fields)
+
+        return queryset
+
+    def dispatch(self, request, *args, **kwargs):
+        """
+        The dispatch function answers the requests that only read targets from a read replica, when there is one.
+        Everything else, and the reads done while writing, goes to the primary.
+
+        :param self: Refer to the current instance of the class
+        :param request: The request being answered
+        :param *args: The positional arguments of the route
+        :param **kwargs: The keyword arguments of the route
+        :return: The response of the action
+        :doc-author: Trelent
+        """
+        if request.method not in SAFE_METHODS:
+            return super().dispatch(request, *args, **kwargs)
+        with read_from_replica():
+            return super().dispatch(request, *args, **kwargs)
+
+    @conditional_table_response
+    @cache_response(formats=("json", ColumnarRenderer.format))
+    def list(self, request, *args, **kwargs):
+        """
+        The list function answers with the live targets. Unless a page is asked for, the targets are serialized by
+        TargetValuesSerializer straight from the rows of the database, which gives the same output as
+        TargetSerializer for a fraction of the CPU.
+        In the columnar format, every target of the viewport is packed into a single binary payload with only
+        what the map needs: the id, the name and the coordinates.
+
+        :param self: Refer to the current instance of the class
+        :param request: The request being answered
+        :param *args: The positional arguments of the route
+        :param **kwargs: The keyword arguments of the route
+        :return: A response with the targets
+        :doc-author: Trelent
+        """
+        snapshot = get_current_snapshot()
+        if request.accepted_renderer.format == ColumnarRenderer.format:
+            precision = parse_precision(request.query_params.get("precision"))
+            if snapshot is not None:
+                rows = snapshot.rows(COLUMNS, self.get_bbox(), located=True)
+                return Response(encode_target_columns(rows, precision))
+            queryset = self.filter_queryset(self.get_queryset()).filter(
+                lat__isnull=False, lng__isnull=False
+            )
+            rows = iterate_queryset(
+                queryset.values_list(*COLUMNS), settings.TARGETS_EXPORT_CHUNK_SIZE
+            )
+            return Response(encode_target_columns(rows, precision))
+
+        if self.paginator is not None and self.paginator.get_page_size(request):
+            return super().list(request, *args, **kwargs)
+
+        if snapshot is not None:
+            serializer = serializers.TargetValuesSerializer(
+                fields=self.get_requested_fields()
+            )
+            with measure_serialization():
+                rows = snapshot.rows(serializer.fields, self.get_bbox())
+                return Response(serializer.to_representation(rows))
+
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = serializers.TargetValuesSerializer(
+            queryset, fields=self.get_requested_fields()
+        )
+        return Response(serializer.data)
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        The retrieve function answers with a single target, or with 304 Not Modified when the ETag or the
+        Last-Modified sent by the client show it already has the current version of the target.
+
+        :param self: Refer to the current instance of the class
+        :param request: The request being answered
+        :param *args: The positional arguments of the route
+        :param **kwargs: The keyword arguments of the route, with the id of the target
+        :return: A response with the target, or a 304 response
+        :doc-author: Trelent
+        """
+        instance = self.get_snapshot_object() or self.get_object()
+        etag, last_modified = get_instance_validators(request, instance)
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=int(last_modified)
+        )
+        if response is None:
+            response = Response(self.get_serializer(instance).data)
+
+        return set_validators(response, etag, last_modified)
+
+    def get_snapshot_object(self):
+        """
+        The get_snapshot_object function looks the target of a detail request up in the snapshot of the live
+        targets, when it is current, so it is answered without querying the database.
+
+        :param self: Refer to the current instance of the class
+        :return: The target, or None when the database should be queried
+        :doc-author: Trelent
+        """
+        snapshot = get_current_snapshot()
+        if snapshot is None:
+            return None
+        try:
+            target_id = uuid.UUID(str(self.kwargs[self.lookup_field]))
+        except ValueError:
+            return None
+        index = snapshot.find(target_id)
+        if index is None or not snapshot.is_live(index):
+            raise Http404("No Target matches the given query.")
+        return snapshot.get_target(index)
+
+    def get_bbox(self):
+        """
+        The get_bbox function returns the viewport of the bbox query parameter.
+
+        :param self: Refer to the current instance of the class
+        :return: A tuple with min_lng, min_lat, max_lng and max_lat, or None when there is no bbox
+        :doc-author: Trelent
+        """
+        bbox = self.request.query_params.get("bbox")
+        return parse_bbox(bbox) if bbox else None
+
+    def get_renderers(self):
+        """
+        The get_renderers function renders the list, whose data only has strings, with FastJSONRenderer, and also
+        offers it in the columnar format.
+
+        :param self: Refer to the current instance of the class
+        :return: The list of renderers
+        :doc-author: Trelent
+        """
+        renderers = super().get_renderers()
+        if self.action != "list":
+            return renderers
+        return [
+            FastJSONRenderer() if type(renderer) is JSONRenderer else renderer
+            for renderer in renderers
+        ] + [ColumnarRenderer()]
+
+    def get_requested_fields(self):
+        """
+        The get_requested_fields function returns the fields asked for through the fields query parameter of the
+        list endpoint.
+
+        :param self: Refer to the current instance of the class
+        :return: A list with the requested fields, or None when every field should be returned
+        :doc-author: Trelent
+        """
+        fields = self.request.query_params.get("fields")
+        if not fields or self.action != "list":
+            return None
+        return parse_fields(fields, serializers.TargetSerializer.Meta.fields)
+
+    def get_serializer(self, *args, **kwargs):
+        """
+        The get_serializer function forwards the requested fields to the serializer, so the projection done on
+        the queryset is also applied to the response.
+
+        :param self: Refer to the current instance of the class
+        :param *args: Pass the instance or the data to the serializer
+        :param **kwargs: Pass the remaining arguments to the serializer
+        :return: The serializer instance
+        :doc-author: Trelent
+        """
+        fields = self.get_requested_fields()
+        if fields is not None:
+            kwargs.setdefault("fields", fields)
+        return super().get_serializer(*args, **kwargs)
+
+    def get_serializer_context(self):
+        """
+        The get_serializer_context function adds the minimum expiration date to the serializer context, so it is
+        computed once per request instead of once per validated target.
+
+        :param self: Refer to the current instance of the class
+        :return: The context passed to the serializers
+        :doc-author: Trelent
+        """
+        context = super().get_serializer_context()
+        context["min_expiration_date"] = get_expiration_date_default()
+        return context
+
+    def get_bulk_items(self, request):
+        """
+        The get_bulk_items function checks that the body of a bulk request is a non-empty list of targets that is
+        not larger than the TARGETS_BULK_MAX_ITEMS setting.
+
+        :param self: Refer to the current instance of the class
+        :param request: The bulk request
+        :return: The list of items sent on the body
+        :doc-author: Trelent
+        """
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError(
+                {"non_field_errors": ["Expected a non-empty list of targets."]}
+            )
+        if len(items) > settings.TARGETS_BULK_MAX_ITEMS:
+            raise ValidationError(
+                {
+                    "non_field_errors": [
+                        f"Expected at most {settings.TARGETS_BULK_MAX_ITEMS} targets."
+                    ]
+                }
+            )
+        return items
+
+    def validate_bulk_items(self, items, partial=False):
+        """
+        The validate_bulk_items function validates every item of a bulk request with a single serializer instance,
+        collecting the errors of each item instead of stopping at the first invalid one.
+
+        :param self: Refer to the current instance of the class
+        :param items: The list of items sent on the body
+        :param partial: Whether the items only have the fields that should be changed
+        :return: A list of (index, validated data) tuples and a dictionary of errors by item index
+        :doc-author: Trelent
+        """
+        serializer = self.get_serializer(partial=partial)
+        valid_items = []
+        errors = {}
+
+        for index, item in enumerate(items):
+            try:
+                valid_items.append((index, serializer.run_validation(item)))
+            except ValidationError as exception:
+                errors[index] = exception.detail
+
+        return valid_items, errors
+
+    @staticmethod
+    def get_bulk_errors(errors):
+        """
+        The get_bulk_errors function turns the dictionary of errors by item index into the list sent on the
+        response of the bulk endpoints.
+
+        :param errors: A dictionary of errors by item index
+        :return: A list of errors sorted by item index
+        :doc-author: Trelent
+        """
+        return [
+            {"index": index, "errors": item_errors}
+            for index, item_errors in sorted(errors.items())
+        ]
+
+    @action(detail=False, methods=["post", "patch", "delete"])
+    def bulk(self, request):
+        """
+        The bulk function creates (POST), updates (PATCH) or deletes (DELETE) many targets in a single request.
+        The writes are done in batches with bulk_create, bulk_update and DELETE ... WHERE id IN (...), and the items
+        that fail the validation are reported back with their index, without preventing the valid ones from being
+        written.
+
+        :param self: Refer to the current instance of the class
+        :param request: The request with a list of targets, or with the ids to be deleted
+        :return: A response with the written targets and the errors of each invalid item
+        :doc-author: Trelent
+        """
+        batch_size = parse_batch_size(request.query_params.get("batch_size"))
+
+        if request.method == "DELETE":
+            serializer = serializers.TargetBulkDeleteSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            deleted = self.get_queryset().bulk_delete_targets(
+                serializer.validated_data["ids"], batch_size=batch_size
+            )
+            return Response({"deleted": deleted})
+
+        items = self.get_bulk_items(request)
+
+        if request.method == "POST":
+            valid_items, errors = self.validate_bulk_items(items)
+            targets, write_errors = Target.objects.bulk_create_targets(
+                [data for _, data in valid_items], batch_size=batch_size
+            )
+            key, success_status = "created", status.HTTP_201_CREATED
+        else:
+            valid_items, errors = self.validate_bulk_items(items, partial=True)
+            targets, write_errors = self.get_queryset().bulk_update_targets(
+                [{"id": items[index].get("id"), **data} for index, data in valid_items],
+                batch_size=batch_size,
+            )
+            key, success_status = "updated", status.HTTP_200_OK
+
+        for position, message in write_errors.items():
+            errors[valid_items[position][0]] = {"non_field_errors": [message]}
+
+        return Response(
+            {
+                key: serializers.TargetSerializer(targets, many=True).data,
+                "errors": self.get_bulk_errors(errors),
+            },
+            status=success_status
+            if targets or not errors
+            else status.HTTP_400_BAD_REQUEST,
+        )
+
+    @action(detail=False, serializer_class=serializers.TargetChangeSerializer)
+    def changes(self, request):
+        """
+        The changes function is the change feed of the targets.
+        Without the since query parameter it only returns the token representing the current state. With it, it
+        returns what was created, updated, deleted or expired since that token, plus the token to be sent next time,
+        so clients stay in sync with payloads proportional to what changed instead of to the amount of targets.
+
+        :param self: Refer to the current instance of the class
+        :param request: The request with the optional since query parameter
+        :return: A response with the changes, the next token and whether there are more changes to be read
+        :doc-author: Trelent
+        """
+        since = request.query_params.get("since")
+        if not since:
+            return Response(
+                {"changes": [], "next": get_current_change_token(), "has_more": False}
+            )
+
+        changes, next_token, has_more = get_changes_since(
+            since, settings.TARGETS_CHANGES_PAGE_SIZE
+        )
+        serializer = self.get_serializer(changes, many=True)
+        return Response(
+            {"changes": serializer.data, "next": next_token, "has_more": has_more}
+        )
+
+    @action(detail=False, serializer_class=serializers.TargetNearestSerializer)
+    def nearest(self, request):
+        """
+        The nearest function answers with the k live targets closest to the point given by the lat and lng query
+        parameters, closest first, each one with its great-circle distance. With radius_km, only the targets within
+        that distance are returned.
+
+        :param self: Refer to the current instance of the class
+        :param request: The request with the lat, lng, k and radius_km query parameters
+        :return: A response with the nearest targets
+        :doc-author: Trelent
+        """
+        lat, lng = parse_point(
+            request.query_params.get("lat"), request.query_params.get("lng")
+        )
+        k = parse_k(request.query_params.get("k"))
+        radius_km = parse_radius(request.query_params.get("radius_km"))
+
+        targets = self.get_queryset().nearest(lat, lng, k, radius_km)
+        return Response(self.get_serializer(targets, many=True).data)
+
+    @action(detail=False)
+    def export(self, request):
+        """
+        The export function streams every live target, optionally restricted to a bbox, as NDJSON (the default),
+        CSV or GeoJSON, chosen with the output query parameter.
+        The targets are read from the database in chunks and written to the response as they are read, so the
+        memory used does not depend on how many targets are exported. Under ASGI, the chunks are streamed through
+        an asynchronous iterator, since the ASGI handler buffers the synchronous ones.
+
+        :param self: Refer to the current instance of the class
+        :param request: The request with the optional output and bbox query parameters
+        :return: A streaming response with the exported targets
+        :doc-author: Trelent
+        """
+        export_format = request.query_params.get("output", "ndjson")
+        if export_format not in EXPORTERS:
+            raise ValidationError(
+                {"output": f"output must be one of {', '.join(sorted(EXPORTERS))}."}
+            )
+
+        content_type, extension, _ = EXPORTERS[export_format]
+        # The rows are read while the response is streamed, after dispatch returns, so the database is pinned now.
+        queryset = self.get_queryset()
+        chunks = export_targets(
+            queryset.using(queryset.db),
+            export_format,
+            settings.TARGETS_EXPORT_CHUNK_SIZE,
+        )
+        if isinstance(request._request, ASGIRequest):
+            chunks = iterate_in_thread(chunks)
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="targets.{extension}"'
+        return response
+
+    @action(detail=False, serializer_class=serializers.TargetClusterSerializer)
+    @conditional_table_response
+    @cache_response
+    def clusters(self, request):
+        """
+        The clusters function groups the live targets in a grid whose cells shrink as the zoom grows.
+        The grouping is done by the database, so the response has one entry per non-empty cell, with the amount of
+        targets inside of it and their centroid, no matter how many targets there are.
+
+        :param self: Refer to the current instance of the class
+        :param request: The request with the zoom and the optional bbox query parameters
+        :return: A response with the clusters of the viewport
+        :doc-author: Trelent
+        """
+        zoom = parse_zoom(request.query_params.get("zoom", 0))
+        cell_size = 360 / (2**zoom * CLUSTER_CELLS_PER_TILE)
+
+        clusters = (
+            self.get_queryset()
+            .filter(lat__isnull=False, lng__isnull=False)
+            .annotate(
+                cell_x=Floor(F("lng") / cell_size),
+                cell_y=Floor(F("lat") / cell_size),
+            )
+            .values("cell_x", "cell_y")
+            .annotate(count=Count("id"), latitude=Avg("lat"), longitude=Avg("lng"))
+            .order_by("cell_y", "cell_x")
+        )
+
+        serializer = self.get_serializer(clusters, many=True)
+        return Response(serializer.data)
+
+
+@require_GET
+async def target_events(request):
+    """
+    The target_events function streams the created, updated, deleted and expired targets as Server-Sent Events,
+    as they happen. With the bbox query parameter, only the events of the targets inside that viewport are sent,
+    besides the deletions, whose position is not known anymore.
+    The stream is held open on the event loop without any thread, so it is only served by the ASGI application.
+
+    :param request: The request
+    :return: A streaming response with the events
+    :doc-author: Trelent
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"detail": "Target events are only served by the ASGI application."},
+            status=501,
+        )
+
+    bbox = request.GET.get("bbox")
+    try:
+        bbox = parse_bbox(bbox) if bbox else None
+    except ValidationError as exception:
+        return JsonResponse(exception.detail, status=400)
+
+    response = StreamingHttpResponse(
+        stream_events(get_broker(), bbox), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    # Keeps reverse proxies such as nginx from buffering the stream.
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def render_json(data, status: int = 200):
+    """
+    The render_json function renders data with the same JSON renderer as the DRF views, so the async views
+    answer with the exact same bytes as the sync ones.
+
+    :param data: The data to be rendered
+    :param status: int: The status code of the response
+    :return: A response with the rendered data
+    :doc-author: Trelent
+    """
+    return HttpResponse(
+        JSONRenderer().render(data), content_type="application/json", status=status
+    )
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class TargetAsyncListView(View):
+    """
+    Async variant of the target list and create endpoints, for the ASGI application. It uses the async ORM, so a
+    slow query does not hold a thread, and the same serializer and validation as TargetViewSet. The responses are
+    not paginated nor cached.
+    """
+
+    async def get(self, request):
+        """
+        The get function lists the live targets, filtered by the bbox query parameter and projected on the fields
+        query parameter, like the list of TargetViewSet.
+
+        :param self: Refer to the current instance of the class
+        :param request: The request being answered
+        :return: A response with the list of targets
+        :doc-author: Trelent
+        """
+        queryset = Target.objects.live()
+        fields = None
+        try:
+            if bbox := request.GET.get("bbox"):
+                queryset = queryset.in_bbox(*parse_bbox(bbox))
+            if requested_fields := request.GET.get("fields"):
+                fields = parse_fields(
+                    requested_fields, serializers.TargetSerializer.Meta.fields
+                )
+                queryset = queryset.only("id", *fields)
+        except ValidationError as exception:
+            return render_json(exception.detail, status=status.HTTP_400_BAD_REQUEST)
+
+        targets = [target async for target in queryset]
+        return render_json(
+            serializers.TargetSerializer(targets, many=True, fields=fields).data
+        )
+
+    async def post(self, request):
+        """
+        The post function creates a target from a JSON or form body, with acreate_target.
+
+        :param self: Refer to the current instance of the class
+        :param request: The request being answered
+        :return: A response with the created target, or with the validation errors
+        :doc-author: Trelent
+        """
+        if request.content_type == "application/json":
+            try:
+                data = JSONParser().parse(request)
+            except ParseError as exception:
+                return render_json(
+                    {"detail": exception.detail}, status=status.HTTP_400_BAD_REQUEST
+                )
+        else:
+            data = request.POST
+
+        serializer = serializers.TargetSerializer(
+            data=data, context={"min_expiration_date": get_expiration_date_default()}
+        )
+        if not serializer.is_valid():
+            return render_json(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        target = await Target.objects.acreate_target(**serializer.validated_data)
+        return render_json(
+            serializers.TargetSerializer(target).data, status=status.HTTP_201_CREATED
+        )
+
+
+class TargetAsyncDetailView(View):
+    """
+    Async variant of the target detail endpoint, for the ASGI application.
+    """
+
+    async def get(self, request, pk):
+        """
+        The get function answers with a single live target.
+
+        :param self: Refer to the current instance of the class
+        :param request: The request being answered
+        :param pk: The id of the target
+        :return: A response with the target
+        :doc-author: Trelent
+        """
+        try:
+            target = await Target.objects.live().aget(pk=pk)
+        except Target.DoesNotExist:
+            return render_json(
+                {"detail": "No Target matches the given query."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return render_json(serializers.TargetSerializer(target).data)